@@ -0,0 +1,51 @@
+"""Add batch delete support
+
+Revision ID: add_batch_delete
+Revises: add_transcript_offload
+Create Date: 2026-10-17 12:00:00.000000
+
+This migration adds:
+- file_url index on transcription_jobs (shared stored object lookups)
+- storage_deletion_retries table (stored objects whose deletion failed)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_batch_delete'
+down_revision = 'add_transcript_offload'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add file_url index and deletion retry list."""
+    # e.g., SELECT file_url FROM transcription_jobs WHERE file_url IN (...)
+    op.create_index(
+        'ix_transcription_jobs_file_url',
+        'transcription_jobs',
+        ['file_url'],
+    )
+
+    op.create_table(
+        'storage_deletion_retries',
+        sa.Column('object_name', sa.String(255), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('object_name'),
+    )
+    op.create_index(
+        'ix_storage_deletion_retries_updated_at',
+        'storage_deletion_retries',
+        ['updated_at'],
+    )
+
+
+def downgrade() -> None:
+    """Remove deletion retry list and file_url index."""
+    op.drop_index('ix_storage_deletion_retries_updated_at', table_name='storage_deletion_retries')
+    op.drop_table('storage_deletion_retries')
+    op.drop_index('ix_transcription_jobs_file_url', table_name='transcription_jobs')
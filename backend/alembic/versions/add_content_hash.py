@@ -0,0 +1,40 @@
+"""Add content hash columns for upload deduplication
+
+Revision ID: add_content_hash
+Revises: add_upload_sessions
+Create Date: 2026-10-17 10:00:00.000000
+
+This migration adds:
+- content_hash column (SHA-256 of the uploaded media)
+- deduplicated_from column (job whose transcript was reused)
+- content_hash + language composite index (duplicate lookups)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_content_hash'
+down_revision = 'add_upload_sessions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add content hash columns and index."""
+    op.add_column('transcription_jobs', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('transcription_jobs', sa.Column('deduplicated_from', sa.UUID(), nullable=True))
+
+    # e.g., SELECT * FROM transcription_jobs WHERE content_hash = :h AND language = 'ja' AND status = 'COMPLETED'
+    op.create_index(
+        'ix_transcription_jobs_content_hash_language',
+        'transcription_jobs',
+        ['content_hash', 'language']
+    )
+
+
+def downgrade() -> None:
+    """Remove content hash columns and index."""
+    op.drop_index('ix_transcription_jobs_content_hash_language', table_name='transcription_jobs')
+    op.drop_column('transcription_jobs', 'deduplicated_from')
+    op.drop_column('transcription_jobs', 'content_hash')
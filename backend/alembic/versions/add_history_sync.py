@@ -0,0 +1,49 @@
+"""Add history delta sync support
+
+Revision ID: add_history_sync
+Revises: add_transcript_search
+Create Date: 2026-10-17 12:00:00.000000
+
+This migration adds:
+- (updated_at, id) index on transcription_jobs (changes feed keyset)
+- transcription_deletions table (tombstones of deleted jobs)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_history_sync'
+down_revision = 'add_transcript_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add updated_at index and deletion log."""
+    # e.g., WHERE (updated_at, id) > (:updated_at, :id) ORDER BY updated_at, id
+    op.create_index(
+        'ix_transcription_jobs_updated_at_id',
+        'transcription_jobs',
+        ['updated_at', 'id'],
+    )
+
+    op.create_table(
+        'transcription_deletions',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('job_id', sa.UUID(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_transcription_deletions_deleted_at_id',
+        'transcription_deletions',
+        ['deleted_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Remove deletion log and updated_at index."""
+    op.drop_index('ix_transcription_deletions_deleted_at_id', table_name='transcription_deletions')
+    op.drop_table('transcription_deletions')
+    op.drop_index('ix_transcription_jobs_updated_at_id', table_name='transcription_jobs')
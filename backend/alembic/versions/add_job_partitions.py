@@ -0,0 +1,142 @@
+"""Partition transcription_jobs by month
+
+Revision ID: add_job_partitions
+Revises: add_storage_reconcile
+Create Date: 2026-10-17 12:00:00.000000
+
+This migration:
+- rebuilds transcription_jobs as a table range-partitioned on created_at,
+  with one partition per month (transcription_jobs_pYYYYMM) for every month
+  that has rows, plus the current and the next PARTITION_PREMAKE_MONTHS
+  months
+- changes the primary key to (id, created_at) (a partitioned table's keys
+  must include the partition key) and drops ix_transcription_jobs_id, which
+  the new primary key covers
+- adds job_created_at to transcription_blobs, and references the job through
+  (job_id, job_created_at)
+
+Every row is copied once inside the migration transaction; the table is
+locked until it commits, so run it in a maintenance window. Partitions of
+later months are created by the application (see src/services/job_partitions.py).
+
+The downgrade copies the rows back into a plain table. Months archived in
+the meantime are not restored.
+"""
+import os
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_job_partitions'
+down_revision = 'add_storage_reconcile'
+branch_labels = None
+depends_on = None
+
+# Same default as settings.PARTITION_PREMAKE_MONTHS (the migration does not import app settings)
+PREMAKE_MONTHS = int(os.environ.get('PARTITION_PREMAKE_MONTHS', 3))
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """First instant of the month `months` after the month starting at `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def create_job_indexes() -> None:
+    """Create the secondary indexes of transcription_jobs."""
+    op.create_index('ix_transcription_jobs_created_at', 'transcription_jobs', ['created_at'])
+    op.create_index('ix_transcription_jobs_status', 'transcription_jobs', ['status'])
+    op.create_index('ix_transcription_jobs_status_created_at', 'transcription_jobs', ['status', 'created_at'])
+    op.create_index('ix_transcription_jobs_content_hash_language', 'transcription_jobs', ['content_hash', 'language'])
+    op.create_index(
+        'ix_transcription_jobs_queue', 'transcription_jobs', ['created_at'],
+        postgresql_where=sa.text("status = 'PROCESSING'"),
+    )
+    op.create_index(
+        'ix_transcription_jobs_text_trgm', 'transcription_jobs', ['transcription_text'],
+        postgresql_using='gin', postgresql_ops={'transcription_text': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_transcription_jobs_filename_trgm', 'transcription_jobs', ['original_filename'],
+        postgresql_using='gin', postgresql_ops={'original_filename': 'gin_trgm_ops'},
+    )
+    op.create_index('ix_transcription_jobs_updated_at_id', 'transcription_jobs', ['updated_at', 'id'])
+    op.create_index('ix_transcription_jobs_file_url', 'transcription_jobs', ['file_url'])
+    op.create_index(
+        'ix_transcription_jobs_object_name', 'transcription_jobs',
+        [sa.text("regexp_replace(file_url, '^.*/', '')")],
+    )
+
+
+def upgrade() -> None:
+    """Rebuild transcription_jobs as a monthly range-partitioned table."""
+    bind = op.get_bind()
+
+    # Blobs carry the partition key of their job for the composite foreign key
+    op.add_column('transcription_blobs', sa.Column('job_created_at', sa.DateTime(), nullable=True))
+    op.execute(
+        'UPDATE transcription_blobs b SET job_created_at = j.created_at '
+        'FROM transcription_jobs j WHERE j.id = b.job_id'
+    )
+    op.alter_column('transcription_blobs', 'job_created_at', nullable=False)
+    op.drop_constraint('transcription_blobs_job_id_fkey', 'transcription_blobs', type_='foreignkey')
+
+    op.rename_table('transcription_jobs', 'transcription_jobs_unpartitioned')
+    op.execute(
+        'CREATE TABLE transcription_jobs (LIKE transcription_jobs_unpartitioned INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (created_at)'
+    )
+
+    months = set(bind.execute(sa.text(
+        "SELECT DISTINCT date_trunc('month', created_at) FROM transcription_jobs_unpartitioned"
+    )).scalars().all())
+    now = datetime.utcnow()
+    current = datetime(now.year, now.month, 1)
+    months.update(add_months(current, offset) for offset in range(PREMAKE_MONTHS + 1))
+    for month in sorted(months):
+        op.execute(
+            f'CREATE TABLE transcription_jobs_p{month:%Y%m} PARTITION OF transcription_jobs '
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+        )
+
+    op.execute('INSERT INTO transcription_jobs SELECT * FROM transcription_jobs_unpartitioned')
+    op.drop_table('transcription_jobs_unpartitioned')
+
+    # Keys and indexes are built once, after the copy, and cascade to every partition
+    op.create_primary_key('transcription_jobs_pkey', 'transcription_jobs', ['id', 'created_at'])
+    create_job_indexes()
+
+    op.create_foreign_key(
+        'transcription_blobs_job_id_job_created_at_fkey', 'transcription_blobs', 'transcription_jobs',
+        ['job_id', 'job_created_at'], ['id', 'created_at'], ondelete='CASCADE',
+    )
+    # e.g., DELETE FROM transcription_blobs WHERE job_created_at >= ... (archiving a month)
+    op.create_index('ix_transcription_blobs_job_created_at', 'transcription_blobs', ['job_created_at'])
+    op.execute('ANALYZE transcription_jobs')
+
+
+def downgrade() -> None:
+    """Copy transcription_jobs back into a plain table keyed by id."""
+    op.drop_index('ix_transcription_blobs_job_created_at', table_name='transcription_blobs')
+    op.drop_constraint(
+        'transcription_blobs_job_id_job_created_at_fkey', 'transcription_blobs', type_='foreignkey'
+    )
+
+    op.rename_table('transcription_jobs', 'transcription_jobs_partitioned')
+    op.execute('CREATE TABLE transcription_jobs (LIKE transcription_jobs_partitioned INCLUDING DEFAULTS)')
+    op.execute('INSERT INTO transcription_jobs SELECT * FROM transcription_jobs_partitioned')
+    op.drop_table('transcription_jobs_partitioned')
+
+    op.create_primary_key('transcription_jobs_pkey', 'transcription_jobs', ['id'])
+    op.create_index('ix_transcription_jobs_id', 'transcription_jobs', ['id'])
+    create_job_indexes()
+
+    op.create_foreign_key(
+        'transcription_blobs_job_id_fkey', 'transcription_blobs', 'transcription_jobs',
+        ['job_id'], ['id'], ondelete='CASCADE',
+    )
+    op.drop_column('transcription_blobs', 'job_created_at')
+    op.execute('ANALYZE transcription_jobs')
@@ -0,0 +1,53 @@
+"""Add job queue columns to transcription_jobs
+
+Revision ID: add_job_queue_columns
+Revises: add_presigned_uploads
+Create Date: 2026-10-17 12:00:00.000000
+
+This migration adds:
+- claimed_by, lease_expires_at, heartbeat_at columns (worker lease)
+- attempts column (claims so far)
+- available_at column (delayed retry)
+- partial index on created_at for PROCESSING rows (queue scans)
+
+Existing PROCESSING rows have no lease and are picked up by the worker.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_job_queue_columns'
+down_revision = 'add_presigned_uploads'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add queue columns and index."""
+    op.add_column('transcription_jobs', sa.Column('claimed_by', sa.String(255), nullable=True))
+    op.add_column('transcription_jobs', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+    op.add_column('transcription_jobs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+    op.add_column(
+        'transcription_jobs',
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.add_column('transcription_jobs', sa.Column('available_at', sa.DateTime(), nullable=True))
+
+    # e.g., SELECT ... WHERE status = 'PROCESSING' ORDER BY created_at FOR UPDATE SKIP LOCKED
+    op.create_index(
+        'ix_transcription_jobs_queue',
+        'transcription_jobs',
+        ['created_at'],
+        postgresql_where=sa.text("status = 'PROCESSING'"),
+    )
+
+
+def downgrade() -> None:
+    """Remove queue columns and index."""
+    op.drop_index('ix_transcription_jobs_queue', table_name='transcription_jobs')
+    op.drop_column('transcription_jobs', 'available_at')
+    op.drop_column('transcription_jobs', 'attempts')
+    op.drop_column('transcription_jobs', 'heartbeat_at')
+    op.drop_column('transcription_jobs', 'lease_expires_at')
+    op.drop_column('transcription_jobs', 'claimed_by')
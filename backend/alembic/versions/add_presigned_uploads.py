@@ -0,0 +1,39 @@
+"""Support presigned uploads in upload_sessions
+
+Revision ID: add_presigned_uploads
+Revises: add_content_hash
+Create Date: 2026-10-17 11:00:00.000000
+
+This migration adds:
+- upload_sessions.kind column (chunked or presigned)
+- storage_upload_id becomes nullable (presigned uploads have no multipart id)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_presigned_uploads'
+down_revision = 'add_content_hash'
+branch_labels = None
+depends_on = None
+
+upload_session_kind = sa.Enum('CHUNKED', 'PRESIGNED', name='uploadsessionkind')
+
+
+def upgrade() -> None:
+    """Add kind column and relax storage_upload_id."""
+    upload_session_kind.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        'upload_sessions',
+        sa.Column('kind', upload_session_kind, nullable=False, server_default='CHUNKED'),
+    )
+    op.alter_column('upload_sessions', 'storage_upload_id', existing_type=sa.String(1024), nullable=True)
+
+
+def downgrade() -> None:
+    """Remove kind column and presigned sessions."""
+    op.execute("DELETE FROM upload_sessions WHERE kind = 'PRESIGNED'")
+    op.alter_column('upload_sessions', 'storage_upload_id', existing_type=sa.String(1024), nullable=False)
+    op.drop_column('upload_sessions', 'kind')
+    upload_session_kind.drop(op.get_bind(), checkfirst=True)
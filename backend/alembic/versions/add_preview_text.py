@@ -0,0 +1,51 @@
+"""Add preview_text column to transcription_jobs
+
+Revision ID: add_preview_text
+Revises: add_job_queue_columns
+Create Date: 2026-10-17 12:00:00.000000
+
+This migration adds:
+- preview_text column (first 100 characters of transcription_text)
+
+Existing rows are backfilled in batches, each committed separately, so the
+backfill never holds locks on the whole table.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_preview_text'
+down_revision = 'add_job_queue_columns'
+branch_labels = None
+depends_on = None
+
+# Rows updated per backfill batch
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Add preview_text and backfill it from transcription_text."""
+    op.add_column('transcription_jobs', sa.Column('preview_text', sa.String(100), nullable=True))
+
+    backfill = sa.text(
+        """
+        UPDATE transcription_jobs SET preview_text = left(transcription_text, 100)
+        WHERE id IN (
+            SELECT id FROM transcription_jobs
+            WHERE preview_text IS NULL AND transcription_text IS NOT NULL
+            LIMIT :batch_size
+        )
+        """
+    )
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            result = bind.execute(backfill, {'batch_size': BACKFILL_BATCH_SIZE})
+            if result.rowcount < BACKFILL_BATCH_SIZE:
+                break
+
+
+def downgrade() -> None:
+    """Remove preview_text."""
+    op.drop_column('transcription_jobs', 'preview_text')
@@ -0,0 +1,100 @@
+"""Search transcripts through a character n-gram index
+
+Revision ID: add_search_grams
+Revises: add_job_partitions
+Create Date: 2026-10-17 12:00:00.000000
+
+This migration:
+- adds search_grams (integer[]) to transcription_jobs: the distinct character
+  unigrams, bigrams and trigrams of the transcript and filename
+  (src/services/search_grams.py)
+- fills it for completed jobs, decompressing offloaded transcripts
+- adds a GIN index on search_grams (built in, no extension needed)
+- drops the pg_trgm indexes on transcription_text and original_filename,
+  which search no longer uses (trigrams cannot serve queries shorter than
+  three characters, i.e. most Japanese words)
+
+Rows are filled in keyset batches, one row per statement (autocommit), so the
+migration never holds locks on the whole table; the index is created
+afterwards.
+"""
+from alembic import op
+import sqlalchemy as sa
+import zstandard
+
+# Stored grams must use the same encoding as the application's queries
+from src.services.search_grams import build_search_grams
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_search_grams'
+down_revision = 'add_job_partitions'
+branch_labels = None
+depends_on = None
+
+# Rows selected per batch (each row is filled in its own statement)
+MIGRATION_BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Add search_grams, fill it, index it and drop the trigram indexes."""
+    op.add_column('transcription_jobs', sa.Column('search_grams', sa.ARRAY(sa.Integer()), nullable=True))
+
+    select_batch = sa.text(
+        """
+        SELECT j.id, j.created_at, j.original_filename, j.transcription_text, b.data
+        FROM transcription_jobs j
+        LEFT JOIN transcription_blobs b ON b.job_id = j.id AND b.job_created_at = j.created_at
+        WHERE j.status = 'COMPLETED' AND (j.created_at, j.id) > (:created_at, :id)
+        ORDER BY j.created_at, j.id
+        LIMIT :batch_size
+        """
+    )
+    fill_row = sa.text(
+        'UPDATE transcription_jobs SET search_grams = :grams WHERE id = :id AND created_at = :created_at'
+    ).bindparams(sa.bindparam('grams', type_=sa.ARRAY(sa.Integer())))
+    decompressor = zstandard.ZstdDecompressor()
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        position = {'created_at': '-infinity', 'id': '00000000-0000-0000-0000-000000000000'}
+        while True:
+            rows = bind.execute(select_batch, {**position, 'batch_size': MIGRATION_BATCH_SIZE}).all()
+            if not rows:
+                break
+            for job_id, created_at, filename, transcript, data in rows:
+                if data is not None:
+                    transcript = decompressor.decompress(data).decode('utf-8')
+                bind.execute(fill_row, {
+                    'id': job_id, 'created_at': created_at, 'grams': build_search_grams(transcript, filename),
+                })
+            position = {'created_at': rows[-1].created_at, 'id': rows[-1].id}
+
+    # e.g., WHERE search_grams @> '{...}' (the trigrams of the query)
+    op.create_index(
+        'ix_transcription_jobs_search_grams',
+        'transcription_jobs',
+        ['search_grams'],
+        postgresql_using='gin',
+    )
+    op.execute('DROP INDEX IF EXISTS ix_transcription_jobs_text_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_transcription_jobs_filename_trgm')
+
+
+def downgrade() -> None:
+    """Restore the trigram indexes and remove search_grams."""
+    op.create_index(
+        'ix_transcription_jobs_text_trgm',
+        'transcription_jobs',
+        ['transcription_text'],
+        postgresql_using='gin',
+        postgresql_ops={'transcription_text': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_transcription_jobs_filename_trgm',
+        'transcription_jobs',
+        ['original_filename'],
+        postgresql_using='gin',
+        postgresql_ops={'original_filename': 'gin_trgm_ops'},
+    )
+    op.drop_index('ix_transcription_jobs_search_grams', table_name='transcription_jobs')
+    op.drop_column('transcription_jobs', 'search_grams')
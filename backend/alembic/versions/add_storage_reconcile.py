@@ -0,0 +1,67 @@
+"""Add storage reconciliation
+
+Revision ID: add_storage_reconcile
+Revises: add_batch_delete
+Create Date: 2026-10-17 12:00:00.000000
+
+This migration adds:
+- file_missing_at column on transcription_jobs (stored object not found)
+- object name expression index on transcription_jobs (last segment of file_url)
+- storage_reconcile_runs table (resumable sweep progress)
+- storage_inventory table (object names listed during a run)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_storage_reconcile'
+down_revision = 'add_batch_delete'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add reconciliation tables, missing-object flag and object name index."""
+    op.add_column('transcription_jobs', sa.Column('file_missing_at', sa.DateTime(), nullable=True))
+
+    # e.g., WHERE regexp_replace(file_url, '^.*/', '') IN (...)
+    op.create_index(
+        'ix_transcription_jobs_object_name',
+        'transcription_jobs',
+        [sa.text("regexp_replace(file_url, '^.*/', '')")],
+    )
+
+    op.create_table(
+        'storage_reconcile_runs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('phase', sa.String(16), nullable=False),
+        sa.Column('dry_run', sa.Boolean(), nullable=False),
+        sa.Column('continuation_token', sa.Text(), nullable=True),
+        sa.Column('row_cursor', sa.UUID(), nullable=True),
+        sa.Column('objects_scanned', sa.BigInteger(), nullable=False),
+        sa.Column('orphans_found', sa.BigInteger(), nullable=False),
+        sa.Column('orphans_deleted', sa.BigInteger(), nullable=False),
+        sa.Column('rows_checked', sa.BigInteger(), nullable=False),
+        sa.Column('missing_rows', sa.BigInteger(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'storage_inventory',
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('object_name', sa.String(1024), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], ['storage_reconcile_runs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('run_id', 'object_name'),
+    )
+
+
+def downgrade() -> None:
+    """Remove reconciliation tables, missing-object flag and object name index."""
+    op.drop_table('storage_inventory')
+    op.drop_table('storage_reconcile_runs')
+    op.drop_index('ix_transcription_jobs_object_name', table_name='transcription_jobs')
+    op.drop_column('transcription_jobs', 'file_missing_at')
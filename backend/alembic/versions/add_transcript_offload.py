@@ -0,0 +1,119 @@
+"""Offload large transcripts to transcription_blobs
+
+Revision ID: add_transcript_offload
+Revises: add_history_sync
+Create Date: 2026-10-17 12:00:00.000000
+
+This migration adds:
+- transcript_storage column on transcription_jobs (NULL = inline, 'blob' = offloaded)
+- transcription_blobs table (zstd-compressed transcripts, deleted with their job)
+
+Existing transcripts larger than TRANSCRIPT_OFFLOAD_THRESHOLD bytes are
+compressed and moved one row per statement (autocommit), so the migration
+never holds locks on the whole table. The moved rows leave dead tuples
+behind; run VACUUM (or let autovacuum) reclaim them.
+"""
+import os
+
+from alembic import op
+import sqlalchemy as sa
+import zstandard
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_transcript_offload'
+down_revision = 'add_history_sync'
+branch_labels = None
+depends_on = None
+
+# Rows selected per batch (each row is moved in its own statement)
+MIGRATION_BATCH_SIZE = 500
+
+# Same default as settings.TRANSCRIPT_OFFLOAD_THRESHOLD (the migration does not import app settings)
+OFFLOAD_THRESHOLD = int(os.environ.get('TRANSCRIPT_OFFLOAD_THRESHOLD', 256 * 1024))
+ZSTD_LEVEL = int(os.environ.get('TRANSCRIPT_ZSTD_LEVEL', 10))
+
+
+def upgrade() -> None:
+    """Create transcription_blobs and move oversized transcripts into it."""
+    op.add_column('transcription_jobs', sa.Column('transcript_storage', sa.String(16), nullable=True))
+    op.create_table(
+        'transcription_blobs',
+        sa.Column(
+            'job_id', sa.UUID(),
+            sa.ForeignKey('transcription_jobs.id', ondelete='CASCADE'), primary_key=True
+        ),
+        sa.Column('codec', sa.String(16), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('original_size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+    )
+
+    select_batch = sa.text(
+        """
+        SELECT id, transcription_text FROM transcription_jobs
+        WHERE transcript_storage IS NULL AND octet_length(transcription_text) > :threshold
+        LIMIT :batch_size
+        """
+    )
+    # Insert and clear in one statement, so an interrupted run never leaves a row half-moved
+    move_row = sa.text(
+        """
+        WITH blob AS (
+            INSERT INTO transcription_blobs (job_id, codec, data, original_size)
+            VALUES (:job_id, 'zstd', :data, :original_size)
+        )
+        UPDATE transcription_jobs
+        SET transcription_text = NULL, transcript_storage = 'blob',
+            preview_text = coalesce(preview_text, left(transcription_text, 100))
+        WHERE id = :job_id
+        """
+    )
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            rows = bind.execute(
+                select_batch, {'threshold': OFFLOAD_THRESHOLD, 'batch_size': MIGRATION_BATCH_SIZE}
+            ).all()
+            if not rows:
+                break
+            for job_id, transcript in rows:
+                encoded = transcript.encode('utf-8')
+                bind.execute(move_row, {
+                    'job_id': job_id, 'data': compressor.compress(encoded), 'original_size': len(encoded),
+                })
+
+
+def downgrade() -> None:
+    """Move offloaded transcripts back inline and drop transcription_blobs."""
+    select_batch = sa.text(
+        """
+        SELECT job_id, data FROM transcription_blobs
+        WHERE codec = 'zstd'
+        LIMIT :batch_size
+        """
+    )
+    restore_row = sa.text(
+        """
+        WITH blob AS (
+            DELETE FROM transcription_blobs WHERE job_id = :job_id
+        )
+        UPDATE transcription_jobs SET transcription_text = :transcript, transcript_storage = NULL
+        WHERE id = :job_id
+        """
+    )
+    decompressor = zstandard.ZstdDecompressor()
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            rows = bind.execute(select_batch, {'batch_size': MIGRATION_BATCH_SIZE}).all()
+            if not rows:
+                break
+            for job_id, data in rows:
+                bind.execute(restore_row, {
+                    'job_id': job_id, 'transcript': decompressor.decompress(data).decode('utf-8'),
+                })
+
+    op.drop_table('transcription_blobs')
+    op.drop_column('transcription_jobs', 'transcript_storage')
@@ -0,0 +1,52 @@
+"""Add trigram search indexes to transcription_jobs
+
+Revision ID: add_transcript_search
+Revises: add_preview_text
+Create Date: 2026-10-17 12:00:00.000000
+
+This migration adds:
+- pg_trgm extension
+- GIN trigram index on transcription_text (substring search)
+- GIN trigram index on original_filename (substring search)
+
+Trigrams are taken per character, so Japanese text without word spaces is
+indexed as well, provided the database LC_CTYPE is not "C" (use e.g.
+C.UTF-8 or ja_JP.UTF-8 so multibyte characters count as word characters).
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_transcript_search'
+down_revision = 'add_preview_text'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and add trigram indexes."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # e.g., WHERE transcription_text ILIKE '%議事録%'
+    op.create_index(
+        'ix_transcription_jobs_text_trgm',
+        'transcription_jobs',
+        ['transcription_text'],
+        postgresql_using='gin',
+        postgresql_ops={'transcription_text': 'gin_trgm_ops'},
+    )
+
+    # e.g., WHERE original_filename ILIKE '%定例%'
+    op.create_index(
+        'ix_transcription_jobs_filename_trgm',
+        'transcription_jobs',
+        ['original_filename'],
+        postgresql_using='gin',
+        postgresql_ops={'original_filename': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Remove trigram indexes (the extension is left installed)."""
+    op.drop_index('ix_transcription_jobs_filename_trgm', table_name='transcription_jobs')
+    op.drop_index('ix_transcription_jobs_text_trgm', table_name='transcription_jobs')
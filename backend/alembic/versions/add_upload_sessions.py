@@ -0,0 +1,47 @@
+"""Add upload_sessions table for resumable chunked uploads
+
+Revision ID: add_upload_sessions
+Revises: add_perf_indexes
+Create Date: 2026-10-17 09:00:00.000000
+
+This migration adds:
+- upload_sessions table (one row per resumable upload)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_upload_sessions'
+down_revision = 'add_perf_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create upload_sessions table."""
+    op.create_table(
+        'upload_sessions',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('original_filename', sa.String(255), nullable=False),
+        sa.Column('content_type', sa.String(100), nullable=False),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('chunk_size', sa.Integer(), nullable=False),
+        sa.Column('total_chunks', sa.Integer(), nullable=False),
+        sa.Column('object_name', sa.String(255), nullable=False),
+        sa.Column('storage_upload_id', sa.String(1024), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('ACTIVE', 'COMMITTED', 'ABORTED', name='uploadsessionstatus'),
+            nullable=False,
+        ),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    """Drop upload_sessions table."""
+    op.drop_table('upload_sessions')
+    op.execute('DROP TYPE IF EXISTS uploadsessionstatus')
@@ -0,0 +1,171 @@
+"""
+Benchmark event loop responsiveness of the upload path.
+
+Runs N concurrent simulated uploads (stream an object to storage, then
+insert and commit a job row) while a monitor task measures how late the
+event loop wakes it up. Two modes are compared:
+
+- sync: the previous behaviour, a SessionLocal commit and storage writes
+  called directly on the event loop
+- async: the current path, AsyncSessionLocal and async_storage
+
+Uses the database pointed to by DATABASE_URL (run `alembic upgrade head`
+first; use a scratch database) and the configured storage. `--db-delay`
+adds a pg_sleep to every commit to simulate a slow or distant database.
+Rows and objects created by the benchmark are removed afterwards.
+
+Usage:
+    python -m scripts.benchmark_event_loop --uploads 200 --concurrency 20
+    python -m scripts.benchmark_event_loop --mode async --db-delay 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete, text
+
+from src.database import AsyncSessionLocal, SessionLocal, async_engine
+from src.models import TranscriptionJob, TranscriptionStatus
+from src.services.r2_service import async_storage, r2_service
+
+# Benchmark rows are recognised (and cleaned up) by this filename prefix
+FILENAME_PREFIX = 'bench-loop-'
+
+# Interval at which the monitor task asks to be woken up
+MONITOR_INTERVAL = 0.005
+
+
+def new_job(object_name: str, file_url: str, file_size: int) -> TranscriptionJob:
+    """A benchmark job row for an uploaded object."""
+    return TranscriptionJob(
+        id=uuid.UUID(object_name.split('.')[0]),
+        original_filename=f'{FILENAME_PREFIX}{object_name}',
+        file_url=file_url,
+        file_size=file_size,
+        language='ja',
+        status=TranscriptionStatus.COMPLETED,
+        completed_at=datetime.utcnow(),
+    )
+
+
+async def sync_upload(chunks: list, db_delay: float) -> str:
+    """Blocking upload and commit, run directly on the event loop."""
+    object_name = f'{uuid.uuid4()}.mp3'
+    upload = r2_service.start_streaming_upload(object_name)
+    for chunk in chunks:
+        upload.write(chunk)
+        await asyncio.sleep(0)
+    file_url = upload.complete()
+
+    db = SessionLocal()
+    try:
+        if db_delay:
+            db.execute(text('SELECT pg_sleep(:delay)'), {'delay': db_delay})
+        db.add(new_job(object_name, file_url, sum(len(chunk) for chunk in chunks)))
+        db.commit()
+    finally:
+        db.close()
+    return object_name
+
+
+async def async_upload(chunks: list, db_delay: float) -> str:
+    """Upload and commit through async_storage and the async session."""
+    object_name = f'{uuid.uuid4()}.mp3'
+    upload = await async_storage.start_streaming_upload(object_name)
+    for chunk in chunks:
+        await upload.write(chunk)
+    file_url = await upload.complete()
+
+    async with AsyncSessionLocal() as db:
+        if db_delay:
+            await db.execute(text('SELECT pg_sleep(:delay)'), {'delay': db_delay})
+        db.add(new_job(object_name, file_url, sum(len(chunk) for chunk in chunks)))
+        await db.commit()
+    return object_name
+
+
+async def monitor(lags: list, stop: asyncio.Event) -> None:
+    """Record how late each wake-up of the event loop is."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + MONITOR_INTERVAL
+        await asyncio.sleep(MONITOR_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def run_mode(mode: str, uploads: int, concurrency: int, chunks: list, db_delay: float) -> list:
+    """Run `uploads` uploads in one mode, print the results and return the object names."""
+    upload_func = sync_upload if mode == 'sync' else async_upload
+    semaphore = asyncio.Semaphore(concurrency)
+    object_names = []
+
+    async def one_upload() -> None:
+        async with semaphore:
+            object_names.append(await upload_func(chunks, db_delay))
+
+    lags = []
+    stop = asyncio.Event()
+    monitor_task = asyncio.create_task(monitor(lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(one_upload() for _ in range(uploads)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor_task
+
+    lags.sort()
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0
+    print(
+        f'{mode:<6} {uploads / elapsed:>10.1f} {statistics.median(lags) if lags else 0.0:>10.1f} '
+        f'{p99:>10.1f} {lags[-1] if lags else 0.0:>10.1f}'
+    )
+    return object_names
+
+
+def cleanup(object_names: list) -> None:
+    """Delete the benchmark rows and their stored objects."""
+    db = SessionLocal()
+    try:
+        deleted = db.execute(
+            delete(TranscriptionJob).where(TranscriptionJob.original_filename.like(f'{FILENAME_PREFIX}%'))
+        ).rowcount
+        db.commit()
+    finally:
+        db.close()
+    failed = r2_service.delete_files(object_names)
+    print(f'Deleted {deleted} benchmark rows and {len(object_names) - len(failed)} objects')
+
+
+async def benchmark(args) -> None:
+    """Run the selected modes and clean up."""
+    chunks = [os.urandom(args.chunk_size) for _ in range(args.chunks)]
+    modes = ['sync', 'async'] if args.mode == 'both' else [args.mode]
+    object_names = []
+    print(f'{"mode":<6} {"uploads/s":>10} {"lag p50":>10} {"lag p99":>10} {"lag max":>10}  (ms)')
+    try:
+        for mode in modes:
+            object_names.extend(await run_mode(mode, args.uploads, args.concurrency, chunks, args.db_delay))
+    finally:
+        cleanup(object_names)
+        await async_engine.dispose()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=['sync', 'async', 'both'], default='both', help='upload path to run')
+    parser.add_argument('--uploads', type=int, default=200, help='uploads per mode')
+    parser.add_argument('--concurrency', type=int, default=20, help='uploads in flight at once')
+    parser.add_argument('--chunks', type=int, default=8, help='chunks per upload')
+    parser.add_argument('--chunk-size', type=int, default=256 * 1024, help='bytes per chunk')
+    parser.add_argument('--db-delay', type=float, default=0.0, help='seconds of pg_sleep per commit')
+    args = parser.parse_args()
+    asyncio.run(benchmark(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+"""
+Benchmark transcript search on a large synthetic history.
+
+Seeds synthetic Japanese transcripts into the database pointed to by
+DATABASE_URL (run `alembic upgrade head` first; use a scratch database),
+then times HistoryService.search for a set of queries and prints latency
+percentiles. Two of every RARE_TERM_EVERY transcripts contain RARE_TERM,
+and every OFFLOAD_EVERY-th one is long enough to be offloaded to
+transcription_blobs.
+
+The plans of the search statements for the first query and RARE_TERM are
+printed (EXPLAIN ANALYZE), with a warning when the RARE_TERM search does not
+read the search_grams index (walking created_at reads the whole table for
+rare terms). Each query passes when its p95 is under TARGET_P95_MS; the
+script exits with status 1 when any query misses the target.
+
+Usage:
+    python -m scripts.benchmark_search --rows 100000
+    python -m scripts.benchmark_search --skip-seed --repeat 50
+    python -m scripts.benchmark_search --cleanup
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert, text
+
+from src.config import settings
+from src.database import SessionLocal, engine
+from src.models import TranscriptionBlob, TranscriptionJob, TranscriptionStatus
+from src.services.history_service import history_service
+from src.services.job_partitions import job_partitions
+from src.services.search_grams import build_search_grams
+from src.services.transcript_store import build_preview, transcript_store
+
+# Seeded rows are recognised (and cleaned up) by this filename prefix
+FILENAME_PREFIX = 'bench-'
+
+VOCABULARY = [
+    '本日', 'の', '定例', '会議', 'では', '来期', '予算', 'について', '議論', 'しました', '。',
+    '営業', '部', 'から', '売上', '報告', 'が', 'あり', '前年', '比', '増加', 'です', '、',
+    '開発', 'チーム', '新機能', 'リリース', '予定', 'を', '説明', '顧客', '要望', '対応',
+    '品質', '改善', '課題', '共有', '次回', 'までに', '資料', '作成', 'お願いします',
+]
+
+# Term seeded into two of every RARE_TERM_EVERY transcripts, one of them
+# offloaded (never produced from VOCABULARY)
+RARE_TERM = '臨時株主総会'
+RARE_TERM_EVERY = 1000
+
+# Every OFFLOAD_EVERY-th transcript exceeds TRANSCRIPT_OFFLOAD_THRESHOLD
+OFFLOAD_EVERY = 500
+
+DEFAULT_QUERIES = [
+    '会議', '株', '予算について', '新機能のリリース', '顧客要望', 'お願いします', RARE_TERM, '存在しない語句',
+]
+
+# Latency target for a page of results
+TARGET_P95_MS = 100
+
+
+def synthetic_transcript(rng: random.Random, length: int) -> str:
+    """Random Japanese-looking text of roughly `length` characters."""
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(VOCABULARY)
+        words.append(word)
+        size += len(word)
+    return ''.join(words)
+
+
+def seed(rows: int, text_length: int, batch_size: int = 1000) -> None:
+    """Insert `rows` completed jobs with synthetic transcripts."""
+    rng = random.Random(42)
+    start = datetime.utcnow() - timedelta(days=365)
+    db = SessionLocal()
+    try:
+        for offset in range(0, rows, batch_size):
+            batch = []
+            blobs = []
+            for i in range(offset, min(rows, offset + batch_size)):
+                length = text_length
+                if i % OFFLOAD_EVERY == 0:
+                    length = settings.TRANSCRIPT_OFFLOAD_THRESHOLD // 2  # 3 UTF-8 bytes per character
+                transcript = synthetic_transcript(rng, length)
+                if i % RARE_TERM_EVERY < 2:
+                    position = rng.randrange(len(transcript))
+                    transcript = transcript[:position] + RARE_TERM + transcript[position:]
+                created_at = start + timedelta(seconds=i * 300)
+                filename = f'{FILENAME_PREFIX}{i:06d}_{rng.choice(VOCABULARY)}.mp3'
+                batch.append({
+                    'id': uuid.uuid4(),
+                    'original_filename': filename,
+                    'file_url': '',
+                    'file_size': rng.randint(1, 100) * 1024 * 1024,
+                    'language': 'ja',
+                    'transcription_text': transcript,
+                    'preview_text': build_preview(transcript),
+                    'search_grams': build_search_grams(transcript, filename),
+                    'status': TranscriptionStatus.COMPLETED,
+                    'attempts': 0,
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                    'completed_at': created_at,
+                })
+                blob = transcript_store.offload_row(batch[-1])
+                if blob:
+                    blobs.append(blob)
+            job_partitions.ensure_partitions(row['created_at'] for row in batch)
+            db.execute(insert(TranscriptionJob), batch)
+            if blobs:
+                db.execute(insert(TranscriptionBlob), blobs)
+            db.commit()
+            print(f'Seeded {min(rows, offset + batch_size)}/{rows}')
+        db.execute(text('ANALYZE transcription_jobs'))
+        db.execute(text('ANALYZE transcription_blobs'))
+        db.commit()
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    """Delete the seeded rows."""
+    db = SessionLocal()
+    try:
+        deleted = db.query(TranscriptionJob).filter(
+            TranscriptionJob.original_filename.like(f'{FILENAME_PREFIX}%')
+        ).delete(synchronize_session=False)
+        db.commit()
+        print(f'Deleted {deleted} seeded rows')
+    finally:
+        db.close()
+
+
+def search_statements(query: str, limit: int) -> tuple:
+    """
+    Run one search and capture its statements.
+
+    Returns:
+        (SET LOCAL statements, list of (statement, parameters) of the other statements)
+    """
+    settings_statements = []
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('SET LOCAL'):
+            settings_statements.append(statement)
+        elif statement.lstrip().startswith(('SELECT', 'WITH')):
+            captured.append((statement, parameters))
+
+    db = SessionLocal()
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        history_service.search(db, query, limit=limit)
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+        db.close()
+    return settings_statements, captured
+
+
+def explain(query: str, limit: int) -> None:
+    """Print the plans of the search statements for one query; RARE_TERM must read the gram index."""
+    settings_statements, statements = search_statements(query, limit)
+    db = SessionLocal()
+    plans = []
+    try:
+        for setting in settings_statements:
+            db.connection().exec_driver_sql(setting)
+        for statement, parameters in statements:
+            plans.append(db.connection().exec_driver_sql(
+                f'EXPLAIN (ANALYZE, BUFFERS) {statement}', parameters
+            ).scalars().all())
+    finally:
+        db.close()
+
+    for number, plan in enumerate(plans, 1):
+        print(f'Plan {number}/{len(plans)} for {query!r}:')
+        print('\n'.join(plan))
+    plan_lines = [line for plan in plans for line in plan]
+    if query == RARE_TERM and not any('search_grams' in line and 'Index' in line for line in plan_lines):
+        print('WARNING: the search does not read the search_grams index')
+    print()
+
+
+def benchmark(queries, repeat: int, limit: int) -> bool:
+    """
+    Time HistoryService.search and print p50/p95/max per query.
+
+    Returns:
+        Whether every query met TARGET_P95_MS
+    """
+    met = True
+    db = SessionLocal()
+    try:
+        print(f'{"query":<20} {"hits":>5} {"p50 ms":>8} {"p95 ms":>8} {"max ms":>8}  target')
+        for query in queries:
+            timings = []
+            results = []
+            for _ in range(repeat):
+                # One request: the API ends the transaction after each search
+                started = time.perf_counter()
+                results, _ = history_service.search(db, query, limit=limit)
+                db.rollback()
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            met = met and p95 < TARGET_P95_MS
+            print(
+                f'{query:<20} {len(results):>5} {statistics.median(timings):>8.1f} '
+                f'{p95:>8.1f} {timings[-1]:>8.1f}  {"ok" if p95 < TARGET_P95_MS else "MISSED"}'
+            )
+    finally:
+        db.close()
+    print(f'Target p95 < {TARGET_P95_MS} ms: {"met" if met else "MISSED"}')
+    return met
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='transcripts to seed')
+    parser.add_argument('--text-length', type=int, default=2000, help='characters per transcript')
+    parser.add_argument('--repeat', type=int, default=20, help='runs per query')
+    parser.add_argument('--limit', type=int, default=20, help='page size')
+    parser.add_argument('--query', action='append', help='query to time (repeatable)')
+    parser.add_argument('--skip-seed', action='store_true', help='reuse previously seeded rows')
+    parser.add_argument('--cleanup', action='store_true', help='delete seeded rows and exit')
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return
+
+    if not args.skip_seed:
+        seed(args.rows, args.text_length)
+
+    queries = args.query or DEFAULT_QUERIES
+    for query in dict.fromkeys([queries[0], RARE_TERM]):
+        explain(query, args.limit)
+    if not benchmark(queries, args.repeat, args.limit):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
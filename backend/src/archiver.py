@@ -0,0 +1,69 @@
+"""
+Partition maintenance process.
+
+Creates the upcoming monthly partitions of transcription_jobs and archives
+whole months older than PARTITION_ARCHIVE_AFTER_MONTHS (exported to object
+storage under archive/ as zstd-compressed NDJSON, then detached and
+dropped), then sleeps for PARTITION_MAINTENANCE_INTERVAL. Run one per
+deployment (a second process skips archiving while the first archives):
+
+    python -m src.archiver
+    python -m src.archiver --once --dry-run
+    python -m src.archiver --once --archive-after-months 24
+"""
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+from typing import Optional
+
+from src.config import settings
+from src.services.job_partitions import job_partitions
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout),
+    ],
+)
+
+logger = logging.getLogger(__name__)
+
+
+def maintain_once(dry_run: bool, archive_after_months: Optional[int]) -> None:
+    """Create upcoming partitions and archive old ones."""
+    try:
+        if not dry_run:
+            job_partitions.premake()
+        job_partitions.archive(archive_after_months, dry_run=dry_run)
+    except Exception as e:
+        logger.error(f'Partition maintenance failed: {e}')
+
+
+def main() -> None:
+    """Run maintenance once, or repeatedly until SIGTERM/SIGINT."""
+    parser = argparse.ArgumentParser(description='Create and archive transcription_jobs partitions')
+    parser.add_argument('--once', action='store_true', help='run maintenance once and exit')
+    parser.add_argument('--dry-run', action='store_true', help='report months to archive without changing anything')
+    parser.add_argument(
+        '--archive-after-months', type=int, default=None,
+        help=f'archive months older than this (default {settings.PARTITION_ARCHIVE_AFTER_MONTHS}, minimum 1)',
+    )
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    while not stop.is_set():
+        maintain_once(args.dry_run, args.archive_after_months)
+        if args.once:
+            break
+        stop.wait(settings.PARTITION_MAINTENANCE_INTERVAL)
+
+
+if __name__ == '__main__':
+    main()
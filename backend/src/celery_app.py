@@ -3,8 +3,10 @@ Celery configuration for asynchronous task processing.
 """
 
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
 
 from src.config import settings
+from src.services.metrics import mark_process_dead, start_metrics_server
 
 # Create Celery app
 celery_app = Celery(
@@ -27,3 +29,22 @@ celery_app.conf.update(
 
 # Auto-discover tasks from tasks module
 celery_app.autodiscover_tasks(['src.tasks'])
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs) -> None:
+    """Drop the live metrics of an exiting Celery pool process (multiprocess mode)."""
+    mark_process_dead(pid)
+
+
+@worker_init.connect
+def serve_metrics(**kwargs) -> None:
+    """
+    Serve the worker's metrics on METRICS_PORT from the main Celery process.
+
+    Tasks run in the pool processes, so with the prefork pool set
+    PROMETHEUS_MULTIPROC_DIR for the whole worker; the endpoint then
+    aggregates the pool processes.
+    """
+    if settings.METRICS_PORT:
+        start_metrics_server(settings.METRICS_PORT)
@@ -4,8 +4,10 @@ Loads environment variables from .env.local in the project root.
 """
 
 import os
+import secrets
 from pathlib import Path
 from typing import Optional
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -24,9 +26,59 @@ class Settings(BaseSettings):
     R2_SECRET_ACCESS_KEY: Optional[str] = None
     R2_BUCKET_NAME: Optional[str] = None
 
+    # Signing key for local-storage upload URLs (presigned upload stand-in).
+    # Set explicitly when running more than one API process.
+    UPLOAD_SIGNING_SECRET: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
+
     # Redis
     REDIS_URL: str
 
+    # Job status events: 'redis' (pub/sub across processes) or 'memory' (single process)
+    EVENT_BROKER: str = 'redis'
+    EVENT_POLL_INTERVAL: float = 2.0  # memory broker: seconds between status reads of subscribed jobs
+
+    # Job status/result cache: 'redis' (falls back to the in-process LRU on errors) or 'memory' (single process)
+    JOB_CACHE_BACKEND: str = 'redis'
+    JOB_CACHE_TTL: int = 86400  # seconds, completed/failed jobs
+    JOB_CACHE_ACTIVE_TTL: int = 30  # seconds, jobs still processing
+    JOB_CACHE_LOCAL_TTL: int = 60  # seconds, in-process LRU entries (completed/failed jobs only)
+    JOB_CACHE_LOCAL_MAX_BYTES: int = 64 * 1024 * 1024  # in-process LRU budget
+
+    # Transcripts larger than this (UTF-8 bytes) move to the compressed transcription_blobs table
+    TRANSCRIPT_OFFLOAD_THRESHOLD: int = 256 * 1024
+    TRANSCRIPT_ZSTD_LEVEL: int = 10
+
+    # Transcription (Whisper API limits are per process; divide org quotas across workers)
+    WHISPER_MAX_CONCURRENCY: int = 4  # in-flight Whisper requests (and pooled connections)
+    WHISPER_REQUESTS_PER_MINUTE: int = 50  # 0 = unlimited
+    WHISPER_AUDIO_MINUTES_PER_MINUTE: float = 0  # audio-minutes quota, 0 = unlimited
+    WHISPER_RATE_LIMIT_MAX_WAIT: int = 600  # max seconds spent waiting on 429 Retry-After
+
+    # Job queue worker (python -m src.worker)
+    WORKER_CONCURRENCY: int = 2  # jobs processed in parallel per worker process
+    WORKER_POLL_INTERVAL: float = 2.0  # seconds between claims when the queue is empty
+    JOB_LEASE_SECONDS: int = 300  # a job is re-claimed if its worker stops heartbeating this long
+    JOB_MAX_ATTEMPTS: int = 3  # claims before a job is marked FAILED
+    WORKER_HEARTBEAT_INTERVAL: float = 10.0  # seconds between liveness heartbeats
+    WORKER_HEARTBEAT_TTL: int = 30  # a worker counts as alive this long after its last heartbeat
+
+    # Job queue and Celery workers serve Prometheus metrics on this port (0 = off; the API uses /metrics)
+    METRICS_PORT: int = 0
+
+    # Health checks (dependencies are probed in the background; /api/health serves the cached results)
+    HEALTH_CHECK_INTERVAL: float = 15.0  # seconds between probes
+    HEALTH_CHECK_TIMEOUT: float = 2.0  # Redis socket and Celery ping timeout
+    HEALTH_CHECK_CELERY_WORKERS: bool = False  # ping Celery workers (when running the Celery task)
+
+    # Storage reconciliation (python -m src.reconciler)
+    STORAGE_RECONCILE_INTERVAL: int = 86400  # seconds between completed sweeps
+    STORAGE_RECONCILE_GRACE_HOURS: int = 24  # unreferenced objects younger than this are kept
+
+    # Monthly partitions of transcription_jobs (python -m src.archiver)
+    PARTITION_PREMAKE_MONTHS: int = 3  # future months that always have a partition
+    PARTITION_ARCHIVE_AFTER_MONTHS: int = 12  # older whole months are exported and dropped
+    PARTITION_MAINTENANCE_INTERVAL: int = 86400  # seconds between maintenance runs
+
     # Application
     FRONTEND_URL: str = 'http://localhost:3427'
     BACKEND_URL: str = 'http://localhost:8567'
@@ -1,8 +1,14 @@
 """
 Database configuration and session management.
+
+The synchronous engine (psycopg2) serves the worker, Celery and the sync
+routes (FastAPI runs those in its threadpool). Async routes use the asyncpg
+engine so database I/O never blocks the event loop.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -19,10 +25,43 @@ engine = create_engine(
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str) -> str:
+    """Convert a psycopg2-style DATABASE_URL to the asyncpg driver (libpq sslmode becomes ssl)."""
+    parsed = make_url(url)
+    query = dict(parsed.query)
+    if 'sslmode' in query:
+        query['ssl'] = query.pop('sslmode')
+    return parsed.set(drivername='postgresql+asyncpg', query=query).render_as_string(hide_password=False)
+
+
+# Async engine for async routes (connections are only opened on first use)
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=5,
+    max_overflow=10,
+)
+
+# Objects stay readable after commit, since lazy loads are not possible in async code
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class for models
 Base = declarative_base()
 
 
+def db_utc_now():
+    """
+    Current database time in UTC (naive, like the DateTime columns), as a SQL expression.
+
+    Used for timestamps that are compared across processes, such as
+    updated_at read by the changes feed, so they do not depend on the
+    writer's clock. clock_timestamp() is the time of the statement, not
+    the start of the transaction like now().
+    """
+    return func.timezone('utc', func.clock_timestamp())
+
+
 def get_db():
     """
     Dependency for FastAPI routes to get database session.
@@ -37,3 +76,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency for async FastAPI routes to get an async database session.
+
+    Usage:
+        @app.post('/items')
+        async def create_item(db: AsyncSession = Depends(get_async_db)):
+            ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
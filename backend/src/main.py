@@ -10,10 +10,15 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from src.config import settings
-from src.routers import health, transcription
+from src.database import async_engine
+from src.routers import events, health, history, metrics, transcription, uploads
+from src.services.health_monitor import health_monitor
+from src.services.job_partitions import job_partitions
+from src.services.metrics import mark_process_dead
 
 # Configure logging
 logging.basicConfig(
@@ -75,8 +80,16 @@ signal.signal(signal.SIGTERM, handle_sigterm)
 async def lifespan(app: FastAPI):
     """Application lifespan context manager."""
     logger.info('Starting application...')
+    try:
+        await run_in_threadpool(job_partitions.premake)
+    except Exception as e:
+        logger.error(f'Failed to create upcoming transcription_jobs partitions: {e}')
+    health_monitor.start()
     yield
     logger.info('Shutting down application...')
+    await run_in_threadpool(health_monitor.stop)
+    mark_process_dead()
+    await async_engine.dispose()
 
 
 # Create FastAPI app
@@ -131,7 +144,11 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # Include routers
 app.include_router(health.router, prefix='/api', tags=['health'])
+app.include_router(history.router, prefix='/api', tags=['history'])
 app.include_router(transcription.router, prefix='/api', tags=['transcription'])
+app.include_router(uploads.router, prefix='/api', tags=['uploads'])
+app.include_router(events.router, prefix='/api', tags=['events'])
+app.include_router(metrics.router, tags=['metrics'])
 
 
 @app.get('/')
@@ -3,15 +3,33 @@ SQLAlchemy models for the application.
 All models are defined in this single file to follow the Single Source of Truth principle.
 """
 
+import os
+import time
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Text, DateTime, Float, Enum as SQLEnum, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Column, String, Integer, BigInteger, Boolean, Text, DateTime, Float, LargeBinary, Enum as SQLEnum, ForeignKey,
+    ForeignKeyConstraint, Index, text
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import relationship
 import enum
 
 from src.database import Base
 
 
+def new_job_id() -> uuid.UUID:
+    """
+    Time-ordered job ID (UUIDv7): Unix milliseconds in the top 48 bits, then random bits.
+
+    The timestamp lets lookups by ID skip partitions older than the job.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
 class TranscriptionStatus(str, enum.Enum):
     """Transcription job status."""
     PROCESSING = 'processing'
@@ -23,12 +41,14 @@ class TranscriptionJob(Base):
     """
     Transcription job model.
     Represents a single file transcription job with its status and results.
+    Range-partitioned by month on created_at, which is therefore part of the
+    primary key.
     """
 
     __tablename__ = 'transcription_jobs'
 
-    # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    # Primary key (id is unique on its own; created_at is the partition key)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=new_job_id)
 
     # Basic file information
     original_filename = Column(String(255), nullable=False)
@@ -39,11 +59,29 @@ class TranscriptionJob(Base):
 
     # Transcription information
     transcription_text = Column(Text, nullable=True)
+    preview_text = Column(String(100), nullable=True)  # first 100 characters, for history lists
+    transcript_storage = Column(String(16), nullable=True)  # NULL = inline, 'blob' = transcription_blobs
+    search_grams = Column(ARRAY(Integer), nullable=True)  # transcript and filename n-grams (search_grams.py)
+    blob = relationship('TranscriptionBlob', uselist=False, cascade='all, delete-orphan', passive_deletes=True)
     status = Column(SQLEnum(TranscriptionStatus), nullable=False, default=TranscriptionStatus.PROCESSING)
     error_message = Column(Text, nullable=True)
 
+    # Deduplication (SHA-256 of the uploaded media, and the job whose result was reused)
+    content_hash = Column(String(64), nullable=True)
+    deduplicated_from = Column(UUID(as_uuid=True), nullable=True)
+
+    # Job queue (PROCESSING rows are the queue; a worker holds a job while its lease is valid)
+    claimed_by = Column(String(255), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default='0')
+    available_at = Column(DateTime, nullable=True)  # not claimable before this (delayed retry)
+
+    # Storage reconciliation (set while the stored object of file_url is missing)
+    file_missing_at = Column(DateTime, nullable=True)
+
     # Metadata
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
 
@@ -51,7 +89,186 @@ class TranscriptionJob(Base):
     __table_args__ = (
         Index('ix_transcription_jobs_status', 'status'),
         Index('ix_transcription_jobs_status_created_at', 'status', 'created_at'),
+        Index('ix_transcription_jobs_content_hash_language', 'content_hash', 'language'),
+        Index('ix_transcription_jobs_queue', 'created_at', postgresql_where=text("status = 'PROCESSING'")),
+        Index('ix_transcription_jobs_search_grams', 'search_grams', postgresql_using='gin'),
+        Index('ix_transcription_jobs_updated_at_id', 'updated_at', 'id'),
+        Index('ix_transcription_jobs_file_url', 'file_url'),
+        # Object name (last segment of file_url), matched against storage listings
+        Index('ix_transcription_jobs_object_name', text("regexp_replace(file_url, '^.*/', '')")),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
     )
 
     def __repr__(self):
         return f'<TranscriptionJob {self.id} - {self.original_filename} ({self.status})>'
+
+
+class UploadSessionStatus(str, enum.Enum):
+    """Resumable upload session status."""
+    ACTIVE = 'active'
+    COMMITTED = 'committed'
+    ABORTED = 'aborted'
+
+
+class UploadSessionKind(str, enum.Enum):
+    """How the client sends the media bytes."""
+    CHUNKED = 'chunked'  # chunks PUT through the API
+    PRESIGNED = 'presigned'  # single PUT straight to storage
+
+
+class UploadSession(Base):
+    """
+    Upload session model.
+    Tracks a chunked upload whose parts are stored in R2 (multipart upload)
+    or as chunk files in local storage, or a presigned direct-to-storage
+    upload, until it is committed as a job.
+    """
+
+    __tablename__ = 'upload_sessions'
+
+    # Primary key (also used as the TranscriptionJob id on commit)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Declared file information
+    original_filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    total_chunks = Column(Integer, nullable=False)
+
+    # Storage information (storage_upload_id is only set for chunked uploads)
+    kind = Column(SQLEnum(UploadSessionKind), nullable=False, default=UploadSessionKind.CHUNKED)
+    object_name = Column(String(255), nullable=False)
+    storage_upload_id = Column(String(1024), nullable=True)
+
+    status = Column(SQLEnum(UploadSessionStatus), nullable=False, default=UploadSessionStatus.ACTIVE)
+
+    # Metadata
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<UploadSession {self.id} - {self.original_filename} ({self.status})>'
+
+
+class TranscriptionDeletion(Base):
+    """
+    Transcription deletion log model.
+    Tombstone of a deleted transcription job, so history delta sync can tell
+    clients which records to drop from their local copy.
+    """
+
+    __tablename__ = 'transcription_deletions'
+
+    # Primary key (monotonic, tie-breaker for equal deleted_at)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    job_id = Column(UUID(as_uuid=True), nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_transcription_deletions_deleted_at_id', 'deleted_at', 'id'),
+    )
+
+    def __repr__(self):
+        return f'<TranscriptionDeletion {self.job_id} at {self.deleted_at}>'
+
+
+class TranscriptionBlob(Base):
+    """
+    Offloaded transcript model.
+    zstd-compressed transcript of a job whose text exceeds
+    TRANSCRIPT_OFFLOAD_THRESHOLD, kept out of transcription_jobs. Search
+    reads its grams from the job (search_grams).
+    """
+
+    __tablename__ = 'transcription_blobs'
+
+    job_id = Column(UUID(as_uuid=True), primary_key=True)
+    job_created_at = Column(DateTime, nullable=False)  # partition key of the job, part of the foreign key
+    codec = Column(String(16), nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    original_size = Column(Integer, nullable=False)  # uncompressed UTF-8 bytes
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ['job_id', 'job_created_at'],
+            ['transcription_jobs.id', 'transcription_jobs.created_at'],
+            ondelete='CASCADE',
+        ),
+        Index('ix_transcription_blobs_job_created_at', 'job_created_at'),
+    )
+
+    def __repr__(self):
+        return f'<TranscriptionBlob {self.job_id} ({self.codec}, {self.original_size} bytes)>'
+
+
+class StorageDeletionRetry(Base):
+    """
+    Storage deletion retry model.
+    Stored object whose job rows are gone but whose deletion from storage
+    failed; retried until it succeeds.
+    """
+
+    __tablename__ = 'storage_deletion_retries'
+
+    object_name = Column(String(255), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=1)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_storage_deletion_retries_updated_at', 'updated_at'),
+    )
+
+    def __repr__(self):
+        return f'<StorageDeletionRetry {self.object_name} ({self.attempts} attempts)>'
+
+
+class StorageReconcileRun(Base):
+    """
+    Storage reconciliation run model.
+    Progress of one pass over the bucket (phase 'objects', resumable from
+    continuation_token) and then over the jobs (phase 'rows', resumable
+    from row_cursor).
+    """
+
+    __tablename__ = 'storage_reconcile_runs'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    phase = Column(String(16), nullable=False, default='objects')  # 'objects' | 'rows' | 'completed'
+    dry_run = Column(Boolean, nullable=False, default=False)
+    continuation_token = Column(Text, nullable=True)
+    row_cursor = Column(UUID(as_uuid=True), nullable=True)
+
+    # Counters
+    objects_scanned = Column(BigInteger, nullable=False, default=0)
+    orphans_found = Column(BigInteger, nullable=False, default=0)
+    orphans_deleted = Column(BigInteger, nullable=False, default=0)
+    rows_checked = Column(BigInteger, nullable=False, default=0)
+    missing_rows = Column(BigInteger, nullable=False, default=0)
+
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<StorageReconcileRun {self.id} ({self.phase})>'
+
+
+class StorageInventoryEntry(Base):
+    """
+    Storage inventory model.
+    Object name seen in storage during a reconciliation run; dropped when
+    the run completes.
+    """
+
+    __tablename__ = 'storage_inventory'
+
+    run_id = Column(Integer, ForeignKey('storage_reconcile_runs.id', ondelete='CASCADE'), primary_key=True)
+    object_name = Column(String(1024), primary_key=True)
+
+    def __repr__(self):
+        return f'<StorageInventoryEntry {self.run_id}:{self.object_name}>'
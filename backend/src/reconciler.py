@@ -0,0 +1,65 @@
+"""
+Storage reconciliation process.
+
+Sweeps the bucket (or local uploads directory) for orphaned objects and
+flags jobs whose object is missing, then sleeps for
+STORAGE_RECONCILE_INTERVAL. Interrupted sweeps resume where they stopped.
+Run one per deployment (a second process skips while the first sweeps):
+
+    python -m src.reconciler
+    python -m src.reconciler --once --dry-run
+"""
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+
+from src.config import settings
+from src.database import SessionLocal
+from src.services.storage_reconciler import storage_reconciler
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout),
+    ],
+)
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_once(dry_run: bool) -> None:
+    """Run or resume one sweep to completion."""
+    db = SessionLocal()
+    try:
+        storage_reconciler.run(db, dry_run=dry_run)
+    except Exception as e:
+        logger.error(f'Storage reconciliation failed: {e}')
+        db.rollback()
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """Sweep once, or repeatedly until SIGTERM/SIGINT."""
+    parser = argparse.ArgumentParser(description='Reconcile stored objects with transcription jobs')
+    parser.add_argument('--once', action='store_true', help='run a single sweep and exit')
+    parser.add_argument('--dry-run', action='store_true', help='report orphans without deleting them')
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    while not stop.is_set():
+        reconcile_once(args.dry_run)
+        if args.once:
+            break
+        stop.wait(settings.STORAGE_RECONCILE_INTERVAL)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+Job status push endpoints (Server-Sent Events and WebSocket).
+"""
+
+import asyncio
+import logging
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.database import SessionLocal
+from src.models import TranscriptionJob
+from src.services.job_events import (
+    TERMINAL_STATUSES,
+    build_job_event,
+    format_sse,
+    job_event_hub,
+)
+from src.services.job_partitions import job_id_filter
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Comment line sent when idle so proxies keep the connection open
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _load_job_event(job_id: UUID) -> Optional[dict]:
+    """
+    Read the current job state (status columns only) as an event.
+
+    Opens its own short-lived session so a long-lived stream never holds a
+    database connection.
+    """
+    db = SessionLocal()
+    try:
+        row = db.query(
+            TranscriptionJob.status,
+            TranscriptionJob.error_message,
+            TranscriptionJob.completed_at,
+        ).filter(job_id_filter(job_id)).first()
+    finally:
+        db.close()
+
+    if row is None:
+        return None
+    return build_job_event(str(job_id), row.status.value, row.error_message, row.completed_at)
+
+
+async def _subscribe_with_snapshot(job_id: UUID):
+    """Subscribe first, then read the snapshot, so no state change is missed."""
+    queue = job_event_hub.subscribe(str(job_id))
+    try:
+        snapshot = await run_in_threadpool(_load_job_event, job_id)
+    except Exception:
+        job_event_hub.unsubscribe(str(job_id), queue)
+        raise
+    if snapshot is None:
+        job_event_hub.unsubscribe(str(job_id), queue)
+    else:
+        job_event_hub.observe(str(job_id), snapshot['status'])
+    return queue, snapshot
+
+
+async def _next_event(queue: asyncio.Queue, timeout: float) -> Optional[dict]:
+    """
+    Wait up to `timeout` seconds for the job's next event.
+
+    Returns:
+        The event, or None if there was none within `timeout`
+    """
+    try:
+        return await asyncio.wait_for(queue.get(), timeout=timeout)
+    except asyncio.TimeoutError:
+        return None
+
+
+@router.get('/transcriptions/{job_id}/events')
+async def stream_transcription_events(job_id: UUID, request: Request) -> StreamingResponse:
+    """
+    Stream job status changes as Server-Sent Events.
+
+    The first event is the current status; the stream ends after a
+    `completed`, `failed` or `deleted` event. Replaces polling
+    GET /transcriptions/{job_id}/status.
+
+    Args:
+        job_id: UUID of the transcription job
+        request: Incoming request (used to detect client disconnects)
+
+    Returns:
+        text/event-stream response
+
+    Raises:
+        HTTPException: 404 if job not found
+    """
+    queue, snapshot = await _subscribe_with_snapshot(job_id)
+    if snapshot is None:
+        logger.warning(f'Transcription job not found: {job_id}')
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Transcription not found'
+        )
+
+    async def event_stream():
+        try:
+            yield format_sse(snapshot)
+            if snapshot['status'] in TERMINAL_STATUSES:
+                return
+            event = snapshot
+            while not await request.is_disconnected():
+                next_event = await _next_event(queue, SSE_KEEPALIVE_SECONDS)
+                if next_event is None:
+                    yield ': keepalive\n\n'
+                    continue
+                event = next_event
+                yield format_sse(event)
+                if event['status'] in TERMINAL_STATUSES:
+                    return
+        finally:
+            job_event_hub.unsubscribe(str(job_id), queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@router.websocket('/transcriptions/{job_id}/ws')
+async def transcription_events_websocket(websocket: WebSocket, job_id: UUID) -> None:
+    """
+    Push job status changes over a WebSocket (same events as the SSE stream).
+
+    The connection is closed after a terminal event, or with code 4404 if
+    the job does not exist. Messages from the client are ignored; the
+    socket is read only to notice a disconnect while no event arrives.
+    """
+    await websocket.accept()
+    queue, snapshot = await _subscribe_with_snapshot(job_id)
+    if snapshot is None:
+        await websocket.close(code=4404)
+        return
+
+    receive = asyncio.ensure_future(websocket.receive())
+    waiting: Optional[asyncio.Future] = None
+    try:
+        await websocket.send_json(snapshot)
+        event = snapshot
+        while event['status'] not in TERMINAL_STATUSES:
+            if waiting is None:
+                waiting = asyncio.ensure_future(_next_event(queue, SSE_KEEPALIVE_SECONDS))
+            done, _ = await asyncio.wait({receive, waiting}, return_when=asyncio.FIRST_COMPLETED)
+            if receive in done:
+                if receive.result()['type'] == 'websocket.disconnect':
+                    return
+                receive = asyncio.ensure_future(websocket.receive())
+            if waiting in done:
+                next_event, waiting = waiting.result(), None
+                if next_event is not None:
+                    event = next_event
+                    await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in (receive, waiting):
+            if task is not None:
+                task.cancel()
+        job_event_hub.unsubscribe(str(job_id), queue)
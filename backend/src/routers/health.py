@@ -1,80 +1,34 @@
 """
 Health check endpoint for Cloud Run/Kubernetes probes.
+
+Dependencies are probed in the background (see services/health_monitor.py);
+these endpoints only read the cached results.
 """
 
 import logging
-import time
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-import redis
+from fastapi import APIRouter, HTTPException
 
-from src.database import get_db
-from src.schemas import HealthCheckResponse, ServiceStatus
-from src.config import settings
+from src.schemas import HealthCheckResponse
+from src.services.health_monitor import health_monitor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-def check_database(db: Session) -> ServiceStatus:
-    """Check database connectivity."""
-    try:
-        start = time.time()
-        db.execute(text('SELECT 1'))
-        latency = (time.time() - start) * 1000
-        return ServiceStatus(status='connected', latency_ms=round(latency, 2))
-    except Exception as e:
-        logger.error(f'Database health check failed: {e}')
-        return ServiceStatus(status='disconnected', error=str(e))
-
-
-def check_redis() -> ServiceStatus:
-    """Check Redis connectivity."""
-    try:
-        start = time.time()
-        r = redis.from_url(settings.REDIS_URL, socket_connect_timeout=5)
-        r.ping()
-        latency = (time.time() - start) * 1000
-        r.close()
-        return ServiceStatus(status='connected', latency_ms=round(latency, 2))
-    except Exception as e:
-        logger.error(f'Redis health check failed: {e}')
-        return ServiceStatus(status='disconnected', error=str(e))
-
-
-def check_celery() -> ServiceStatus:
-    """Check Celery worker availability via Redis."""
-    try:
-        start = time.time()
-        r = redis.from_url(settings.REDIS_URL, socket_connect_timeout=5)
-        # Check if Celery has registered tasks (basic check)
-        # More sophisticated check would require celery.control.inspect()
-        celery_keys = r.keys('celery*')
-        latency = (time.time() - start) * 1000
-        r.close()
-        # If we can connect to Redis, Celery broker is reachable
-        return ServiceStatus(
-            status='connected',
-            latency_ms=round(latency, 2)
-        )
-    except Exception as e:
-        logger.error(f'Celery health check failed: {e}')
-        return ServiceStatus(status='unknown', error=str(e))
-
-
 @router.get('/health', response_model=HealthCheckResponse)
-def health_check(db: Session = Depends(get_db)) -> HealthCheckResponse:
+def health_check() -> HealthCheckResponse:
     """
     Comprehensive health check endpoint.
 
-    Verifies:
-    - API is running
-    - Database connection is active
-    - Redis connection is active
-    - Celery broker is reachable
+    Reports the latest background probe of:
+    - Database connection
+    - Redis connection
+    - Job queue workers (live workers from heartbeats, jobs waiting)
+    - Celery broker (queue length, optionally pinged workers)
+
+    Each service carries checked_at and age_seconds of its result.
 
     Returns:
         HealthCheckResponse with detailed service status
@@ -82,16 +36,8 @@ def health_check(db: Session = Depends(get_db)) -> HealthCheckResponse:
     Raises:
         HTTPException: If critical services (database) are unavailable
     """
-    # Check all services
-    db_status = check_database(db)
-    redis_status = check_redis()
-    celery_status = check_celery()
-
-    services = {
-        'database': db_status,
-        'redis': redis_status,
-        'celery': celery_status,
-    }
+    services = health_monitor.results()
+    db_status = services['database']
 
     # Determine overall health status
     critical_healthy = db_status.status == 'connected'
@@ -126,14 +72,13 @@ def liveness_probe():
 
 
 @router.get('/health/ready')
-def readiness_probe(db: Session = Depends(get_db)):
+def readiness_probe():
     """
     Kubernetes readiness probe - checks if the app can serve traffic.
-    Checks critical dependencies (database).
+    Checks critical dependencies (database) from the cached probe result.
     """
-    try:
-        db.execute(text('SELECT 1'))
-        return {'status': 'ready'}
-    except Exception as e:
-        logger.error(f'Readiness check failed: {e}')
+    db_status = health_monitor.results()['database']
+    if db_status.status != 'connected':
+        logger.error(f'Readiness check failed: {db_status.error}')
         raise HTTPException(status_code=503, detail='Not ready')
+    return {'status': 'ready'}
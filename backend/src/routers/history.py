@@ -0,0 +1,460 @@
+"""
+Transcription history API endpoints.
+
+These routes are registered before the transcription router so that
+/transcriptions/history is not captured by /transcriptions/{job_id}.
+"""
+
+import logging
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal, db_utc_now, get_db
+from src.models import TranscriptionJob, TranscriptionStatus
+from src.schemas import (
+    TranscriptionHistoryBulkItemResult,
+    TranscriptionHistoryChangesResponse,
+    TranscriptionHistoryBulkResponse,
+    TranscriptionHistoryCreate,
+    TranscriptionHistoryPageResponse,
+    TranscriptionHistoryResponse,
+    TranscriptionJobResponse,
+    TranscriptionSearchResponse,
+    TranscriptionSearchResult
+)
+from src.services.history_export import EXPORT_MEDIA_TYPES, history_export_service, to_utc_naive
+from src.services.history_service import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SEARCH_PAGE_SIZE,
+    MAX_BULK_HISTORY_ITEMS,
+    MAX_PAGE_SIZE,
+    MAX_SEARCH_OFFSET,
+    history_service
+)
+from src.services.job_cache import job_cache
+from src.services.job_events import publish_job_event
+from src.services.job_partitions import job_id_filter, job_partitions
+from src.services.transcript_store import transcript_store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get('/transcriptions/history', response_model=TranscriptionHistoryPageResponse)
+def get_transcription_history(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    include_text: bool = Query(False, alias='includeText'),
+    db: Session = Depends(get_db)
+) -> TranscriptionHistoryPageResponse:
+    """
+    Get one page of transcription history.
+
+    Frontend uses localStorage for history management, but this endpoint
+    allows backup/sync functionality. Pass the returned `nextCursor` as
+    `cursor` to fetch the following page. Entries carry only the preview
+    unless `includeText=true`; the detail endpoint returns the full text.
+
+    Args:
+        limit: Page size (1-200)
+        cursor: Opaque cursor from the previous page
+        include_text: Include the full transcriptionText of every entry
+        db: Database session
+
+    Returns:
+        TranscriptionHistoryPageResponse with items and nextCursor
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
+
+    Note:
+        - Only returns completed transcriptions
+        - Ordered by created_at descending (newest first)
+        - Preview text is first 100 characters of transcription
+        - transcriptionText is null unless includeText=true
+        - nextCursor is null on the last page
+    """
+    jobs, next_cursor = history_service.list_completed(db, limit, cursor, include_text)
+
+    history = [TranscriptionHistoryResponse.from_transcription_job(job, include_text) for job in jobs]
+    logger.info(f'Retrieved {len(history)} transcription history records')
+
+    return TranscriptionHistoryPageResponse(items=history, nextCursor=next_cursor)
+
+
+@router.get('/transcriptions/search', response_model=TranscriptionSearchResponse)
+def search_transcriptions(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_SEARCH_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET),
+    db: Session = Depends(get_db)
+) -> TranscriptionSearchResponse:
+    """
+    Search completed transcriptions by transcript text and filename.
+
+    Matching is a case-insensitive substring match, so Japanese queries work
+    without word segmentation. Pass the returned `nextOffset` as `offset` to
+    fetch the following page.
+
+    Args:
+        q: Search string
+        limit: Page size (1-200)
+        offset: Number of results to skip (up to 1000)
+        db: Database session
+
+    Returns:
+        TranscriptionSearchResponse with snippet-highlighted items
+
+    Note:
+        - Results are newest first; score reports a filename hit and occurrences
+        - Snippets are HTML-escaped with hits wrapped in <mark>
+        - nextOffset is null on the last page
+    """
+    query = q.strip()
+    if not query:
+        return TranscriptionSearchResponse(items=[], nextOffset=None)
+
+    results, next_offset = history_service.search(db, query, limit, offset)
+    return TranscriptionSearchResponse(
+        items=[TranscriptionSearchResult(**result) for result in results],
+        nextOffset=next_offset
+    )
+
+
+@router.post('/transcriptions/history', status_code=status.HTTP_201_CREATED)
+def create_transcription_history(
+    history_data: TranscriptionHistoryCreate = Body(...),
+    db: Session = Depends(get_db)
+) -> None:
+    """
+    Create a new transcription history record.
+
+    MVP version: Creates a database record from localStorage data.
+    This allows users to persist their localStorage history to database.
+
+    Args:
+        history_data: Transcription history data from frontend
+        db: Database session
+
+    Returns:
+        None (201 Created)
+
+    Raises:
+        HTTPException: 500 if database operation fails
+
+    Note:
+        - Frontend sends complete history data including ID
+        - If ID already exists, returns success (idempotent)
+        - This is primarily for localStorage backup functionality
+    """
+    # Before this session touches the table: creating a partition waits for open transactions on it
+    job_partitions.ensure_partitions([history_data.created_at])
+    # Until the commit, a concurrent import of this ID waits here and then sees this row
+    history_service.lock_imported_ids(db, [history_data.id])
+
+    # Check if record already exists
+    existing_job = db.query(TranscriptionJob).filter(
+        job_id_filter(history_data.id)
+    ).first()
+
+    if existing_job:
+        logger.info(f'Transcription history already exists: {history_data.id}')
+        return None
+
+    # Create new transcription job record
+    try:
+        job = TranscriptionJob(
+            id=history_data.id,
+            original_filename=history_data.original_filename,
+            file_url='',  # Not needed for history-only records
+            file_size=history_data.file_size or 0,
+            duration=history_data.duration,
+            status=TranscriptionStatus.COMPLETED,
+            created_at=history_data.created_at,
+            updated_at=db_utc_now(),  # import time (database clock), so the changes feed picks it up
+            completed_at=history_data.created_at
+        )
+
+        db.add(job)
+        transcript_store.assign(job, history_data.transcription_text)
+        db.commit()
+        job_cache.store_job(job)
+        logger.info(f'Created transcription history record: {history_data.id}')
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f'Failed to create transcription history: {e}')
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail='Failed to save transcription history'
+        )
+
+    return None
+
+
+@router.post(
+    '/transcriptions/history/bulk',
+    response_model=TranscriptionHistoryBulkResponse,
+    status_code=status.HTTP_201_CREATED
+)
+def create_transcription_history_bulk(
+    records: List[TranscriptionHistoryCreate] = Body(...),
+    db: Session = Depends(get_db)
+) -> TranscriptionHistoryBulkResponse:
+    """
+    Create many transcription history records at once.
+
+    Lets the frontend sync a whole localStorage backlog in one request.
+    All records are validated before anything is written; existing IDs
+    are left untouched (idempotent, like the single-record endpoint).
+
+    Args:
+        records: Transcription history data from frontend (up to 1000)
+        db: Database session
+
+    Returns:
+        TranscriptionHistoryBulkResponse with per-record results in input order
+
+    Raises:
+        HTTPException: 400 if more than 1000 records are sent
+        HTTPException: 500 if database operation fails
+    """
+    if len(records) > MAX_BULK_HISTORY_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                'error': f'At most {MAX_BULK_HISTORY_ITEMS} records can be imported at once',
+                'type': 'validation',
+                'retryable': False,
+            }
+        )
+
+    try:
+        results = history_service.bulk_create(db, records)
+    except Exception as e:
+        db.rollback()
+        logger.error(f'Failed to import transcription history: {e}')
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail='Failed to save transcription history'
+        )
+
+    created = sum(1 for _, was_created in results if was_created)
+    return TranscriptionHistoryBulkResponse(
+        results=[
+            TranscriptionHistoryBulkItemResult(id=job_id, status='created' if was_created else 'exists')
+            for job_id, was_created in results
+        ],
+        created=created,
+        existed=len(results) - created
+    )
+
+
+@router.get('/transcriptions/history/changes', response_model=TranscriptionHistoryChangesResponse)
+def get_transcription_history_changes(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    include_text: bool = Query(True, alias='includeText'),
+    db: Session = Depends(get_db)
+) -> TranscriptionHistoryChangesResponse:
+    """
+    Get history changes since the last sync (delta sync).
+
+    Returns completed transcriptions created or updated, and IDs deleted,
+    since `cursor`. Store `nextCursor` and send it on the next sync; while
+    `hasMore` is true, call again immediately. A sync with nothing new
+    returns empty lists and the same position.
+
+    Args:
+        cursor: Cursor from the previous sync (omit for a full initial sync)
+        limit: Maximum changed and deleted entries per call (1-200 each)
+        include_text: Include transcriptionText of changed entries
+        db: Database session
+
+    Returns:
+        TranscriptionHistoryChangesResponse with changed entries, deleted IDs and nextCursor
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
+
+    Note:
+        - Changes from the last few seconds are delivered on the next sync
+        - Apply deletions before changes
+    """
+    jobs, deleted_ids, next_cursor, has_more = history_service.get_changes(db, cursor, limit, include_text)
+
+    logger.info(f'History sync: {len(jobs)} changed, {len(deleted_ids)} deleted, has_more={has_more}')
+    return TranscriptionHistoryChangesResponse(
+        changed=[TranscriptionHistoryResponse.from_transcription_job(job, include_text) for job in jobs],
+        deleted=deleted_ids,
+        nextCursor=next_cursor,
+        hasMore=has_more
+    )
+
+
+def _export_stream(
+    export_format: str,
+    job_status: TranscriptionStatus,
+    created_from: Optional[datetime],
+    created_to: Optional[datetime]
+):
+    """
+    Yield the encoded export.
+
+    Runs after the endpoint has returned, so it opens its own session
+    (request-scoped sessions are closed before the body is sent).
+    """
+    db = SessionLocal()
+    try:
+        records = history_export_service.iter_records(db, job_status, created_from, created_to)
+        if export_format == 'zip':
+            yield from history_export_service.zip_chunks(records)
+        else:
+            yield from history_export_service.ndjson_chunks(records)
+    finally:
+        db.close()
+
+
+@router.get('/transcriptions/history/export')
+def export_transcription_history(
+    export_format: str = Query('ndjson', alias='format', pattern='^(ndjson|zip)$'),
+    job_status: TranscriptionStatus = Query(TranscriptionStatus.COMPLETED, alias='status'),
+    created_from: Optional[datetime] = Query(None, alias='from'),
+    created_to: Optional[datetime] = Query(None, alias='to')
+) -> StreamingResponse:
+    """
+    Stream every transcription matching the filters.
+
+    Rows are read through a server-side cursor and sent as they are
+    encoded, so memory stays flat for exports of any size.
+
+    Args:
+        export_format: 'ndjson' (one JSON object per line) or 'zip' (one .txt per transcript)
+        job_status: Status to export (default completed)
+        created_from: Only jobs created at or after this time
+        created_to: Only jobs created before this time
+
+    Returns:
+        StreamingResponse with the export as an attachment
+
+    Raises:
+        HTTPException: 400 if from is not before to
+
+    Note:
+        - Ordered by createdAt ascending (oldest first)
+        - from/to without a timezone are taken as UTC
+        - Zip entries are named {YYYY-MM-DD}/{filename stem}_{id}.txt; jobs without text are skipped
+        - The zip central directory grows with the entry count; use NDJSON for full exports
+    """
+    created_from, created_to = to_utc_naive(created_from), to_utc_naive(created_to)
+    if created_from and created_to and created_from >= created_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={'error': '"from" must be before "to"', 'type': 'validation', 'retryable': False}
+        )
+
+    filename = f'transcriptions-{datetime.utcnow():%Y%m%dT%H%M%S}.{export_format}'
+    logger.info(
+        f'Starting {export_format} export: status={job_status.value}, from={created_from}, to={created_to}'
+    )
+    return StreamingResponse(
+        _export_stream(export_format, job_status, created_from, created_to),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get('/transcriptions/history/{history_id}', response_model=TranscriptionHistoryResponse)
+def get_transcription_history_detail(
+    history_id: UUID,
+    db: Session = Depends(get_db)
+) -> TranscriptionHistoryResponse:
+    """
+    Get transcription history detail by ID.
+
+    Args:
+        history_id: UUID of the transcription history record
+        db: Database session
+
+    Returns:
+        TranscriptionHistoryResponse with full details
+
+    Raises:
+        HTTPException: 404 if history not found
+    """
+    cached = job_cache.get_result(history_id)
+    if cached:
+        return TranscriptionHistoryResponse.from_transcription_job(cached)
+
+    job = db.query(TranscriptionJob).filter(job_id_filter(history_id)).first()
+
+    if not job:
+        logger.warning(f'Transcription history not found: {history_id}')
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='History not found'
+        )
+
+    transcript_store.hydrate(db, [job])
+    logger.info(f'Retrieved transcription history detail: {history_id}')
+    job_cache.store_result(TranscriptionJobResponse.from_orm(job))
+    return TranscriptionHistoryResponse.from_transcription_job(job)
+
+
+@router.delete('/transcriptions/history/{history_id}', status_code=status.HTTP_204_NO_CONTENT)
+def delete_transcription_history(
+    history_id: UUID,
+    db: Session = Depends(get_db)
+) -> None:
+    """
+    Delete transcription history by ID.
+
+    MVP version: Deletes the database record only.
+    Frontend manages localStorage separately.
+
+    Args:
+        history_id: UUID of the transcription history record
+        db: Database session
+
+    Returns:
+        None (204 No Content)
+
+    Raises:
+        HTTPException: 404 if history not found
+        HTTPException: 500 if database operation fails
+
+    Note:
+        - This only deletes the database record
+        - R2 file deletion is handled separately if needed
+        - Frontend should also delete from localStorage
+    """
+    job = db.query(TranscriptionJob).filter(job_id_filter(history_id)).first()
+
+    if not job:
+        logger.warning(f'Transcription history not found for deletion: {history_id}')
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='History not found'
+        )
+
+    try:
+        db.delete(job)
+        history_service.record_deletions(db, [history_id])
+        db.commit()
+        job_cache.invalidate([history_id])
+        publish_job_event(history_id, 'deleted')
+        logger.info(f'Deleted transcription history: {history_id}')
+    except Exception as e:
+        db.rollback()
+        logger.error(f'Failed to delete transcription history: {e}')
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail='Failed to delete transcription history'
+        )
+
+    return None
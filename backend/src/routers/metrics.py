@@ -0,0 +1,21 @@
+"""
+Prometheus metrics endpoint.
+"""
+
+from fastapi import APIRouter, Response
+
+from src.services.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get('/metrics', include_in_schema=False)
+def metrics() -> Response:
+    """
+    Pipeline metrics in the Prometheus text format.
+
+    In multiprocess mode (PROMETHEUS_MULTIPROC_DIR) the values of every
+    API, worker and Celery process sharing the directory are aggregated.
+    """
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
@@ -3,22 +3,32 @@ Transcription API endpoints.
 """
 
 import logging
-from typing import List
 from uuid import UUID
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Body, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 
-from src.database import get_db
+from src.database import get_async_db, get_db
 from src.models import TranscriptionJob, TranscriptionStatus
 from src.schemas import (
+    CacheStatsResponse,
+    DeduplicationStatsResponse,
+    StorageDeletionRetryResponse,
+    TranscriptionBatchDeleteRequest,
+    TranscriptionBatchDeleteResponse,
     TranscriptionJobResponse,
-    TranscriptionHistoryResponse,
-    TranscriptionHistoryCreate
+    TranscriptionStatusResponse
 )
+from src.services.history_service import history_service
+from src.services.job_cache import job_cache
+from src.services.job_deletion_service import job_deletion_service
+from src.services.job_events import publish_job_event
+from src.services.job_partitions import job_id_filter
+from src.services.metrics import UPLOAD_INGEST_SECONDS
+from src.services.transcript_store import transcript_store
 from src.services.r2_service import r2_service
 from src.services.transcription_service import transcription_service
-from src.tasks.transcription_task import process_transcription_sync
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +37,8 @@ router = APIRouter()
 
 @router.post('/transcriptions/upload', response_model=TranscriptionJobResponse, status_code=status.HTTP_201_CREATED)
 async def upload_file_for_transcription(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> TranscriptionJobResponse:
     """
     Upload a file for transcription.
@@ -37,14 +46,14 @@ async def upload_file_for_transcription(
     Process flow:
     1. Validate file (type and size)
     2. Upload file to R2 storage
-    3. Create database record with status='processing'
-    4. Queue background task for transcription
-    5. Return job details immediately
+    3. Create database record with status='processing', which queues it
+       for the transcription workers (or reuse a completed transcript of
+       identical media)
+    4. Return job details immediately
 
     Args:
-        background_tasks: FastAPI background tasks
         file: Audio or video file to transcribe
-        db: Database session
+        db: Async database session
 
     Returns:
         TranscriptionJobResponse with job details
@@ -53,34 +62,87 @@ async def upload_file_for_transcription(
         HTTPException: 400 if validation fails, 500 if processing fails
     """
     # Create transcription job (validates, uploads to R2, creates DB record)
-    job = await transcription_service.create_transcription_job(file, db)
+    with UPLOAD_INGEST_SECONDS.labels('direct').time():
+        job = await transcription_service.create_transcription_job(file, db)
 
-    # Queue background task for async processing (no Celery needed)
-    background_tasks.add_task(process_transcription_sync, str(job.id))
-    logger.info(f'Queued background transcription task for job {job.id}')
+    # Duplicate uploads come back already COMPLETED and need no processing
+    if job.status != TranscriptionStatus.PROCESSING:
+        logger.info(f'Skipped transcription for deduplicated job {job.id}')
+    else:
+        logger.info(f'Queued transcription job {job.id}')
 
     return TranscriptionJobResponse.from_orm(job)
 
 
-@router.get('/transcriptions/{job_id}/status', response_model=TranscriptionJobResponse)
+@router.get('/transcriptions/stats/deduplication', response_model=DeduplicationStatsResponse)
+def get_deduplication_stats(
+    db: Session = Depends(get_db)
+) -> DeduplicationStatsResponse:
+    """
+    Get upload deduplication statistics.
+
+    Args:
+        db: Database session
+
+    Returns:
+        DeduplicationStatsResponse with hit rate and transcription time saved
+    """
+    stats = transcription_service.get_deduplication_stats(db)
+    logger.info(f'Deduplication stats: {stats}')
+    return DeduplicationStatsResponse(**stats)
+
+
+@router.get('/transcriptions/stats/cache', response_model=CacheStatsResponse)
+def get_cache_stats() -> CacheStatsResponse:
+    """
+    Get job cache statistics for this API process.
+
+    Returns:
+        CacheStatsResponse with hit/miss counts and local cache usage
+    """
+    stats = job_cache.get_stats()
+    logger.info(f'Job cache stats: {stats}')
+    return CacheStatsResponse(**stats)
+
+
+@router.get('/transcriptions/{job_id}/status', response_model=TranscriptionStatusResponse)
 def get_transcription_status(
     job_id: UUID,
     db: Session = Depends(get_db)
-) -> TranscriptionJobResponse:
+) -> TranscriptionStatusResponse:
     """
     Get transcription job status.
 
+    Intended for polling: only the status columns are loaded, so the
+    transcript text is never read or serialized. Use
+    GET /transcriptions/{job_id} for the result.
+
     Args:
         job_id: UUID of the transcription job
         db: Database session
 
     Returns:
-        TranscriptionJobResponse with current job status
+        TranscriptionStatusResponse with current job status
 
     Raises:
         HTTPException: 404 if job not found
     """
-    job = db.query(TranscriptionJob).filter(TranscriptionJob.id == job_id).first()
+    cached = job_cache.get_status(job_id)
+    if cached:
+        return cached
+
+    job = db.query(TranscriptionJob).options(
+        load_only(
+            TranscriptionJob.id,
+            TranscriptionJob.status,
+            TranscriptionJob.error_message,
+            TranscriptionJob.attempts,
+            TranscriptionJob.created_at,
+            TranscriptionJob.updated_at,
+            TranscriptionJob.completed_at,
+            raiseload=True
+        )
+    ).filter(job_id_filter(job_id)).first()
 
     if not job:
         logger.warning(f'Transcription job not found: {job_id}')
@@ -90,7 +152,9 @@ def get_transcription_status(
         )
 
     logger.info(f'Retrieved status for job {job_id}: {job.status}')
-    return TranscriptionJobResponse.from_orm(job)
+    response = TranscriptionStatusResponse.from_orm(job)
+    job_cache.store_status(response)
+    return response
 
 
 @router.get('/transcriptions/{job_id}', response_model=TranscriptionJobResponse)
@@ -114,7 +178,11 @@ def get_transcription(
     Raises:
         HTTPException: 404 if job not found
     """
-    job = db.query(TranscriptionJob).filter(TranscriptionJob.id == job_id).first()
+    cached = job_cache.get_result(job_id)
+    if cached:
+        return cached
+
+    job = db.query(TranscriptionJob).filter(job_id_filter(job_id)).first()
 
     if not job:
         logger.warning(f'Transcription job not found: {job_id}')
@@ -123,8 +191,11 @@ def get_transcription(
             detail='Transcription not found'
         )
 
+    transcript_store.hydrate(db, [job])
     logger.info(f'Retrieved transcription for job {job_id}: {job.status}')
-    return TranscriptionJobResponse.from_orm(job)
+    response = TranscriptionJobResponse.from_orm(job)
+    job_cache.store_result(response)
+    return response
 
 
 @router.delete('/transcriptions/{job_id}', status_code=status.HTTP_204_NO_CONTENT)
@@ -150,7 +221,7 @@ def delete_transcription(
         HTTPException: 404 if job not found
         HTTPException: 500 if R2 deletion fails
     """
-    job = db.query(TranscriptionJob).filter(TranscriptionJob.id == job_id).first()
+    job = db.query(TranscriptionJob).filter(job_id_filter(job_id)).first()
 
     if not job:
         logger.warning(f'Transcription job not found for deletion: {job_id}')
@@ -174,7 +245,10 @@ def delete_transcription(
     # Delete from database first
     try:
         db.delete(job)
+        history_service.record_deletions(db, [job_id])
         db.commit()
+        job_cache.invalidate([job_id])
+        publish_job_event(job_id, 'deleted')
         logger.info(f'Deleted transcription job from database: {job_id}')
     except Exception as e:
         db.rollback()
@@ -184,6 +258,11 @@ def delete_transcription(
             detail='Failed to delete transcription from database'
         )
 
+    # Deduplicated jobs share one stored object; keep it while still referenced
+    if file_url and db.query(TranscriptionJob.id).filter(TranscriptionJob.file_url == file_url).first():
+        logger.info(f'File {object_name} is still referenced by another job, keeping it')
+        return None
+
     # Delete from R2 storage
     try:
         r2_service.delete_file(object_name)
@@ -193,190 +272,67 @@ def delete_transcription(
         # Database record is already deleted, so log error but don't raise exception
         # This follows the fail-fast principle while maintaining data consistency
         logger.warning(f'R2 file deletion failed for {object_name}, but database record was deleted')
+        job_deletion_service.queue_retries(db, {object_name: str(e)})
 
     return None
 
 
-# ==========================================
-# History Management Endpoints (MVP Version)
-# ==========================================
-
-@router.get('/transcriptions/history', response_model=List[TranscriptionHistoryResponse])
-def get_transcription_history(
-    db: Session = Depends(get_db)
-) -> List[TranscriptionHistoryResponse]:
-    """
-    Get all transcription history.
-
-    MVP version: Returns all completed transcriptions from database.
-    Frontend uses localStorage for history management, but this endpoint
-    allows backup/sync functionality.
-
-    Args:
-        db: Database session
-
-    Returns:
-        List of TranscriptionHistoryResponse with preview text
-
-    Note:
-        - Only returns completed transcriptions
-        - Ordered by created_at descending (newest first)
-        - Preview text is first 100 characters of transcription
-    """
-    jobs = db.query(TranscriptionJob).filter(
-        TranscriptionJob.status == TranscriptionStatus.COMPLETED
-    ).order_by(
-        TranscriptionJob.created_at.desc()
-    ).all()
-
-    history = [TranscriptionHistoryResponse.from_transcription_job(job) for job in jobs]
-    logger.info(f'Retrieved {len(history)} transcription history records')
-
-    return history
-
-
-@router.post('/transcriptions/history', status_code=status.HTTP_201_CREATED)
-def create_transcription_history(
-    history_data: TranscriptionHistoryCreate = Body(...),
+@router.post('/transcriptions/batch-delete', response_model=TranscriptionBatchDeleteResponse)
+def batch_delete_transcriptions(
+    request: TranscriptionBatchDeleteRequest,
     db: Session = Depends(get_db)
-) -> None:
+) -> TranscriptionBatchDeleteResponse:
     """
-    Create a new transcription history record.
+    Delete many transcription jobs and their files.
 
-    MVP version: Creates a database record from localStorage data.
-    This allows users to persist their localStorage history to database.
+    Jobs are removed with one DELETE ... RETURNING, then files no longer
+    referenced by any job are deleted from storage in bulk (DeleteObjects,
+    1000 keys per request). Files that fail to delete are kept on a retry
+    list (see /transcriptions/batch-delete/retry).
 
     Args:
-        history_data: Transcription history data from frontend
+        request: `ids` (up to 1000) or `older_than_days`, plus `limit`
         db: Database session
 
     Returns:
-        None (201 Created)
+        TranscriptionBatchDeleteResponse with deleted IDs and file results
 
     Raises:
-        HTTPException: 500 if database operation fails
+        HTTPException: 400 unless exactly one of ids and older_than_days is given
 
     Note:
-        - Frontend sends complete history data including ID
-        - If ID already exists, returns success (idempotent)
-        - This is primarily for localStorage backup functionality
+        - older_than_days matches completed and failed jobs only, oldest first
+        - At most `limit` jobs are deleted per call; repeat while has_more is true
+        - Unknown IDs are ignored
     """
-    # Check if record already exists
-    existing_job = db.query(TranscriptionJob).filter(
-        TranscriptionJob.id == history_data.id
-    ).first()
-
-    if existing_job:
-        logger.info(f'Transcription history already exists: {history_data.id}')
-        return None
-
-    # Create new transcription job record
-    try:
-        job = TranscriptionJob(
-            id=history_data.id,
-            original_filename=history_data.original_filename,
-            file_url='',  # Not needed for history-only records
-            file_size=history_data.file_size or 0,
-            duration=history_data.duration,
-            transcription_text=history_data.transcription_text,
-            status=TranscriptionStatus.COMPLETED,
-            created_at=history_data.created_at,
-            updated_at=history_data.created_at,
-            completed_at=history_data.created_at
-        )
-
-        db.add(job)
-        db.commit()
-        logger.info(f'Created transcription history record: {history_data.id}')
-
-    except Exception as e:
-        db.rollback()
-        logger.error(f'Failed to create transcription history: {e}')
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail='Failed to save transcription history'
-        )
-
-    return None
-
-
-@router.get('/transcriptions/history/{history_id}', response_model=TranscriptionHistoryResponse)
-def get_transcription_history_detail(
-    history_id: UUID,
-    db: Session = Depends(get_db)
-) -> TranscriptionHistoryResponse:
-    """
-    Get transcription history detail by ID.
-
-    Args:
-        history_id: UUID of the transcription history record
-        db: Database session
-
-    Returns:
-        TranscriptionHistoryResponse with full details
-
-    Raises:
-        HTTPException: 404 if history not found
-    """
-    job = db.query(TranscriptionJob).filter(TranscriptionJob.id == history_id).first()
-
-    if not job:
-        logger.warning(f'Transcription history not found: {history_id}')
+    if (request.ids is None) == (request.older_than_days is None):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='History not found'
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={'error': 'Specify exactly one of ids and older_than_days', 'type': 'validation', 'retryable': False}
         )
 
-    logger.info(f'Retrieved transcription history detail: {history_id}')
-    return TranscriptionHistoryResponse.from_transcription_job(job)
+    deleted_ids, objects_deleted, failed, has_more = job_deletion_service.delete_jobs(
+        db, request.ids, request.older_than_days, request.limit
+    )
+    return TranscriptionBatchDeleteResponse(
+        deleted_ids=deleted_ids,
+        deleted_count=len(deleted_ids),
+        objects_deleted=objects_deleted,
+        failed_objects=sorted(failed),
+        has_more=has_more
+    )
 
 
-@router.delete('/transcriptions/history/{history_id}', status_code=status.HTTP_204_NO_CONTENT)
-def delete_transcription_history(
-    history_id: UUID,
-    db: Session = Depends(get_db)
-) -> None:
+@router.post('/transcriptions/batch-delete/retry', response_model=StorageDeletionRetryResponse)
+def retry_storage_deletions(db: Session = Depends(get_db)) -> StorageDeletionRetryResponse:
     """
-    Delete transcription history by ID.
-
-    MVP version: Deletes the database record only.
-    Frontend manages localStorage separately.
+    Retry deleting files whose deletion failed earlier (oldest first, up to 1000).
 
     Args:
-        history_id: UUID of the transcription history record
         db: Database session
 
     Returns:
-        None (204 No Content)
-
-    Raises:
-        HTTPException: 404 if history not found
-        HTTPException: 500 if database operation fails
-
-    Note:
-        - This only deletes the database record
-        - R2 file deletion is handled separately if needed
-        - Frontend should also delete from localStorage
+        StorageDeletionRetryResponse with deleted and still failing counts
     """
-    job = db.query(TranscriptionJob).filter(TranscriptionJob.id == history_id).first()
-
-    if not job:
-        logger.warning(f'Transcription history not found for deletion: {history_id}')
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='History not found'
-        )
-
-    try:
-        db.delete(job)
-        db.commit()
-        logger.info(f'Deleted transcription history: {history_id}')
-    except Exception as e:
-        db.rollback()
-        logger.error(f'Failed to delete transcription history: {e}')
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail='Failed to delete transcription history'
-        )
-
-    return None
+    deleted, failed = job_deletion_service.retry_failed_deletions(db)
+    return StorageDeletionRetryResponse(deleted=deleted, failed=failed)
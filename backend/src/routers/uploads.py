@@ -0,0 +1,222 @@
+"""
+Resumable and presigned upload API endpoints.
+"""
+
+import logging
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Body
+from sqlalchemy.orm import Session
+
+from src.database import get_db
+from src.schemas import (
+    PresignedUploadResponse,
+    TranscriptionJobResponse,
+    UploadSessionCreate,
+    UploadSessionResponse,
+)
+from src.services.metrics import UPLOAD_INGEST_SECONDS
+from src.services.r2_service import async_storage, r2_service, LocalStorageService
+from src.services.transcription_service import MAX_FILE_SIZE, file_too_large_error
+from src.services.upload_session_service import upload_session_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post('/uploads', response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+def create_upload_session(
+    data: UploadSessionCreate = Body(...),
+    db: Session = Depends(get_db)
+) -> UploadSessionResponse:
+    """
+    Start a resumable chunked upload.
+
+    The client splits the file into `total_chunks` pieces of `chunk_size`
+    bytes (the last one holds the remainder) and PUTs each of them.
+
+    Args:
+        data: Declared filename, content type and total size
+        db: Database session
+
+    Returns:
+        UploadSessionResponse with chunk layout
+
+    Raises:
+        HTTPException: 400 if validation fails, 500 if storage fails
+    """
+    session = upload_session_service.create_session(data, db)
+    return upload_session_service.to_response(session)
+
+
+@router.get('/uploads/{upload_id}', response_model=UploadSessionResponse)
+def get_upload_session(
+    upload_id: UUID,
+    db: Session = Depends(get_db)
+) -> UploadSessionResponse:
+    """
+    Get upload session state, including which chunks have been received.
+
+    Clients resume an interrupted upload by sending only the chunks that
+    are missing from `received_chunks`.
+
+    Raises:
+        HTTPException: 404 if session not found
+    """
+    session = upload_session_service.get_session(upload_id, db)
+    return upload_session_service.to_response(session)
+
+
+@router.put('/uploads/{upload_id}/chunks/{chunk_number}', status_code=status.HTTP_204_NO_CONTENT)
+def upload_chunk(
+    upload_id: UUID,
+    chunk_number: int,
+    body: bytes = Body(..., media_type='application/octet-stream'),
+    db: Session = Depends(get_db)
+) -> None:
+    """
+    Upload one chunk (1-based). Chunks may arrive in any order and be retried.
+
+    Raises:
+        HTTPException: 400 if chunk number or size is invalid
+        HTTPException: 404 if session not found, 409 if no longer active
+    """
+    with UPLOAD_INGEST_SECONDS.labels('chunk').time():
+        upload_session_service.upload_chunk(upload_id, chunk_number, body, db)
+    return None
+
+
+@router.post(
+    '/uploads/{upload_id}/commit',
+    response_model=TranscriptionJobResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def commit_upload_session(
+    upload_id: UUID,
+    db: Session = Depends(get_db)
+) -> TranscriptionJobResponse:
+    """
+    Assemble the uploaded chunks and start transcription.
+
+    Behaves like POST /transcriptions/upload once all chunks are present.
+    Repeating a successful commit returns the same job without re-queuing it.
+
+    Raises:
+        HTTPException: 404 if session not found
+        HTTPException: 409 if chunks are missing or the session was aborted
+    """
+    job, created = upload_session_service.commit_session(upload_id, db)
+
+    if created:
+        logger.info(f'Queued transcription job {job.id}')
+
+    return TranscriptionJobResponse.from_orm(job)
+
+
+@router.delete('/uploads/{upload_id}', status_code=status.HTTP_204_NO_CONTENT)
+def abort_upload_session(
+    upload_id: UUID,
+    db: Session = Depends(get_db)
+) -> None:
+    """
+    Abort an upload session and discard its chunks.
+
+    Raises:
+        HTTPException: 404 if session not found, 409 if no longer active
+    """
+    upload_session_service.abort_session(upload_id, db)
+    return None
+
+
+# ==========================================
+# Presigned Direct-to-Storage Uploads
+# ==========================================
+
+@router.post('/uploads/presigned', response_model=PresignedUploadResponse, status_code=status.HTTP_201_CREATED)
+def create_presigned_upload(
+    data: UploadSessionCreate = Body(...),
+    db: Session = Depends(get_db)
+) -> PresignedUploadResponse:
+    """
+    Start a presigned upload.
+
+    The client PUTs the whole file to `upload_url` with the returned
+    `headers`, then calls the finalize endpoint. With R2 the bytes go
+    straight to the bucket; with local storage the URL points at the signed
+    local upload handler below.
+
+    Raises:
+        HTTPException: 400 if validation fails, 500 if storage fails
+    """
+    return upload_session_service.create_presigned_upload(data, db)
+
+
+@router.post(
+    '/uploads/presigned/{upload_id}/finalize',
+    response_model=TranscriptionJobResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def finalize_presigned_upload(
+    upload_id: UUID,
+    db: Session = Depends(get_db)
+) -> TranscriptionJobResponse:
+    """
+    Verify the uploaded object (HEAD size and type) and start transcription.
+
+    Repeating a successful finalize returns the same job without re-queuing it.
+
+    Raises:
+        HTTPException: 400 if size or type does not match the declaration
+        HTTPException: 404 if session not found, 409 if the object is missing
+    """
+    job, created = upload_session_service.finalize_presigned_upload(upload_id, db)
+
+    if created:
+        logger.info(f'Queued transcription job {job.id}')
+
+    return TranscriptionJobResponse.from_orm(job)
+
+
+@router.put('/uploads/local/{object_name}')
+async def local_presigned_upload(
+    object_name: str,
+    content_type: str,
+    expires: int,
+    signature: str,
+    request: Request,
+) -> Response:
+    """
+    Receive a presigned PUT when R2 is not configured (development only).
+
+    Mirrors R2 presigned URL semantics: the signature covers the object
+    name, content type and expiry, and the body is streamed to disk.
+
+    Raises:
+        HTTPException: 404 if R2 is configured, 403 if the URL is invalid or expired
+    """
+    if not isinstance(r2_service, LocalStorageService):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Not Found')
+
+    if not r2_service.verify_presigned_upload(object_name, content_type, expires, signature):
+        logger.warning(f'Rejected local upload with invalid signature: {object_name}')
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Invalid or expired upload URL')
+
+    if request.headers.get('content-type') != content_type:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Content-Type does not match upload URL')
+
+    with UPLOAD_INGEST_SECONDS.labels('local_presigned').time():
+        upload = await async_storage.start_streaming_upload(object_name)
+        file_size = 0
+        try:
+            async for chunk in request.stream():
+                file_size += len(chunk)
+                if file_size > MAX_FILE_SIZE:
+                    raise file_too_large_error()
+                await upload.write(chunk)
+            await upload.complete()
+        except BaseException:
+            await upload.abort()
+            raise
+
+    logger.info(f'Received local presigned upload {object_name} ({file_size} bytes)')
+    return Response(status_code=status.HTTP_200_OK)
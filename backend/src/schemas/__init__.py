@@ -4,7 +4,7 @@ These schemas match the frontend TypeScript types for consistency.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
@@ -53,22 +53,69 @@ class TranscriptionJobResponse(TranscriptionJobBase):
 
 
 class TranscriptionStatusResponse(BaseModel):
-    """Schema for transcription status check response."""
+    """Schema for transcription status check response (no transcript text)."""
     id: UUID
     status: str
-    transcription_text: Optional[str] = None
     error_message: Optional[str] = None
+    attempts: int = 0
+    created_at: datetime
+    updated_at: datetime
     completed_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 
+class DeduplicationStatsResponse(BaseModel):
+    """Schema for upload deduplication statistics."""
+    total_uploads: int
+    deduplicated_uploads: int
+    hit_rate: float
+    time_saved_seconds: float
+
+
+class CacheStatsResponse(BaseModel):
+    """Schema for job cache statistics (counters are per API process)."""
+    backend: str
+    hits: dict[str, int]
+    misses: dict[str, int]
+    hit_rate: float
+    local_entries: int
+    local_bytes: int
+    local_max_bytes: int
+
+
+class TranscriptionBatchDeleteRequest(BaseModel):
+    """Schema for a batch delete: explicit IDs or an age filter (exactly one)."""
+    ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=1000)
+    older_than_days: Optional[int] = Field(None, ge=1)
+    limit: int = Field(1000, ge=1, le=1000)
+
+
+class TranscriptionBatchDeleteResponse(BaseModel):
+    """Schema for a batch delete result."""
+    deleted_ids: List[UUID]
+    deleted_count: int
+    objects_deleted: int
+    failed_objects: List[str]  # kept on the retry list
+    has_more: bool  # more jobs match older_than_days
+
+
+class StorageDeletionRetryResponse(BaseModel):
+    """Schema for a storage deletion retry run."""
+    deleted: int
+    failed: int
+
+
 class ServiceStatus(BaseModel):
     """Schema for individual service status."""
     status: str  # 'connected', 'disconnected', 'unknown'
     latency_ms: Optional[float] = None
     error: Optional[str] = None
+    checked_at: Optional[datetime] = None  # when the background probe ran
+    age_seconds: Optional[float] = None  # age of the cached result when served
+    workers: Optional[int] = None  # live workers (worker services)
+    queue_depth: Optional[int] = None  # jobs waiting to be picked up (worker services)
 
 
 class HealthCheckResponse(BaseModel):
@@ -91,7 +138,7 @@ class TranscriptionHistoryResponse(BaseModel):
     """Schema for transcription history response."""
     id: UUID
     original_filename: str = Field(..., alias='originalFilename')
-    transcription_text: str = Field(..., alias='transcriptionText')
+    transcription_text: Optional[str] = Field(None, alias='transcriptionText')
     created_at: datetime = Field(..., alias='createdAt')
     preview_text: Optional[str] = Field(None, alias='previewText')
     file_size: Optional[int] = Field(None, alias='fileSize')
@@ -102,16 +149,22 @@ class TranscriptionHistoryResponse(BaseModel):
         populate_by_name = True
 
     @classmethod
-    def from_transcription_job(cls, job):
-        """Convert TranscriptionJob to TranscriptionHistoryResponse."""
-        preview = None
-        if job.transcription_text:
-            preview = job.transcription_text[:100] if len(job.transcription_text) > 100 else job.transcription_text
+    def from_transcription_job(cls, job, include_text: bool = True):
+        """
+        Convert TranscriptionJob to TranscriptionHistoryResponse.
+
+        With include_text=False only the stored preview is read, so list
+        queries never need to load the transcript column.
+        """
+        text = job.transcription_text or '' if include_text else None
+        preview = getattr(job, 'preview_text', None)
+        if preview is None and text:
+            preview = text[:100]
 
         return cls(
             id=job.id,
             originalFilename=job.original_filename,
-            transcriptionText=job.transcription_text or '',
+            transcriptionText=text,
             createdAt=job.created_at,
             previewText=preview,
             fileSize=job.file_size,
@@ -119,6 +172,49 @@ class TranscriptionHistoryResponse(BaseModel):
         )
 
 
+class TranscriptionHistoryPageResponse(BaseModel):
+    """Schema for one page of transcription history."""
+    items: List[TranscriptionHistoryResponse]
+    next_cursor: Optional[str] = Field(None, alias='nextCursor')
+
+    class Config:
+        populate_by_name = True
+
+
+class TranscriptionHistoryChangesResponse(BaseModel):
+    """Schema for the history delta sync changes feed."""
+    changed: List[TranscriptionHistoryResponse]
+    deleted: List[UUID]
+    next_cursor: str = Field(..., alias='nextCursor')
+    has_more: bool = Field(..., alias='hasMore')
+
+    class Config:
+        populate_by_name = True
+
+
+class TranscriptionSearchResult(BaseModel):
+    """Schema for one transcript search hit."""
+    id: UUID
+    original_filename: str = Field(..., alias='originalFilename')
+    created_at: datetime = Field(..., alias='createdAt')
+    file_size: Optional[int] = Field(None, alias='fileSize')
+    duration: Optional[float] = None
+    score: float
+    snippet: str  # HTML-escaped, hits wrapped in <mark>
+
+    class Config:
+        populate_by_name = True
+
+
+class TranscriptionSearchResponse(BaseModel):
+    """Schema for one page of transcript search results."""
+    items: List[TranscriptionSearchResult]
+    next_offset: Optional[int] = Field(None, alias='nextOffset')
+
+    class Config:
+        populate_by_name = True
+
+
 class TranscriptionHistoryCreate(BaseModel):
     """Schema for creating a transcription history record."""
     id: UUID
@@ -131,3 +227,47 @@ class TranscriptionHistoryCreate(BaseModel):
 
     class Config:
         populate_by_name = True
+
+
+class TranscriptionHistoryBulkItemResult(BaseModel):
+    """Schema for the outcome of one record in a bulk history import."""
+    id: UUID
+    status: str  # 'created' | 'exists'
+
+
+class TranscriptionHistoryBulkResponse(BaseModel):
+    """Schema for a bulk history import response."""
+    results: List[TranscriptionHistoryBulkItemResult]
+    created: int
+    existed: int
+
+
+class UploadSessionCreate(BaseModel):
+    """Schema for starting a resumable chunked upload."""
+    filename: str = Field(..., max_length=255)
+    content_type: str = Field(..., max_length=100)
+    file_size: int = Field(..., gt=0)
+
+
+class UploadSessionResponse(BaseModel):
+    """Schema for resumable upload session state."""
+    id: UUID
+    original_filename: str
+    file_size: int
+    chunk_size: int
+    total_chunks: int
+    received_chunks: List[int] = []
+    status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class PresignedUploadResponse(BaseModel):
+    """Schema for a presigned direct-to-storage upload."""
+    id: UUID
+    upload_url: str
+    method: str = 'PUT'
+    headers: dict[str, str] = {}
+    expires_at: datetime
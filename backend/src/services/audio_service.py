@@ -0,0 +1,279 @@
+"""
+Audio processing with ffmpeg.
+
+ffmpeg runs as a subprocess that reads from a file or pipe and writes to a
+file, so memory use is constant regardless of recording length (no decode
+to raw PCM in Python).
+
+Long recordings are split at silence boundaries into segments that fit the
+Whisper API limit, so they can be transcribed in parallel and stitched back
+together in order.
+"""
+
+import logging
+import re
+import shutil
+import subprocess
+import time
+from difflib import SequenceMatcher
+from typing import BinaryIO, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Recordings longer than this are split into segments of about this length
+SEGMENT_TARGET_SECONDS = 10 * 60
+
+# How far before a target cut point to look for a silence to cut at
+SEGMENT_SEARCH_WINDOW_SECONDS = 60
+
+# Audio shared by consecutive segments so words at a cut are never lost
+SEGMENT_OVERLAP_SECONDS = 2.0
+
+# Extensions the Whisper API accepts as-is; anything else (e.g. .mov) is transcoded
+WHISPER_SUPPORTED_EXTENSIONS = {'.mp3', '.mp4', '.mpeg', '.mpga', '.m4a', '.wav', '.webm'}
+
+# Voice-optimized output format for transcoding
+TRANSCODE_BITRATE = '64k'
+
+# silencedetect parameters (voice recordings)
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_SECONDS = 0.5
+
+# Transcript overlap (in characters) checked when stitching segments. Whisper
+# rarely transcribes the shared audio identically (punctuation, kana/kanji, a
+# word cut at the segment edge), so the repeated text only has to be similar
+# (difflib ratio), and may differ in length by STITCH_LENGTH_SLACK_CHARS.
+STITCH_MAX_OVERLAP_CHARS = 60
+STITCH_MIN_OVERLAP_CHARS = 4
+STITCH_LENGTH_SLACK_CHARS = 3
+STITCH_MIN_SIMILARITY = 0.75
+
+_SILENCE_START = re.compile(r'silence_start: (-?[\d.]+)')
+_SILENCE_END = re.compile(r'silence_end: (-?[\d.]+)')
+
+
+def probe_duration(path: str) -> float:
+    """
+    Get media duration in seconds with ffprobe.
+
+    Raises:
+        subprocess.CalledProcessError: If ffprobe fails
+    """
+    result = subprocess.run(
+        [
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip())
+
+
+def detect_silences(path: str) -> List[Tuple[float, float]]:
+    """
+    Find silent intervals with ffmpeg's silencedetect filter.
+
+    ffmpeg's log is parsed line by line as it is produced, so memory use
+    does not depend on the recording length.
+
+    Returns:
+        List of (start, end) seconds of each silence, in order
+    """
+    process = subprocess.Popen(
+        [
+            'ffmpeg', '-hide_banner', '-nostats', '-i', path,
+            '-vn', '-af', f'silencedetect=noise={SILENCE_NOISE_DB}dB:d={SILENCE_MIN_SECONDS}',
+            '-f', 'null', '-',
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    silences = []
+    silence_start = None
+    for line in process.stderr:
+        match = _SILENCE_START.search(line)
+        if match:
+            silence_start = max(float(match.group(1)), 0.0)
+            continue
+        match = _SILENCE_END.search(line)
+        if match and silence_start is not None:
+            silences.append((silence_start, float(match.group(1))))
+            silence_start = None
+
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, 'ffmpeg silencedetect')
+
+    return silences
+
+
+def plan_segments(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    target_seconds: float = SEGMENT_TARGET_SECONDS,
+    search_window: float = SEGMENT_SEARCH_WINDOW_SECONDS,
+    overlap: float = SEGMENT_OVERLAP_SECONDS,
+) -> List[Tuple[float, float]]:
+    """
+    Choose segment boundaries, preferring the middle of a silence.
+
+    Each cut is placed at the latest silence within `search_window` seconds
+    before the target length (or at the target if there is none). Every
+    segment after the first starts `overlap` seconds before its cut.
+
+    Args:
+        duration: Total duration in seconds
+        silences: Silent intervals from detect_silences
+        target_seconds: Maximum segment length before overlap
+        search_window: How far back from the target to look for silence
+        overlap: Seconds shared with the previous segment
+
+    Returns:
+        List of (start, end) seconds covering the whole recording
+    """
+    if duration <= target_seconds:
+        return [(0.0, duration)]
+
+    cut_candidates = [(start + end) / 2 for start, end in silences]
+
+    cuts = []
+    position = 0.0
+    while duration - position > target_seconds:
+        target = position + target_seconds
+        in_window = [c for c in cut_candidates if target - search_window <= c <= target and c > position]
+        cut = in_window[-1] if in_window else target
+        cuts.append(cut)
+        position = cut
+
+    segments = []
+    start = 0.0
+    for cut in cuts:
+        segments.append((max(start - overlap, 0.0) if segments else start, cut))
+        start = cut
+    segments.append((max(start - overlap, 0.0), duration))
+    return segments
+
+
+def transcode_audio(
+    input_path: Optional[str],
+    output_path: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    input_stream: Optional[BinaryIO] = None,
+) -> float:
+    """
+    Transcode media to 64kbps mono MP3 with an ffmpeg subprocess.
+
+    Handles every supported upload type (audio and video containers; video
+    streams are dropped). Input is either a file path or, with
+    `input_stream`, a binary stream piped to ffmpeg's stdin in chunks.
+
+    Args:
+        input_path: Source file (ignored when input_stream is given)
+        output_path: Destination MP3 file
+        start: Optional start offset in seconds
+        end: Optional end offset in seconds
+        input_stream: Optional readable binary stream to transcode instead of a file
+
+    Returns:
+        Elapsed transcode time in seconds
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails
+    """
+    command = ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y']
+    if input_stream is None:
+        command.append('-nostdin')
+    if start is not None:
+        command += ['-ss', f'{start:.3f}']
+    if start is not None and end is not None:
+        command += ['-t', f'{end - start:.3f}']
+    command += ['-i', 'pipe:0' if input_stream is not None else input_path]
+    command += ['-vn', '-ac', '1', '-b:a', TRANSCODE_BITRATE, '-f', 'mp3', output_path]
+
+    started = time.monotonic()
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE if input_stream is not None else subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    if input_stream is not None:
+        try:
+            shutil.copyfileobj(input_stream, process.stdin)
+        except BrokenPipeError:
+            # ffmpeg exited early; its error is reported below
+            pass
+        finally:
+            process.stdin.close()
+    stderr = process.stderr.read()
+    process.stderr.close()
+
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, command, stderr=stderr)
+
+    return time.monotonic() - started
+
+
+def extract_segment(source_path: str, start: float, end: float, output_path: str) -> float:
+    """
+    Cut [start, end) out of a recording as 64kbps mono MP3.
+
+    Returns:
+        Elapsed transcode time in seconds
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails
+    """
+    return transcode_audio(source_path, output_path, start=start, end=end)
+
+
+def stitch_transcripts(texts: List[str], separator: str = '') -> str:
+    """
+    Join segment transcripts in order, dropping text repeated across an overlap.
+
+    For each boundary, the prefix of the next transcript (up to
+    STITCH_MAX_OVERLAP_CHARS) most similar to an end of the previous one is
+    removed from the next transcript, if at least STITCH_MIN_SIMILARITY
+    similar. Anchoring both ends keeps unrelated text that merely shares a
+    few words from being matched.
+
+    Args:
+        texts: Segment transcripts in order
+        separator: Inserted between segments ('' for Japanese)
+
+    Returns:
+        Combined transcript
+    """
+    result = ''
+    for text in texts:
+        text = text.strip()
+        if not text:
+            continue
+        if result:
+            text = text[_overlap_length(result, text):].lstrip()
+            if text:
+                result += separator + text
+        else:
+            result = text
+    return result
+
+
+def _overlap_length(previous: str, following: str) -> int:
+    tail = previous[-(STITCH_MAX_OVERLAP_CHARS + STITCH_LENGTH_SLACK_CHARS):]
+    best_size, best_ratio = 0, STITCH_MIN_SIMILARITY
+    for size in range(STITCH_MIN_OVERLAP_CHARS, min(len(following), STITCH_MAX_OVERLAP_CHARS) + 1):
+        matcher = SequenceMatcher(None, b=following[:size], autojunk=False)
+        shortest = max(1, size - STITCH_LENGTH_SLACK_CHARS)
+        for tail_size in range(shortest, min(len(tail), size + STITCH_LENGTH_SLACK_CHARS) + 1):
+            matcher.set_seq1(tail[-tail_size:])
+            ratio = matcher.ratio()
+            # Ties go to the longer overlap
+            if ratio >= best_ratio:
+                best_size, best_ratio = size, ratio
+    return best_size
@@ -0,0 +1,225 @@
+"""
+Background dependency health checks.
+
+Each API process probes its dependencies every HEALTH_CHECK_INTERVAL seconds
+on a daemon thread, with the pooled database engine and one long-lived Redis
+client, and /api/health serves the latest results with their age. A burst of
+health requests therefore costs no connections and no Redis commands.
+
+Probed services:
+
+- database: SELECT 1
+- redis: PING
+- workers: job queue workers alive according to their heartbeats (see
+  worker_heartbeats), and the number of jobs waiting to be claimed
+- celery: LLEN of the broker queue; with HEALTH_CHECK_CELERY_WORKERS the
+  Celery workers are also pinged and counted
+
+Both queue depths are also exported as the transcription_queue_depth gauge.
+
+Results older than STALE_AFTER_INTERVALS intervals (a probe that hangs) are
+reported as 'unknown'.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import redis
+from sqlalchemy import text
+
+from src.config import settings
+from src.database import SessionLocal
+from src.schemas import ServiceStatus
+from src.services.job_queue import job_queue
+from src.services.metrics import QUEUE_DEPTH
+from src.services.worker_heartbeats import worker_heartbeats
+
+logger = logging.getLogger(__name__)
+
+# Broker queues of the Celery app (it only uses the default queue)
+CELERY_QUEUES = ('celery',)
+
+# Cached results older than this many intervals are reported as 'unknown'
+STALE_AFTER_INTERVALS = 3
+
+
+def elapsed_ms(start: float) -> float:
+    """Milliseconds since a time.perf_counter() reading, rounded for display."""
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+class HealthMonitor:
+    """Probes dependencies in the background and caches the results."""
+
+    def __init__(self):
+        """Create the Redis client lazily so importing this module never connects."""
+        self._client: Optional[redis.Redis] = None
+        self._results: Dict[str, ServiceStatus] = {}
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _redis(self) -> redis.Redis:
+        with self._lock:
+            if self._client is None:
+                self._client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_connect_timeout=settings.HEALTH_CHECK_TIMEOUT,
+                    socket_timeout=settings.HEALTH_CHECK_TIMEOUT,
+                )
+            return self._client
+
+    @property
+    def running(self) -> bool:
+        """Whether the background probe thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start probing in the background (no-op if already running)."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background probe thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=settings.HEALTH_CHECK_TIMEOUT * 2)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(settings.HEALTH_CHECK_INTERVAL)
+
+    def check_database(self) -> ServiceStatus:
+        """Run SELECT 1 on a pooled connection."""
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            db.execute(text('SELECT 1'))
+        finally:
+            db.close()
+        return ServiceStatus(status='connected', latency_ms=elapsed_ms(start))
+
+    def check_redis(self) -> ServiceStatus:
+        """PING Redis."""
+        start = time.perf_counter()
+        self._redis().ping()
+        return ServiceStatus(status='connected', latency_ms=elapsed_ms(start))
+
+    def check_workers(self) -> ServiceStatus:
+        """Count live job queue workers and the jobs waiting for them."""
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            queue_depth = job_queue.depth(db)
+        finally:
+            db.close()
+        QUEUE_DEPTH.labels('jobs').set(queue_depth)
+        try:
+            workers = len(worker_heartbeats.live_workers(self._redis()))
+        except redis.RedisError as e:
+            return ServiceStatus(status='unknown', error=f'Heartbeats unavailable: {e}', queue_depth=queue_depth)
+        return ServiceStatus(
+            status='connected' if workers else 'disconnected',
+            latency_ms=elapsed_ms(start),
+            error=None if workers else 'No live workers',
+            workers=workers,
+            queue_depth=queue_depth,
+        )
+
+    def check_celery(self) -> ServiceStatus:
+        """Read the broker queue length, and ping the Celery workers if configured."""
+        start = time.perf_counter()
+        pipeline = self._redis().pipeline(transaction=False)
+        for queue in CELERY_QUEUES:
+            pipeline.llen(queue)
+        queue_depth = sum(pipeline.execute())
+        QUEUE_DEPTH.labels('celery').set(queue_depth)
+
+        if not settings.HEALTH_CHECK_CELERY_WORKERS:
+            return ServiceStatus(status='connected', latency_ms=elapsed_ms(start), queue_depth=queue_depth)
+
+        # Imported here so API processes that never ping Celery do not load the Celery app
+        from src.celery_app import celery_app
+        workers = len(celery_app.control.ping(timeout=settings.HEALTH_CHECK_TIMEOUT))
+        return ServiceStatus(
+            status='connected' if workers else 'disconnected',
+            latency_ms=elapsed_ms(start),
+            error=None if workers else 'No Celery worker answered ping',
+            workers=workers,
+            queue_depth=queue_depth,
+        )
+
+    def probe(self) -> Dict[str, ServiceStatus]:
+        """
+        Probe every service now and cache the results.
+
+        Returns:
+            Results by service name
+        """
+        checks: Dict[str, Callable[[], ServiceStatus]] = {
+            'database': self.check_database,
+            'redis': self.check_redis,
+            'workers': self.check_workers,
+            'celery': self.check_celery,
+        }
+        with self._probe_lock:
+            results = {}
+            for name, check in checks.items():
+                try:
+                    status = check()
+                except Exception as e:
+                    logger.error(f'{name} health check failed: {e}')
+                    status = ServiceStatus(status='disconnected', error=str(e))
+                status.checked_at = datetime.utcnow()
+                results[name] = status
+            with self._lock:
+                self._results = results
+            return results
+
+    def results(self) -> Dict[str, ServiceStatus]:
+        """
+        Latest results with their age.
+
+        Before the first probe completes, and without the background thread
+        (e.g. a process that skipped the lifespan) once results are older
+        than one interval, the services are probed inline.
+
+        Returns:
+            Results by service name
+        """
+        with self._lock:
+            results = self._results
+        now = datetime.utcnow()
+        if not results or (not self.running and not self._fresh(results, now, settings.HEALTH_CHECK_INTERVAL)):
+            results = self.probe()
+            now = datetime.utcnow()
+
+        stale_after = settings.HEALTH_CHECK_INTERVAL * STALE_AFTER_INTERVALS
+        served = {}
+        for name, status in results.items():
+            age = (now - status.checked_at).total_seconds()
+            update = {'age_seconds': round(age, 1)}
+            if age > stale_after:
+                update.update(status='unknown', error=f'Last probe completed {age:.0f}s ago')
+            served[name] = status.model_copy(update=update)
+        return served
+
+    @staticmethod
+    def _fresh(results: Dict[str, ServiceStatus], now: datetime, max_age: float) -> bool:
+        """Whether every cached result is younger than `max_age` seconds."""
+        return all(
+            (now - status.checked_at).total_seconds() < max_age for status in results.values()
+        )
+
+
+# Global monitor instance
+health_monitor = HealthMonitor()
@@ -0,0 +1,177 @@
+"""
+Transcription history export.
+Streams every matching transcript as NDJSON or as a zip of .txt files.
+
+Rows are read through a server-side cursor in batches of EXPORT_FETCH_SIZE
+and encoded one at a time, so API memory stays flat however many rows are
+exported.
+"""
+
+import json
+import logging
+import os
+import zipfile
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.models import TranscriptionBlob, TranscriptionJob, TranscriptionStatus
+from src.services.transcript_store import decompress_transcript
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_FETCH_SIZE = 500
+
+# Export formats and their response media types
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'zip': 'application/zip',
+}
+
+# Characters not allowed in zip entry names
+UNSAFE_NAME_CHARS = str.maketrans({char: '_' for char in '/\\:*?"<>|\0'})
+
+
+def to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive UTC, as stored in the database."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def export_record(row) -> dict:
+    """
+    Build the exported representation of one job row.
+
+    Offloaded transcripts are decompressed here, one row at a time.
+    """
+    text = row.transcription_text
+    if text is None and row.blob_data is not None:
+        text = decompress_transcript(row.blob_data)
+
+    return {
+        'id': str(row.id),
+        'originalFilename': row.original_filename,
+        'status': row.status.value,
+        'language': row.language,
+        'fileSize': row.file_size,
+        'duration': row.duration,
+        'createdAt': row.created_at.isoformat(),
+        'completedAt': row.completed_at.isoformat() if row.completed_at else None,
+        'transcriptionText': text,
+    }
+
+
+def zip_entry_name(record: dict) -> str:
+    """Name of a record's .txt file inside the zip (grouped by creation date)."""
+    stem = os.path.splitext(record['originalFilename'])[0].translate(UNSAFE_NAME_CHARS) or 'transcription'
+    return f'{record["createdAt"][:10]}/{stem}_{record["id"]}.txt'
+
+
+class _ChunkBuffer:
+    """Write-only file object whose contents are drained after each zip entry."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class HistoryExportService:
+    """Service for streaming history exports."""
+
+    @staticmethod
+    def iter_records(
+        db: Session,
+        job_status: TranscriptionStatus = TranscriptionStatus.COMPLETED,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Iterator[dict]:
+        """
+        Yield export records of jobs with the given status, oldest first.
+
+        Args:
+            db: Database session (kept busy until the iterator is exhausted)
+            job_status: Status to export
+            created_from: Only jobs created at or after this time
+            created_to: Only jobs created before this time
+
+        Yields:
+            Records as built by export_record
+        """
+        statement = select(
+            TranscriptionJob.id,
+            TranscriptionJob.original_filename,
+            TranscriptionJob.status,
+            TranscriptionJob.language,
+            TranscriptionJob.file_size,
+            TranscriptionJob.duration,
+            TranscriptionJob.created_at,
+            TranscriptionJob.completed_at,
+            TranscriptionJob.transcription_text,
+            TranscriptionBlob.data.label('blob_data'),
+        ).outerjoin(
+            TranscriptionBlob, TranscriptionBlob.job_id == TranscriptionJob.id
+        ).where(
+            TranscriptionJob.status == job_status
+        ).order_by(
+            TranscriptionJob.created_at
+        ).execution_options(yield_per=EXPORT_FETCH_SIZE)
+
+        if created_from is not None:
+            statement = statement.where(TranscriptionJob.created_at >= created_from)
+        if created_to is not None:
+            statement = statement.where(TranscriptionJob.created_at < created_to)
+
+        exported = 0
+        for row in db.execute(statement):
+            yield export_record(row)
+            exported += 1
+        logger.info(f'Exported {exported} {job_status.value} transcriptions')
+
+    @staticmethod
+    def ndjson_chunks(records: Iterable[dict]) -> Iterator[bytes]:
+        """Encode records as newline-delimited JSON, one line per chunk."""
+        for record in records:
+            yield json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+
+    @staticmethod
+    def zip_chunks(records: Iterable[dict]) -> Iterator[bytes]:
+        """
+        Encode records as a zip of UTF-8 .txt files, one chunk per file.
+
+        The archive is written to a non-seekable buffer (sizes go into data
+        descriptors), so no entry is ever held in memory after it is sent.
+        Records without a transcript are skipped.
+        """
+        buffer = _ChunkBuffer()
+        with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for record in records:
+                if not record['transcriptionText']:
+                    continue
+                info = zipfile.ZipInfo(
+                    zip_entry_name(record),
+                    date_time=datetime.fromisoformat(record['createdAt']).timetuple()[:6],
+                )
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with archive.open(info, mode='w', force_zip64=True) as entry:
+                    entry.write(record['transcriptionText'].encode('utf-8'))
+                yield buffer.drain()
+        yield buffer.drain()
+
+
+# Global service instance
+history_export_service = HistoryExportService()
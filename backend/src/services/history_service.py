@@ -0,0 +1,595 @@
+"""
+Transcription history service.
+Handles history listing with keyset (cursor) pagination, transcript search,
+bulk import and the delta sync changes feed.
+"""
+
+import base64
+import html
+import json
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy import BigInteger, cast, column, exists, func, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session, load_only
+
+from src.database import db_utc_now
+from src.models import TranscriptionBlob, TranscriptionDeletion, TranscriptionJob, TranscriptionStatus
+from src.schemas import TranscriptionHistoryCreate
+from src.services.job_partitions import job_partitions
+from src.services.search_grams import build_search_grams, contains_query, is_caseless, query_grams
+from src.services.transcript_store import STORAGE_BLOB, build_preview, transcript_store
+
+logger = logging.getLogger(__name__)
+
+# Page size limits for history listing
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Columns needed to render a history list entry without the transcript
+HISTORY_LIST_COLUMNS = (
+    TranscriptionJob.id,
+    TranscriptionJob.original_filename,
+    TranscriptionJob.preview_text,
+    TranscriptionJob.file_size,
+    TranscriptionJob.duration,
+    TranscriptionJob.created_at,
+)
+
+
+# Bulk history import limits
+MAX_BULK_HISTORY_ITEMS = 1000
+BULK_INSERT_CHUNK_SIZE = 200
+
+# pg_advisory_xact_lock keys IMPORT_LOCK_KEY + (id % IMPORT_LOCK_BUCKETS) serialise
+# imports of the same ID: the partitioned table only enforces (id, created_at) uniqueness
+IMPORT_LOCK_KEY = 7305100
+IMPORT_LOCK_BUCKETS = 64
+
+# Changes feed: rows newer than this are left for the next sync, so a
+# transaction that stamped updated_at but has not committed yet is not skipped
+SYNC_SAFETY_LAG = timedelta(seconds=5)
+
+# Search result limits
+DEFAULT_SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_OFFSET = 1000
+
+# Search reads the newest (offset + limit + 1) * RECENT_SEARCH_FACTOR completed
+# jobs first, then (offset + limit + 1) * CANDIDATE_WINDOW_FACTOR gram index
+# candidates, a window grown fourfold while it is too small
+RECENT_SEARCH_FACTOR = 8
+CANDIDATE_WINDOW_FACTOR = 2
+
+# Columns loaded for a search result (the transcript only for the returned page)
+SEARCH_COLUMNS = HISTORY_LIST_COLUMNS + (TranscriptionJob.transcription_text, TranscriptionJob.transcript_storage)
+
+# Score: a filename hit counts as this many transcript occurrences
+FILENAME_MATCH_WEIGHT = 5
+# Occurrences beyond this do not raise the score further
+MAX_COUNTED_OCCURRENCES = 20
+
+# Characters of context on each side of the first hit in a snippet
+SNIPPET_RADIUS = 40
+
+
+def escape_like(query: str) -> str:
+    """Escape LIKE wildcards so the query matches literally (escape char is a backslash)."""
+    return query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def substring_filter(column, query: str):
+    """
+    Case-insensitive substring match on a column.
+
+    Queries without cased characters (e.g. Japanese) match the same text
+    either way and use strpos, several times cheaper per row than ILIKE.
+    """
+    if is_caseless(query):
+        return func.strpos(column, query) > 0
+    return column.ilike(f'%{escape_like(query)}%', escape='\\')
+
+
+def build_snippet(text: Optional[str], query: str, radius: int = SNIPPET_RADIUS) -> str:
+    """
+    Build an HTML-escaped snippet around the first hit, with hits wrapped in <mark>.
+
+    Falls back to the start of the text when the query only matched the
+    filename.
+    """
+    text = text or ''
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    first = pattern.search(text)
+    if first is None:
+        end = min(len(text), 2 * radius)
+        return html.escape(text[:end]) + ('…' if end < len(text) else '')
+
+    start = max(0, first.start() - radius)
+    end = min(len(text), first.end() + radius)
+    window = text[start:end]
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(window):
+        parts.append(html.escape(window[position:match.start()]))
+        parts.append(f'<mark>{html.escape(match.group())}</mark>')
+        position = match.end()
+    parts.append(html.escape(window[position:]))
+
+    return ('…' if start > 0 else '') + ''.join(parts) + ('…' if end < len(text) else '')
+
+
+def search_score(filename: Optional[str], text: Optional[str], query: str) -> int:
+    """Filename hit plus transcript occurrences (capped) of a search result."""
+    score = FILENAME_MATCH_WEIGHT if contains_query([filename], query) else 0
+    if not is_caseless(query):
+        text, query = (text or '').lower(), query.lower()
+    return score + min((text or '').count(query), MAX_COUNTED_OCCURRENCES)
+
+
+def invalid_cursor_error() -> HTTPException:
+    """Create HTTPException for a malformed or tampered cursor."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={'error': 'Invalid cursor', 'type': 'validation', 'retryable': False}
+    )
+
+
+class HistoryService:
+    """Service for listing transcription history."""
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, job_id: UUID) -> str:
+        """
+        Encode the position after a row as an opaque cursor.
+
+        Args:
+            created_at: created_at of the last row on the page
+            job_id: id of the last row on the page
+
+        Returns:
+            URL-safe cursor string
+        """
+        payload = json.dumps([created_at.isoformat(), str(job_id)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+        """
+        Decode a cursor produced by encode_cursor.
+
+        Raises:
+            HTTPException: 400 if the cursor is malformed
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, job_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), UUID(job_id)
+        except Exception:
+            raise invalid_cursor_error()
+
+    @staticmethod
+    def list_completed(
+        db: Session,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_text: bool = False,
+    ) -> Tuple[List[TranscriptionJob], Optional[str]]:
+        """
+        Get one page of completed transcriptions, newest first.
+
+        Pages are addressed by the (created_at, id) of the last row seen rather
+        than an offset, so every page is an index range scan on
+        ix_transcription_jobs_status_created_at of `limit` rows, however deep
+        the client pages.
+
+        Args:
+            db: Database session
+            limit: Page size (clamped to MAX_PAGE_SIZE)
+            cursor: Cursor from the previous page, or None for the first page
+            include_text: Also load transcription_text (otherwise only the
+                preview and metadata columns are selected)
+
+        Returns:
+            Tuple of (jobs, next_cursor) where next_cursor is None on the last page
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        columns = HISTORY_LIST_COLUMNS
+        if include_text:
+            columns += (TranscriptionJob.transcription_text, TranscriptionJob.transcript_storage)
+        query = db.query(TranscriptionJob).options(
+            load_only(*columns, raiseload=True)
+        ).filter(
+            TranscriptionJob.status == TranscriptionStatus.COMPLETED
+        )
+        if cursor:
+            created_at, job_id = HistoryService.decode_cursor(cursor)
+            query = query.filter(
+                tuple_(TranscriptionJob.created_at, TranscriptionJob.id) < tuple_(created_at, job_id)
+            )
+
+        # Fetch one extra row to know whether another page exists
+        jobs = query.order_by(
+            TranscriptionJob.created_at.desc(),
+            TranscriptionJob.id.desc()
+        ).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_cursor = HistoryService.encode_cursor(jobs[-1].created_at, jobs[-1].id)
+
+        if include_text:
+            transcript_store.hydrate(db, jobs)
+        return jobs, next_cursor
+
+    @staticmethod
+    def history_row(record: TranscriptionHistoryCreate) -> dict:
+        """Column values of a history-only job imported from localStorage."""
+        return {
+            'id': record.id,
+            'original_filename': record.original_filename,
+            'file_url': '',  # Not needed for history-only records
+            'file_size': record.file_size or 0,
+            'duration': record.duration,
+            'language': 'ja',
+            'transcription_text': record.transcription_text,
+            'preview_text': build_preview(record.transcription_text),
+            'search_grams': build_search_grams(record.transcription_text, record.original_filename),
+            'transcript_storage': None,
+            'status': TranscriptionStatus.COMPLETED,
+            'attempts': 0,
+            'created_at': record.created_at,
+            'completed_at': record.created_at,
+        }
+
+    @staticmethod
+    def bulk_create(db: Session, records: List[TranscriptionHistoryCreate]) -> List[Tuple[UUID, bool]]:
+        """
+        Insert history records, skipping IDs that already exist.
+
+        The partitioned table can only enforce (id, created_at) uniqueness, so
+        the records' IDs are locked first (see lock_imported_ids), then each
+        chunk looks up its existing IDs and inserts the rest with a single
+        INSERT ... ON CONFLICT DO NOTHING RETURNING id. The whole batch
+        is committed once, so a sync costs two round trips per chunk instead
+        of a SELECT and an INSERT/commit per record. Partitions for the
+        records' months are created first.
+
+        The created rows get their updated_at from the database clock in a
+        last UPDATE right before the commit: the changes feed only skips rows
+        stamped within SYNC_SAFETY_LAG, so a stamp taken when the import
+        started would be missed once the import outlasts the lag.
+
+        Args:
+            db: Database session
+            records: Validated history records (duplicate IDs are reported as existing)
+
+        Returns:
+            List of (id, created) in input order
+        """
+        unique_rows = {}
+        for record in records:
+            unique_rows.setdefault(record.id, HistoryService.history_row(record))
+        rows = list(unique_rows.values())
+        blobs = {}
+        for row in rows:
+            blob = transcript_store.offload_row(row)
+            if blob:
+                blobs[row['id']] = blob
+
+        job_partitions.ensure_partitions(row['created_at'] for row in rows)
+        HistoryService.lock_imported_ids(db, unique_rows)
+        created_ids = set()
+        for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + BULK_INSERT_CHUNK_SIZE]
+            existing = set(db.execute(
+                select(TranscriptionJob.id).where(TranscriptionJob.id.in_([row['id'] for row in chunk]))
+            ).scalars().all())
+            chunk = [row for row in chunk if row['id'] not in existing]
+            if not chunk:
+                continue
+            statement = insert(TranscriptionJob).values(chunk).on_conflict_do_nothing(
+                index_elements=[TranscriptionJob.id, TranscriptionJob.created_at]
+            ).returning(TranscriptionJob.id)
+            chunk_created = db.execute(statement).scalars().all()
+            created_ids.update(chunk_created)
+
+            chunk_blobs = [blobs[job_id] for job_id in chunk_created if job_id in blobs]
+            if chunk_blobs:
+                db.execute(insert(TranscriptionBlob), chunk_blobs)
+        if created_ids:
+            HistoryService.stamp_updated_at(db, [row for row in rows if row['id'] in created_ids])
+        db.commit()
+
+        results = []
+        for record in records:
+            created = record.id in created_ids
+            created_ids.discard(record.id)  # a repeated ID is only created once
+            results.append((record.id, created))
+
+        logger.info(
+            f'Imported {sum(created for _, created in results)} of {len(records)} history records'
+        )
+        return results
+
+    @staticmethod
+    def lock_imported_ids(db: Session, job_ids: Iterable[UUID]) -> None:
+        """
+        Serialise imports of the same IDs until the current transaction ends.
+
+        Call before looking up which IDs exist: a concurrent import of one of
+        them (possibly with another created_at, so another partition) then
+        commits first and the lookup sees its row. IDs share IMPORT_LOCK_BUCKETS
+        locks, taken in key order so overlapping imports cannot deadlock.
+        """
+        keys = sorted({IMPORT_LOCK_KEY + job_id.int % IMPORT_LOCK_BUCKETS for job_id in job_ids})
+        db.execute(
+            select(func.pg_advisory_xact_lock(column('key'))).select_from(
+                func.unnest(cast(keys, ARRAY(BigInteger))).alias('key')
+            )
+        )
+
+    @staticmethod
+    def stamp_updated_at(db: Session, rows: List[dict]) -> None:
+        """Set updated_at of imported rows to the current database time (UTC)."""
+        db.execute(
+            update(TranscriptionJob).where(
+                TranscriptionJob.created_at.in_({row['created_at'] for row in rows}),  # partition pruning
+                TranscriptionJob.id.in_([row['id'] for row in rows]),
+            ).values(updated_at=db_utc_now()),
+            execution_options={'synchronize_session': False},
+        )
+
+    @staticmethod
+    def search(
+        db: Session,
+        query: str,
+        limit: int = DEFAULT_SEARCH_PAGE_SIZE,
+        offset: int = 0,
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Search completed transcriptions by transcript text and filename.
+
+        A job matches when its search_grams contain every character trigram
+        of the query (its bigram or character when shorter, see
+        search_grams.py), which needs no word segmentation and serves one-
+        and two-character Japanese queries too. Inline transcripts and
+        filenames are confirmed in the same statement (substring_filter);
+        offloaded transcripts are confirmed when the page is loaded, and a
+        false positive is dropped (so a page may hold fewer than `limit`
+        items).
+
+        Results are ordered newest first. Row estimates for search_grams are
+        unreliable (every transcript has thousands of grams), so the plan is
+        not left to the planner: the newest jobs are checked first, which
+        fills the page for common terms, and otherwise the newest candidates
+        are read from the GIN index without touching the arrays. `score`
+        reports a filename hit and the number of occurrences in the
+        transcript.
+
+        Args:
+            db: Database session
+            query: Search string (matched case-insensitively as a substring)
+            limit: Page size (clamped to MAX_PAGE_SIZE)
+            offset: Number of results to skip
+
+        Returns:
+            Tuple of (results, next_offset) where next_offset is None on the
+            last page; each result has the history list fields plus
+            score and snippet
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        grams = query_grams(query)
+        needed = offset + limit + 1
+        recent_rows = needed * RECENT_SEARCH_FACTOR
+        # The planner does not count detoasting search_grams or the transcript,
+        # so it can pick a sequential scan of a small partition
+        db.execute(text('SET LOCAL enable_seqscan = off'))
+
+        # A common term fills the page from the newest jobs
+        recent = db.execute(
+            select(TranscriptionJob.created_at, TranscriptionJob.id).where(
+                TranscriptionJob.status == TranscriptionStatus.COMPLETED
+            ).order_by(
+                TranscriptionJob.created_at.desc(),
+                TranscriptionJob.id.desc()
+            ).limit(recent_rows)
+        ).all()
+        jobs = HistoryService._matching_jobs(db, query, grams, recent, offset, limit)
+
+        # Otherwise read the newest candidates from the gram index, widening
+        # the window until it holds the page or every candidate
+        window = needed * CANDIDATE_WINDOW_FACTOR
+        while len(jobs) <= limit and len(recent) == recent_rows:
+            # MATERIALIZED keeps the planner from walking created_at instead of the gram index
+            candidates = select(TranscriptionJob.created_at, TranscriptionJob.id).where(
+                TranscriptionJob.search_grams.contains(grams)
+            ).cte('search_candidates').prefix_with('MATERIALIZED')
+            keys = db.execute(
+                select(candidates).order_by(
+                    candidates.c.created_at.desc(),
+                    candidates.c.id.desc()
+                ).limit(window)
+            ).all()
+            jobs = HistoryService._matching_jobs(db, query, grams, keys, offset, limit)
+            if len(keys) < window:
+                break
+            window *= 4
+
+        next_offset = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_offset = offset + limit
+
+        # Offloaded transcripts of this page only, for confirmation and snippets
+        transcript_store.hydrate(db, jobs)
+        results = []
+        for job in jobs:
+            texts = (job.transcription_text, job.original_filename)
+            if job.transcript_storage == STORAGE_BLOB and not contains_query(texts, query):
+                continue
+            results.append({
+                'id': job.id,
+                'original_filename': job.original_filename,
+                'file_size': job.file_size,
+                'duration': job.duration,
+                'created_at': job.created_at,
+                'score': float(search_score(job.original_filename, job.transcription_text, query)),
+                'snippet': build_snippet(job.transcription_text or job.preview_text, query),
+            })
+        logger.info(f'Search for {query!r} returned {len(results)} results (offset {offset})')
+        return results, next_offset
+
+    @staticmethod
+    def _matching_jobs(
+        db: Session, query: str, grams: List[int], keys: list, offset: int, limit: int
+    ) -> List[TranscriptionJob]:
+        """
+        Jobs among `keys` ((created_at, id) rows) that match `query`, newest
+        first, from `offset` up to `limit` + 1 rows.
+
+        Inline transcripts and filenames are confirmed here; offloaded
+        transcripts only through their grams (see search).
+        """
+        if not keys:
+            return []
+        return db.query(TranscriptionJob).options(
+            load_only(*SEARCH_COLUMNS, raiseload=True)
+        ).filter(
+            TranscriptionJob.id.in_([key.id for key in keys]),
+            TranscriptionJob.created_at.in_([key.created_at for key in keys]),
+            TranscriptionJob.status == TranscriptionStatus.COMPLETED,
+            TranscriptionJob.search_grams.contains(grams),
+            or_(
+                substring_filter(TranscriptionJob.original_filename, query),
+                substring_filter(TranscriptionJob.transcription_text, query),
+                TranscriptionJob.transcript_storage == STORAGE_BLOB,
+            ),
+        ).order_by(
+            TranscriptionJob.created_at.desc(),
+            TranscriptionJob.id.desc()
+        ).offset(offset).limit(limit + 1).all()
+
+    @staticmethod
+    def record_deletions(db: Session, job_ids: Iterable[UUID]) -> None:
+        """
+        Add tombstones for deleted jobs to the current transaction.
+
+        Call before committing the delete so the tombstone and the delete
+        become visible together.
+        """
+        db.add_all([TranscriptionDeletion(job_id=job_id, deleted_at=db_utc_now()) for job_id in job_ids])
+
+    @staticmethod
+    def encode_sync_cursor(
+        job_position: Optional[Tuple[datetime, UUID]],
+        deletion_position: Optional[Tuple[datetime, int]],
+    ) -> str:
+        """Encode the positions reached in the jobs and deletions streams as an opaque cursor."""
+        payload = json.dumps({
+            'j': [job_position[0].isoformat(), str(job_position[1])] if job_position else None,
+            'd': [deletion_position[0].isoformat(), deletion_position[1]] if deletion_position else None,
+        })
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_sync_cursor(
+        cursor: str,
+    ) -> Tuple[Optional[Tuple[datetime, UUID]], Optional[Tuple[datetime, int]]]:
+        """
+        Decode a cursor produced by encode_sync_cursor.
+
+        Raises:
+            HTTPException: 400 if the cursor is malformed
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded))
+            job_position = payload['j'] and (datetime.fromisoformat(payload['j'][0]), UUID(payload['j'][1]))
+            deletion_position = payload['d'] and (datetime.fromisoformat(payload['d'][0]), int(payload['d'][1]))
+            return job_position or None, deletion_position or None
+        except Exception:
+            raise invalid_cursor_error()
+
+    @staticmethod
+    def get_changes(
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        include_text: bool = True,
+    ) -> Tuple[List[TranscriptionJob], List[UUID], str, bool]:
+        """
+        Get completed jobs created or updated, and jobs deleted, since a cursor.
+
+        Both streams are read in (timestamp, id) order from their own index,
+        so a sync with nothing new is two empty index range scans.
+
+        Args:
+            db: Database session
+            cursor: Cursor from the previous sync, or None to start from the beginning
+            limit: Maximum rows per stream (clamped to MAX_PAGE_SIZE)
+            include_text: Also load transcription_text for changed jobs
+
+        Returns:
+            Tuple of (changed_jobs, deleted_ids, next_cursor, has_more)
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        job_position, deletion_position = HistoryService.decode_sync_cursor(cursor) if cursor else (None, None)
+        # Writers stamp with the database clock, so the horizon uses it too
+        horizon = db.execute(select(func.timezone('utc', func.now()))).scalar_one() - SYNC_SAFETY_LAG
+
+        columns = HISTORY_LIST_COLUMNS + (TranscriptionJob.updated_at,)
+        if include_text:
+            columns += (TranscriptionJob.transcription_text, TranscriptionJob.transcript_storage)
+        job_query = db.query(TranscriptionJob).options(
+            load_only(*columns, raiseload=True)
+        ).filter(
+            TranscriptionJob.status == TranscriptionStatus.COMPLETED,
+            TranscriptionJob.updated_at < horizon,
+        )
+        if job_position:
+            job_query = job_query.filter(
+                tuple_(TranscriptionJob.updated_at, TranscriptionJob.id) > tuple_(*job_position)
+            )
+        jobs = job_query.order_by(
+            TranscriptionJob.updated_at,
+            TranscriptionJob.id
+        ).limit(limit + 1).all()
+
+        # A tombstone whose ID was imported again since is no longer a deletion
+        deletion_query = db.query(TranscriptionDeletion).filter(
+            TranscriptionDeletion.deleted_at < horizon,
+            ~exists().where(TranscriptionJob.id == TranscriptionDeletion.job_id),
+        )
+        if deletion_position:
+            deletion_query = deletion_query.filter(
+                tuple_(TranscriptionDeletion.deleted_at, TranscriptionDeletion.id) > tuple_(*deletion_position)
+            )
+        deletions = deletion_query.order_by(
+            TranscriptionDeletion.deleted_at,
+            TranscriptionDeletion.id
+        ).limit(limit + 1).all()
+
+        has_more = len(jobs) > limit or len(deletions) > limit
+        jobs = jobs[:limit]
+        deletions = deletions[:limit]
+        if include_text:
+            transcript_store.hydrate(db, jobs)
+
+        if jobs:
+            job_position = (jobs[-1].updated_at, jobs[-1].id)
+        if deletions:
+            deletion_position = (deletions[-1].deleted_at, deletions[-1].id)
+        next_cursor = HistoryService.encode_sync_cursor(job_position, deletion_position)
+
+        return jobs, [deletion.job_id for deletion in deletions], next_cursor, has_more
+
+
+# Global service instance
+history_service = HistoryService()
@@ -0,0 +1,253 @@
+"""
+Write-through cache for job status and results.
+
+Lookups for a job's status and its full result are served from Redis, or
+from a bounded in-process LRU when Redis is not configured or unreachable.
+Writers (job creation, the worker, the queue and the delete endpoints) store
+or invalidate entries as they change a job, so readers never need to go to
+Postgres for a job that has not changed.
+
+A completed or failed job never changes again, so terminal entries live for
+JOB_CACHE_TTL; entries for jobs still processing expire after
+JOB_CACHE_ACTIVE_TTL as a safety net for writers that only invalidate.
+
+The LRU is private to its process, so writes and invalidations made by other
+processes (the worker, other API processes) never reach it. It therefore
+holds terminal entries only, for at most JOB_CACHE_LOCAL_TTL (a job deleted
+elsewhere is served for that long). JOB_CACHE_BACKEND=memory is only correct
+for a single process that also runs the worker.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+import redis
+
+from src.config import settings
+from src.models import TranscriptionStatus
+from src.schemas import TranscriptionJobResponse, TranscriptionStatusResponse
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefix; keys are job-cache:{kind}:{job_id}
+KEY_PREFIX = 'job-cache:'
+
+# Cached payload kinds
+STATUS = 'status'
+RESULT = 'result'
+
+# How long to stay on the local fallback after a Redis error (seconds)
+REDIS_RETRY_INTERVAL = 30
+
+
+class LRUCache:
+    """Thread-safe LRU of serialized payloads, bounded by total bytes and TTL."""
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Memory budget for stored payloads
+        """
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[float, bytes]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return a live entry and mark it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store an entry, evicting least recently used ones to stay in budget."""
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        """Drop an entry if present."""
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    @property
+    def entries(self) -> int:
+        """Number of stored entries (including expired ones not yet evicted)."""
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        """Total size of stored payloads."""
+        return self._bytes
+
+
+class JobCache:
+    """Job status/result cache on Redis with an in-process LRU fallback."""
+
+    def __init__(self):
+        """Create the Redis client lazily so importing this module never connects."""
+        self._client: Optional[redis.Redis] = None
+        self._redis_retry_at = 0.0
+        self._lock = threading.Lock()
+        self.local = LRUCache(settings.JOB_CACHE_LOCAL_MAX_BYTES)
+        self.hits: Dict[str, int] = {STATUS: 0, RESULT: 0}
+        self.misses: Dict[str, int] = {STATUS: 0, RESULT: 0}
+
+    def _redis(self, force: bool = False) -> Optional[redis.Redis]:
+        """Redis client, or None while using the local fallback (unless forced)."""
+        if settings.JOB_CACHE_BACKEND != 'redis':
+            return None
+        if not force and time.monotonic() < self._redis_retry_at:
+            return None
+        with self._lock:
+            if self._client is None:
+                self._client = redis.Redis.from_url(
+                    settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1
+                )
+            return self._client
+
+    def _redis_failed(self, error: Exception) -> None:
+        """Fall back to the local cache for a while after a Redis error."""
+        logger.warning(f'Job cache falling back to in-process LRU: {error}')
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    @property
+    def backend(self) -> str:
+        """Name of the backend currently serving reads."""
+        return 'redis' if self._redis() is not None else 'memory'
+
+    def _get(self, kind: str, job_id) -> Optional[bytes]:
+        key = f'{KEY_PREFIX}{kind}:{job_id}'
+        client = self._redis()
+        value = None
+        if client is not None:
+            try:
+                value = client.get(key)
+            except redis.RedisError as e:
+                self._redis_failed(e)
+                value = self.local.get(key)
+        else:
+            value = self.local.get(key)
+
+        with self._lock:
+            if value is None:
+                self.misses[kind] += 1
+            else:
+                self.hits[kind] += 1
+        return value
+
+    def _set(self, kind: str, job_id, value: bytes, status: str) -> None:
+        key = f'{KEY_PREFIX}{kind}:{job_id}'
+        processing = status == TranscriptionStatus.PROCESSING.value
+        client = self._redis()
+        if client is not None:
+            try:
+                client.set(key, value, ex=settings.JOB_CACHE_ACTIVE_TTL if processing else settings.JOB_CACHE_TTL)
+                return
+            except redis.RedisError as e:
+                self._redis_failed(e)
+        # Other processes cannot invalidate the local entry: keep it short, and
+        # never cache a status that is about to change
+        if processing:
+            self.local.delete(key)
+            return
+        self.local.set(key, value, settings.JOB_CACHE_LOCAL_TTL)
+
+    def get_status(self, job_id) -> Optional[TranscriptionStatusResponse]:
+        """Cached status of a job, or None on a miss."""
+        value = self._get(STATUS, job_id)
+        return TranscriptionStatusResponse.model_validate_json(value) if value is not None else None
+
+    def get_result(self, job_id) -> Optional[TranscriptionJobResponse]:
+        """Cached full result of a finished job, or None on a miss."""
+        value = self._get(RESULT, job_id)
+        return TranscriptionJobResponse.model_validate_json(value) if value is not None else None
+
+    def store_status(self, response: TranscriptionStatusResponse) -> None:
+        """Cache a job's status."""
+        self._set(STATUS, response.id, response.model_dump_json().encode(), response.status)
+
+    def store_result(self, response: TranscriptionJobResponse) -> None:
+        """Cache a job's full result; only finished jobs are cached."""
+        if response.status == TranscriptionStatus.PROCESSING.value:
+            return
+        self._set(RESULT, response.id, response.model_dump_json().encode(), response.status)
+
+    def store_job(self, job) -> None:
+        """
+        Write a fully loaded job through to the cache.
+
+        Failures are logged and never affect the caller; a missing entry only
+        means the next read goes to Postgres.
+        """
+        try:
+            self.store_status(TranscriptionStatusResponse.from_orm(job))
+            # Offloaded transcripts are not loaded on the job; the next read hydrates them
+            if job.transcript_storage is None or job.transcription_text is not None:
+                self.store_result(TranscriptionJobResponse.from_orm(job))
+        except Exception as e:
+            logger.warning(f'Failed to cache job {job.id}: {e}')
+
+    def invalidate(self, job_ids: Iterable) -> None:
+        """
+        Drop the cached status and result of the given jobs.
+
+        Redis is tried even during a fallback period so that entries written
+        before the outage are not served again once it recovers.
+        """
+        keys = [f'{KEY_PREFIX}{kind}:{job_id}' for job_id in job_ids for kind in (STATUS, RESULT)]
+        if not keys:
+            return
+        for key in keys:
+            self.local.delete(key)
+        client = self._redis(force=True)
+        if client is not None:
+            try:
+                client.delete(*keys)
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+    def get_stats(self) -> dict:
+        """
+        Hit/miss counters of this process and local cache usage.
+
+        Returns:
+            Dictionary matching CacheStatsResponse
+        """
+        with self._lock:
+            hits = dict(self.hits)
+            misses = dict(self.misses)
+        lookups = sum(hits.values()) + sum(misses.values())
+        return {
+            'backend': self.backend,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': sum(hits.values()) / lookups if lookups else 0.0,
+            'local_entries': self.local.entries,
+            'local_bytes': self.local.bytes,
+            'local_max_bytes': self.local.max_bytes,
+        }
+
+
+# Global cache instance
+job_cache = JobCache()
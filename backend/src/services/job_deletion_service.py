@@ -0,0 +1,177 @@
+"""
+Batch deletion of transcription jobs and their stored objects.
+
+Rows are removed with one set-based DELETE ... RETURNING per call, then the
+objects no longer referenced by any job are removed from storage in bulk.
+Objects whose deletion fails are kept in storage_deletion_retries and
+retried later.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.models import StorageDeletionRetry, TranscriptionJob, TranscriptionStatus
+from src.services.history_service import history_service
+from src.services.job_cache import job_cache
+from src.services.job_events import build_job_event, job_event_publisher
+from src.services.r2_service import r2_service
+
+logger = logging.getLogger(__name__)
+
+# Maximum jobs deleted per call
+MAX_BATCH_DELETE = 1000
+
+# Maximum retry list entries processed per retry call
+MAX_DELETION_RETRIES = 1000
+
+# file_url values checked per shared-object lookup
+REFERENCE_LOOKUP_CHUNK_SIZE = 1000
+
+
+def object_name_from_url(file_url: str) -> str:
+    """
+    Extract the storage object name from a job's file URL.
+
+    Format: https://{account_id}.r2.cloudflarestorage.com/{bucket_name}/{object_name}
+    (or file://{path}/{object_name} for local storage)
+    """
+    return file_url.split('/')[-1]
+
+
+class JobDeletionService:
+    """Service for deleting many transcription jobs at once."""
+
+    @staticmethod
+    def referenced_file_urls(db: Session, file_urls: Iterable[str]) -> set:
+        """Subset of `file_urls` still referenced by at least one job."""
+        file_urls = list(file_urls)
+        referenced = set()
+        for start in range(0, len(file_urls), REFERENCE_LOOKUP_CHUNK_SIZE):
+            chunk = file_urls[start:start + REFERENCE_LOOKUP_CHUNK_SIZE]
+            referenced.update(db.execute(
+                select(TranscriptionJob.file_url).where(TranscriptionJob.file_url.in_(chunk)).distinct()
+            ).scalars().all())
+        return referenced
+
+    @staticmethod
+    def queue_retries(db: Session, failed: Dict[str, str]) -> None:
+        """Add (or bump the attempt count of) failed object deletions and commit."""
+        if not failed:
+            return
+        statement = insert(StorageDeletionRetry).values([
+            {'object_name': name, 'attempts': 1, 'last_error': error,
+             'created_at': datetime.utcnow(), 'updated_at': datetime.utcnow()}
+            for name, error in failed.items()
+        ])
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[StorageDeletionRetry.object_name],
+            set_={
+                'attempts': StorageDeletionRetry.attempts + 1,
+                'last_error': statement.excluded.last_error,
+                'updated_at': statement.excluded.updated_at,
+            },
+        ))
+        db.commit()
+        logger.warning(f'Queued {len(failed)} failed storage deletions for retry')
+
+    @staticmethod
+    def delete_objects(db: Session, file_urls: Iterable[str]) -> Tuple[int, Dict[str, str]]:
+        """
+        Delete the stored objects of deleted jobs that no remaining job references.
+
+        Deduplicated jobs share one stored object, so an object is kept while
+        any job still points at it. Failures go to the retry list.
+
+        Returns:
+            Tuple of (objects deleted, error message per failed object name)
+        """
+        file_urls = {url for url in file_urls if url}
+        orphaned = file_urls - JobDeletionService.referenced_file_urls(db, file_urls)
+        object_names = sorted({object_name_from_url(url) for url in orphaned})
+        if not object_names:
+            return 0, {}
+
+        failed = r2_service.delete_files(object_names)
+        JobDeletionService.queue_retries(db, failed)
+        return len(object_names) - len(failed), failed
+
+    @staticmethod
+    def delete_jobs(
+        db: Session,
+        job_ids: Optional[List[UUID]] = None,
+        older_than_days: Optional[int] = None,
+        limit: int = MAX_BATCH_DELETE,
+    ) -> Tuple[List[UUID], int, Dict[str, str], bool]:
+        """
+        Delete jobs by ID, or finished jobs created more than `older_than_days` ago.
+
+        Args:
+            db: Database session
+            job_ids: Explicit job IDs (missing IDs are ignored)
+            older_than_days: Age filter, used when job_ids is not given;
+                jobs still processing are never matched
+            limit: Maximum jobs deleted by this call
+
+        Returns:
+            Tuple of (deleted job IDs, objects deleted, failed object names
+            with errors, whether more jobs match the age filter)
+        """
+        limit = max(1, min(limit, MAX_BATCH_DELETE))
+        if job_ids is not None:
+            targets = select(TranscriptionJob.id).where(TranscriptionJob.id.in_(job_ids[:limit]))
+        else:
+            cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+            # Oldest first; the (status, created_at) index serves both statuses
+            targets = select(TranscriptionJob.id).where(
+                TranscriptionJob.status.in_([TranscriptionStatus.COMPLETED, TranscriptionStatus.FAILED]),
+                TranscriptionJob.created_at < cutoff,
+            ).order_by(TranscriptionJob.created_at).limit(limit)
+
+        rows = db.execute(
+            delete(TranscriptionJob).where(
+                TranscriptionJob.id.in_(targets.scalar_subquery())
+            ).returning(TranscriptionJob.id, TranscriptionJob.file_url)
+        ).all()
+        deleted_ids = [row.id for row in rows]
+        history_service.record_deletions(db, deleted_ids)
+        db.commit()
+        job_cache.invalidate(deleted_ids)
+        job_event_publisher.publish_many([build_job_event(str(job_id), 'deleted') for job_id in deleted_ids])
+        logger.info(f'Batch deleted {len(deleted_ids)} transcription jobs')
+
+        objects_deleted, failed = JobDeletionService.delete_objects(db, [row.file_url for row in rows])
+        has_more = job_ids is None and len(deleted_ids) == limit
+        return deleted_ids, objects_deleted, failed, has_more
+
+    @staticmethod
+    def retry_failed_deletions(db: Session, limit: int = MAX_DELETION_RETRIES) -> Tuple[int, int]:
+        """
+        Retry the oldest entries of the storage deletion retry list.
+
+        Returns:
+            Tuple of (objects deleted, objects still failing)
+        """
+        object_names = db.execute(
+            select(StorageDeletionRetry.object_name).order_by(StorageDeletionRetry.updated_at).limit(limit)
+        ).scalars().all()
+        if not object_names:
+            return 0, 0
+
+        failed = r2_service.delete_files(list(object_names))
+        succeeded = [name for name in object_names if name not in failed]
+        if succeeded:
+            db.execute(delete(StorageDeletionRetry).where(StorageDeletionRetry.object_name.in_(succeeded)))
+            db.commit()
+        JobDeletionService.queue_retries(db, failed)
+        logger.info(f'Retried {len(object_names)} storage deletions: {len(succeeded)} deleted, {len(failed)} failed')
+        return len(succeeded), len(failed)
+
+
+# Global service instance
+job_deletion_service = JobDeletionService()
@@ -0,0 +1,239 @@
+"""
+Job status events.
+
+Workers publish a small event whenever a job changes state; API processes
+push them to Server-Sent Events / WebSocket subscribers. With Redis each
+API process holds a single pattern subscription and fans events out to
+in-process queues, so an idle subscriber costs one asyncio.Queue and no
+database connection. The in-memory broker only delivers events published
+in the API process itself (jobs run by a separate worker process never
+reach it), so in that mode the hub also reads the status columns of every
+subscribed job in one query each EVENT_POLL_INTERVAL and dispatches the
+changes, however many streams are open.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+
+import redis
+import redis.asyncio as aioredis
+from starlette.concurrency import run_in_threadpool
+
+from src.config import settings
+from src.database import SessionLocal
+from src.models import TranscriptionJob
+from src.services.job_partitions import job_ids_filter
+
+logger = logging.getLogger(__name__)
+
+# Redis channel prefix; one channel per job
+CHANNEL_PREFIX = 'job-events:'
+
+# Statuses after which no further events are sent ('deleted': the job was deleted)
+TERMINAL_STATUSES = {'completed', 'failed', 'deleted'}
+
+
+def build_job_event(
+    job_id: str,
+    status: str,
+    error_message: Optional[str] = None,
+    completed_at: Optional[datetime] = None,
+    stage: Optional[str] = None,
+) -> dict:
+    """Build the event payload (never includes the transcript itself)."""
+    return {
+        'id': job_id,
+        'status': status,
+        'stage': stage,
+        'error_message': error_message,
+        'completed_at': completed_at.isoformat() if completed_at else None,
+    }
+
+
+def load_job_events(job_ids: List[str]) -> Dict[str, dict]:
+    """
+    Read the current state (status columns only) of several jobs as events.
+
+    Opens its own short-lived session so the hub never holds a database
+    connection between polls.
+
+    Returns:
+        Events by job ID; deleted jobs are missing
+    """
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            TranscriptionJob.id,
+            TranscriptionJob.status,
+            TranscriptionJob.error_message,
+            TranscriptionJob.completed_at,
+        ).filter(job_ids_filter([UUID(job_id) for job_id in job_ids])).all()
+    finally:
+        db.close()
+    return {
+        str(row.id): build_job_event(str(row.id), row.status.value, row.error_message, row.completed_at)
+        for row in rows
+    }
+
+
+class JobEventHub:
+    """Per-process registry of subscribers, fed by the configured broker."""
+
+    def __init__(self):
+        """Start with no subscribers; the broker listener starts lazily."""
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        # Last status seen by subscribers of each job (memory broker polling)
+        self._statuses: Dict[str, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of open subscriptions in this process."""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Register a subscriber for one job and return its event queue."""
+        self._loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not self._loop:
+            if settings.EVENT_BROKER == 'redis':
+                self._listener = self._loop.create_task(self._listen_redis())
+            else:
+                self._listener = self._loop.create_task(self._poll_statuses())
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+        self._subscribers[job_id].add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        """Remove a subscriber."""
+        queues = self._subscribers.get(job_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[job_id]
+            self._statuses.pop(job_id, None)
+
+    def observe(self, job_id: str, status: str) -> None:
+        """
+        Record the status a new subscriber was sent as its snapshot.
+
+        Polling starts comparing a job's status only once it is known, so
+        call this after reading the snapshot (which follows subscribe).
+        """
+        if job_id in self._subscribers:
+            self._statuses.setdefault(job_id, status)
+
+    def dispatch(self, event: dict) -> None:
+        """Deliver an event to this process's subscribers (event loop thread only)."""
+        if event['id'] in self._subscribers:
+            self._statuses[event['id']] = event['status']
+        for queue in list(self._subscribers.get(event['id'], ())):
+            if queue.full():
+                # Slow consumer: keep only the latest state
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def dispatch_threadsafe(self, event: dict) -> None:
+        """Deliver an event published from a non-event-loop thread (memory broker)."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.dispatch, event)
+
+    async def _poll_statuses(self) -> None:
+        """Dispatch status changes and deletions of subscribed jobs (memory broker)."""
+        while True:
+            await asyncio.sleep(settings.EVENT_POLL_INTERVAL)
+            job_ids = list(self._statuses)
+            if not job_ids:
+                continue
+            try:
+                events = await run_in_threadpool(load_job_events, job_ids)
+            except Exception as e:
+                logger.warning(f'Failed to poll status of {len(job_ids)} jobs: {e}')
+                continue
+            for job_id in job_ids:
+                event = events.get(job_id, build_job_event(job_id, 'deleted'))
+                if job_id in self._statuses and event['status'] != self._statuses[job_id]:
+                    self.dispatch(event)
+
+    async def _listen_redis(self) -> None:
+        """Forward every job event published to Redis to local subscribers."""
+        while True:
+            client = aioredis.from_url(settings.REDIS_URL)
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.psubscribe(f'{CHANNEL_PREFIX}*')
+                logger.info('Listening for job events on Redis')
+                async for message in pubsub.listen():
+                    if message['type'] == 'pmessage':
+                        self.dispatch(json.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'Job event listener failed, reconnecting: {e}')
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+
+class JobEventPublisher:
+    """Publishes job events from workers (sync code)."""
+
+    def __init__(self):
+        """Create the Redis client lazily so importing this module never connects."""
+        self._client: Optional[redis.Redis] = None
+        self._lock = threading.Lock()
+
+    def _redis(self) -> redis.Redis:
+        with self._lock:
+            if self._client is None:
+                self._client = redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=5)
+            return self._client
+
+    def publish(self, event: dict) -> None:
+        """Publish an event; failures are logged and never affect the job."""
+        try:
+            if settings.EVENT_BROKER == 'redis':
+                self._redis().publish(f'{CHANNEL_PREFIX}{event["id"]}', json.dumps(event))
+            else:
+                job_event_hub.dispatch_threadsafe(event)
+        except Exception as e:
+            logger.warning(f'Failed to publish event for job {event["id"]}: {e}')
+
+    def publish_many(self, events: List[dict]) -> None:
+        """Publish several events in one Redis round trip; failures are logged."""
+        try:
+            if settings.EVENT_BROKER == 'redis':
+                pipeline = self._redis().pipeline(transaction=False)
+                for event in events:
+                    pipeline.publish(f'{CHANNEL_PREFIX}{event["id"]}', json.dumps(event))
+                pipeline.execute()
+            else:
+                for event in events:
+                    job_event_hub.dispatch_threadsafe(event)
+        except Exception as e:
+            logger.warning(f'Failed to publish {len(events)} job events: {e}')
+
+
+# Global instances
+job_event_hub = JobEventHub()
+job_event_publisher = JobEventPublisher()
+
+
+def publish_job_event(job_id, status, error_message=None, completed_at=None, stage=None) -> None:
+    """Publish a job status change (status may be a TranscriptionStatus or its value)."""
+    job_event_publisher.publish(
+        build_job_event(str(job_id), getattr(status, 'value', status), error_message, completed_at, stage)
+    )
+
+
+def format_sse(event: dict) -> str:
+    """Serialize an event as a Server-Sent Events message."""
+    return f'event: status\ndata: {json.dumps(event)}\n\n'
@@ -0,0 +1,317 @@
+"""
+Monthly partitions of transcription_jobs.
+
+transcription_jobs is range-partitioned on created_at, one partition per
+calendar month (transcription_jobs_pYYYYMM). There is no default partition,
+so a month needs its partition before rows can be inserted into it:
+
+- premake() keeps the current and the next PARTITION_PREMAKE_MONTHS months
+  ready (at API startup and in the maintenance process)
+- ensure_partitions() creates the months of imported history records
+
+archive() exports every whole month older than PARTITION_ARCHIVE_AFTER_MONTHS
+to object storage as zstd-compressed NDJSON, records deletion tombstones for
+its jobs (so delta sync drops them), then detaches and drops its partition and
+deletes the media no remaining job references.
+
+Job IDs are time-ordered (UUIDv7, see new_job_id), so lookups by ID add a
+created_at lower bound (job_id_filter, job_ids_filter) and skip the older
+partitions.
+"""
+
+import enum
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+import zstandard
+from sqlalchemy import and_, delete, func, insert, select, text
+from sqlalchemy.engine import Connection
+
+from src.config import settings
+from src.database import SessionLocal, db_utc_now, engine
+from src.models import TranscriptionBlob, TranscriptionDeletion, TranscriptionJob, TranscriptionStatus
+from src.services.history_export import to_utc_naive
+from src.services.job_cache import job_cache
+from src.services.r2_service import r2_service
+from src.services.transcript_store import decompress_transcript
+
+logger = logging.getLogger(__name__)
+
+# Partition names are this prefix plus YYYYMM
+PARTITION_PREFIX = 'transcription_jobs_p'
+
+# Archives are stored under this prefix (never treated as orphans by the reconciler)
+ARCHIVE_PREFIX = 'archive/'
+
+# Rows fetched from the server-side cursor per round trip while archiving
+ARCHIVE_FETCH_SIZE = 1000
+
+# pg_advisory_xact_lock key serialising partition creation
+PARTITION_LOCK_KEY = 7305023
+
+# pg_advisory_lock key held while archiving, so only one process archives
+ARCHIVE_LOCK_KEY = 7305024
+
+# Creating a partition waits for every open transaction on transcription_jobs; give up after this
+PARTITION_LOCK_TIMEOUT = '10s'
+
+# created_at is set slightly after the ID is minted; imported history records may
+# carry a createdAt shifted by a client time zone, so the lower bound is loosened
+ID_CLOCK_SLACK = timedelta(days=1)
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant of the month containing `value`."""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """First instant of the month `months` after the month starting at `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the partition holding the month starting at `month`."""
+    return f'{PARTITION_PREFIX}{month:%Y%m}'
+
+
+def id_created_after(job_id: uuid.UUID) -> Optional[datetime]:
+    """Lower bound of created_at for a time-ordered (v7) job ID, or None for other IDs."""
+    if job_id.version != 7:
+        return None
+    return datetime.utcfromtimestamp((job_id.int >> 80) / 1000) - ID_CLOCK_SLACK
+
+
+def job_id_filter(job_id: uuid.UUID):
+    """
+    Filter matching one job by ID that lets the planner prune partitions.
+
+    Older random (v4) IDs carry no timestamp and are looked up in every
+    partition.
+    """
+    created_after = id_created_after(job_id)
+    if created_after is None:
+        return TranscriptionJob.id == job_id
+    return and_(TranscriptionJob.id == job_id, TranscriptionJob.created_at >= created_after)
+
+
+def job_ids_filter(job_ids: List[uuid.UUID]):
+    """
+    Filter matching several jobs by ID, pruned below the oldest time-ordered
+    ID (no pruning if any ID is random).
+    """
+    bounds = [id_created_after(job_id) for job_id in job_ids]
+    if not bounds or None in bounds:
+        return TranscriptionJob.id.in_(job_ids)
+    return and_(TranscriptionJob.id.in_(job_ids), TranscriptionJob.created_at >= min(bounds))
+
+
+def archive_value(value):
+    """JSON representation of a column value."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def archive_record(row) -> dict:
+    """
+    Every column of an archived job row, with an offloaded transcript stored inline.
+    """
+    record = {
+        column.name: archive_value(row._mapping[column]) for column in TranscriptionJob.__table__.columns
+    }
+    if row.blob_data is not None:
+        record['transcription_text'] = decompress_transcript(row.blob_data)
+        record['transcript_storage'] = None
+    return record
+
+
+class JobPartitionService:
+    """Service for creating and archiving transcription_jobs partitions."""
+
+    @staticmethod
+    def partition_months(connection: Connection) -> List[datetime]:
+        """Months that currently have an attached partition, oldest first."""
+        names = connection.execute(text(
+            'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            "WHERE i.inhparent = 'transcription_jobs'::regclass"
+        )).scalars().all()
+        return sorted(
+            datetime.strptime(name[len(PARTITION_PREFIX):], '%Y%m')
+            for name in names if name.startswith(PARTITION_PREFIX)
+        )
+
+    @staticmethod
+    def ensure_partitions(values: Iterable[datetime]) -> List[datetime]:
+        """
+        Create the missing partitions for the months of the given timestamps.
+
+        Runs in its own short transaction, since creating a partition locks
+        the whole table until commit. Call it before the caller's session
+        touches transcription_jobs, otherwise it waits for that session.
+
+        Returns:
+            Months whose partition was created
+        """
+        wanted = {month_start(to_utc_naive(value)) for value in values}
+        if not wanted:
+            return []
+
+        with engine.begin() as connection:
+            if wanted.issubset(JobPartitionService.partition_months(connection)):
+                return []
+            connection.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+            connection.execute(select(func.pg_advisory_xact_lock(PARTITION_LOCK_KEY)))
+            missing = sorted(wanted - set(JobPartitionService.partition_months(connection)))
+            for month in missing:
+                connection.execute(text(
+                    f'CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF transcription_jobs '
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+                ))
+                logger.info(f'Created partition {partition_name(month)}')
+        return missing
+
+    @staticmethod
+    def premake() -> List[datetime]:
+        """Create the partitions of this month and the next PARTITION_PREMAKE_MONTHS months."""
+        current = month_start(datetime.utcnow())
+        return JobPartitionService.ensure_partitions(
+            add_months(current, offset) for offset in range(settings.PARTITION_PREMAKE_MONTHS + 1)
+        )
+
+    @staticmethod
+    def _export(connection: Connection, in_month, object_name: str) -> int:
+        """Stream the month's rows to storage as zstd-compressed NDJSON; returns the row count."""
+        statement = select(
+            TranscriptionJob.__table__, TranscriptionBlob.data.label('blob_data')
+        ).outerjoin(
+            TranscriptionBlob, TranscriptionBlob.job_id == TranscriptionJob.id
+        ).where(
+            in_month
+        ).order_by(
+            TranscriptionJob.created_at
+        ).execution_options(yield_per=ARCHIVE_FETCH_SIZE)
+
+        compressor = zstandard.ZstdCompressor(level=settings.TRANSCRIPT_ZSTD_LEVEL).compressobj()
+        upload = r2_service.start_streaming_upload(object_name)
+        exported = 0
+        try:
+            for partition in connection.execute(statement).partitions():
+                for row in partition:
+                    line = json.dumps(archive_record(row), ensure_ascii=False).encode('utf-8') + b'\n'
+                    upload.write(compressor.compress(line))
+                exported += len(partition)
+                job_cache.invalidate([row.id for row in partition])
+            upload.write(compressor.flush())
+            upload.complete()
+        except BaseException:
+            upload.abort()
+            raise
+        return exported
+
+    @staticmethod
+    def archive_partition(month: datetime, dry_run: bool = False) -> Optional[dict]:
+        """
+        Export one month to storage, then detach and drop its partition.
+
+        Everything happens in one transaction that blocks writes to the
+        month (reads continue), so no row changes between the export and
+        the drop, and a failure leaves the partition untouched. The same
+        transaction adds a deletion tombstone for every archived job. Once
+        it commits, media no longer referenced by any job is deleted (failed
+        deletions go to the retry list).
+
+        Returns:
+            Summary with partition, rows, object_name and objects_deleted
+            (None on a dry run), or None if the month still has jobs processing
+        """
+        # job_deletion_service imports history_service, which imports this module
+        from src.services.job_deletion_service import job_deletion_service
+
+        name = partition_name(month)
+        month_end = add_months(month, 1)
+        in_month = and_(TranscriptionJob.created_at >= month, TranscriptionJob.created_at < month_end)
+
+        with engine.connect() as connection, connection.begin():
+            connection.execute(text(f'LOCK TABLE {name} IN SHARE MODE'))
+            counts = dict(connection.execute(
+                select(TranscriptionJob.status, func.count()).where(in_month).group_by(TranscriptionJob.status)
+            ).all())
+            if counts.get(TranscriptionStatus.PROCESSING):
+                logger.warning(f'Not archiving {name}: {counts[TranscriptionStatus.PROCESSING]} jobs still processing')
+                return None
+
+            rows = sum(counts.values())
+            if dry_run:
+                logger.info(f'Would archive {name} ({rows} jobs)')
+                return {'partition': name, 'rows': rows, 'object_name': None, 'objects_deleted': None}
+
+            object_name = f'{ARCHIVE_PREFIX}{name}-{datetime.utcnow():%Y%m%dT%H%M%SZ}.ndjson.zst'
+            JobPartitionService._export(connection, in_month, object_name)
+            # Tombstones, so delta sync clients drop the archived jobs too
+            connection.execute(insert(TranscriptionDeletion).from_select(
+                ['job_id', 'deleted_at'],
+                select(TranscriptionJob.id, db_utc_now()).where(in_month),
+            ))
+            file_urls = connection.execute(
+                select(TranscriptionJob.file_url).where(in_month).distinct()
+            ).scalars().all()
+            # Blobs reference the rows through a foreign key, which would block the detach
+            connection.execute(delete(TranscriptionBlob).where(
+                TranscriptionBlob.job_created_at >= month, TranscriptionBlob.job_created_at < month_end
+            ))
+            connection.execute(text(f'ALTER TABLE transcription_jobs DETACH PARTITION {name}'))
+            connection.execute(text(f'DROP TABLE {name}'))
+
+        db = SessionLocal()
+        try:
+            objects_deleted, failed = job_deletion_service.delete_objects(db, file_urls)
+        finally:
+            db.close()
+        logger.info(
+            f'Archived {name} ({rows} jobs) to {object_name}; deleted {objects_deleted} media objects'
+            f' ({len(failed)} queued for retry)'
+        )
+        return {'partition': name, 'rows': rows, 'object_name': object_name, 'objects_deleted': objects_deleted}
+
+    @staticmethod
+    def archive(older_than_months: Optional[int] = None, dry_run: bool = False) -> Optional[List[dict]]:
+        """
+        Archive every whole month that ended more than `older_than_months`
+        (default PARTITION_ARCHIVE_AFTER_MONTHS) months ago.
+
+        Returns:
+            Summaries of the archived months, or None if another process
+            holds the archive lock
+        """
+        if older_than_months is None:
+            older_than_months = settings.PARTITION_ARCHIVE_AFTER_MONTHS
+        cutoff = add_months(month_start(datetime.utcnow()), -max(1, older_than_months))
+        with engine.connect() as lock_connection:
+            if not lock_connection.execute(select(func.pg_try_advisory_lock(ARCHIVE_LOCK_KEY))).scalar():
+                logger.info('Partition archival is already running elsewhere, skipping')
+                return None
+            try:
+                months = [
+                    month for month in JobPartitionService.partition_months(lock_connection) if month < cutoff
+                ]
+                archived = []
+                for month in months:
+                    summary = JobPartitionService.archive_partition(month, dry_run)
+                    if summary:
+                        archived.append(summary)
+                return archived
+            finally:
+                lock_connection.execute(select(func.pg_advisory_unlock(ARCHIVE_LOCK_KEY)))
+
+
+# Global service instance
+job_partitions = JobPartitionService()
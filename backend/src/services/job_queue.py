@@ -0,0 +1,170 @@
+"""
+Durable transcription job queue on top of transcription_jobs.
+
+PROCESSING rows are the queue. Workers claim batches with
+SELECT ... FOR UPDATE SKIP LOCKED, hold each job under a lease that they
+extend with heartbeats, and a job whose lease expires (worker crash or
+restart) is claimed again, giving at-least-once processing.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import List
+from uuid import UUID
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.database import db_utc_now
+from src.models import TranscriptionJob, TranscriptionStatus
+from src.services.job_cache import job_cache
+from src.services.job_events import publish_job_event
+from src.services.metrics import JOB_ERRORS_TOTAL, JOB_RETRIES_TOTAL, JOBS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Error class recorded for jobs failed after JOB_MAX_ATTEMPTS expired leases
+ABANDONED_ERROR = 'AttemptsExhausted'
+
+
+class JobQueue:
+    """Claim, heartbeat and release operations for queued transcription jobs."""
+
+    @staticmethod
+    def _claimable(now: datetime):
+        """Filter for PROCESSING jobs that nobody holds and that are due."""
+        return and_(
+            TranscriptionJob.status == TranscriptionStatus.PROCESSING,
+            or_(TranscriptionJob.lease_expires_at.is_(None), TranscriptionJob.lease_expires_at < now),
+            or_(TranscriptionJob.available_at.is_(None), TranscriptionJob.available_at <= now),
+        )
+
+    @staticmethod
+    def claim(db: Session, worker_id: str, limit: int) -> List[UUID]:
+        """
+        Claim up to `limit` jobs for a worker, oldest first.
+
+        Rows locked by another worker's concurrent claim are skipped rather
+        than waited on, so workers never block each other.
+
+        Args:
+            db: Database session
+            worker_id: Identifier of the claiming worker
+            limit: Maximum number of jobs to claim
+
+        Returns:
+            IDs of the claimed jobs
+        """
+        if limit <= 0:
+            return []
+
+        now = datetime.utcnow()
+        JobQueue._fail_exhausted(db, now)
+
+        jobs = db.query(TranscriptionJob).filter(
+            JobQueue._claimable(now),
+            TranscriptionJob.attempts < settings.JOB_MAX_ATTEMPTS,
+        ).order_by(
+            TranscriptionJob.created_at
+        ).limit(limit).with_for_update(skip_locked=True).all()
+
+        lease_expires_at = now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        for job in jobs:
+            if job.claimed_by:
+                logger.warning(f'Re-claiming job {job.id} after lease of {job.claimed_by} expired')
+                JOB_RETRIES_TOTAL.labels('lease_expired').inc()
+            job.claimed_by = worker_id
+            job.lease_expires_at = lease_expires_at
+            job.heartbeat_at = now
+            job.attempts = (job.attempts or 0) + 1
+
+        job_ids = [job.id for job in jobs]
+        db.commit()
+        job_cache.invalidate(job_ids)
+        return job_ids
+
+    @staticmethod
+    def _fail_exhausted(db: Session, now: datetime) -> None:
+        """Mark jobs FAILED whose lease expired after their last allowed attempt."""
+        error_message = f'Processing abandoned after {settings.JOB_MAX_ATTEMPTS} attempts'
+        failed_ids = db.execute(
+            update(TranscriptionJob).where(
+                JobQueue._claimable(now),
+                TranscriptionJob.attempts >= settings.JOB_MAX_ATTEMPTS,
+            ).values(
+                status=TranscriptionStatus.FAILED,
+                error_message=error_message,
+                updated_at=db_utc_now(),
+            ).returning(TranscriptionJob.id)
+        ).scalars().all()
+        db.commit()
+        job_cache.invalidate(failed_ids)
+
+        if failed_ids:
+            logger.error(f'Marked {len(failed_ids)} abandoned jobs as FAILED')
+            JOBS_TOTAL.labels('failed').inc(len(failed_ids))
+            JOB_ERRORS_TOTAL.labels(ABANDONED_ERROR).inc(len(failed_ids))
+        for job_id in failed_ids:
+            publish_job_event(job_id, TranscriptionStatus.FAILED, error_message=error_message)
+
+    @staticmethod
+    def depth(db: Session) -> int:
+        """Number of jobs waiting to be claimed (including ones whose lease expired)."""
+        return db.execute(
+            select(func.count()).select_from(TranscriptionJob).where(JobQueue._claimable(datetime.utcnow()))
+        ).scalar_one()
+
+    @staticmethod
+    def heartbeat(db: Session, worker_id: str, job_ids: List[UUID]) -> int:
+        """
+        Extend the leases of jobs the worker is still processing.
+
+        Returns:
+            Number of leases extended (jobs re-claimed elsewhere are not touched)
+        """
+        if not job_ids:
+            return 0
+
+        now = datetime.utcnow()
+        extended = db.query(TranscriptionJob).filter(
+            TranscriptionJob.id.in_(job_ids),
+            TranscriptionJob.claimed_by == worker_id,
+            TranscriptionJob.status == TranscriptionStatus.PROCESSING,
+        ).update(
+            {
+                TranscriptionJob.heartbeat_at: now,
+                TranscriptionJob.lease_expires_at: now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+        return extended
+
+    @staticmethod
+    def release(
+        db: Session, job_id: UUID, worker_id: str, delay_seconds: float = 0, count_attempt: bool = False
+    ) -> None:
+        """
+        Give a job back to the queue, optionally not before `delay_seconds`.
+
+        By default the attempt is not counted, so rate-limited jobs are not
+        exhausted; retries after transient errors pass count_attempt=True.
+        """
+        now = datetime.utcnow()
+        values = {
+            TranscriptionJob.lease_expires_at: None,
+            TranscriptionJob.available_at: now + timedelta(seconds=delay_seconds),
+        }
+        if not count_attempt:
+            values[TranscriptionJob.attempts] = TranscriptionJob.attempts - 1
+        db.query(TranscriptionJob).filter(
+            TranscriptionJob.id == job_id,
+            TranscriptionJob.claimed_by == worker_id,
+            TranscriptionJob.status == TranscriptionStatus.PROCESSING,
+        ).update(values, synchronize_session=False)
+        db.commit()
+        job_cache.invalidate([job_id])
+
+
+# Global queue instance
+job_queue = JobQueue()
@@ -0,0 +1,154 @@
+"""
+Prometheus metrics of the upload and transcription pipeline.
+
+Metrics are recorded in every process that runs part of the pipeline. The
+API exposes its own at /metrics; job queue workers and Celery workers have
+no API, so with METRICS_PORT set they serve theirs on that port (see
+start_metrics_server), and Prometheus scrapes each of them.
+
+When one of these serves several processes (uvicorn --workers, the Celery
+prefork pool), set PROMETHEUS_MULTIPROC_DIR to an empty directory shared by
+them before they start: each process then writes its values to files there
+and the endpoint aggregates them (prometheus_client multiprocess mode).
+Without it, an endpoint only reports the process that serves it.
+"""
+
+import os
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+# Multiprocess mode is chosen by prometheus_client from this variable at import time
+MULTIPROC_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+# Pipeline stages take from well under a second to minutes (large uploads, long recordings)
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+# Database commits
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+UPLOAD_INGEST_SECONDS = Histogram(
+    'transcription_upload_ingest_seconds',
+    'Time to ingest an upload request (path: direct, chunk, local_presigned)',
+    ['path'],
+    buckets=STAGE_BUCKETS,
+)
+STORAGE_UPLOAD_SECONDS = Histogram(
+    'transcription_storage_upload_seconds',
+    'Time spent writing media to storage (operation: stream, chunk, complete)',
+    ['operation'],
+    buckets=STAGE_BUCKETS,
+)
+DOWNLOAD_SECONDS = Histogram(
+    'transcription_download_seconds',
+    'Time to download media from storage for processing',
+    buckets=STAGE_BUCKETS,
+)
+TRANSCODE_SECONDS = Histogram(
+    'transcription_transcode_seconds',
+    'Time spent in ffmpeg (operation: transcode, segment, silence_detection)',
+    ['operation'],
+    buckets=STAGE_BUCKETS,
+)
+WHISPER_REQUEST_SECONDS = Histogram(
+    'transcription_whisper_request_seconds',
+    'Latency of Whisper API requests (status: HTTP status code or error)',
+    ['status'],
+    buckets=STAGE_BUCKETS,
+)
+DB_COMMIT_SECONDS = Histogram(
+    'transcription_db_commit_seconds',
+    'Time to commit job changes (operation: create_job, complete_job, fail_job)',
+    ['operation'],
+    buckets=DB_BUCKETS,
+)
+JOB_PROCESSING_SECONDS = Histogram(
+    'transcription_job_processing_seconds',
+    'Time from picking up a job to its terminal status',
+    ['status'],
+    buckets=STAGE_BUCKETS,
+)
+
+JOBS_TOTAL = Counter(
+    'transcription_jobs',
+    'Jobs that reached a terminal status',
+    ['status'],
+)
+JOB_ERRORS_TOTAL = Counter(
+    'transcription_job_errors',
+    'Job processing errors by exception class (AttemptsExhausted for abandoned jobs)',
+    ['error'],
+)
+JOB_RETRIES_TOTAL = Counter(
+    'transcription_job_retries',
+    'Retried work (reason: rate_limited, whisper_429, lease_expired, error)',
+    ['reason'],
+)
+
+JOBS_IN_FLIGHT = Gauge(
+    'transcription_jobs_in_flight',
+    'Jobs being processed right now',
+    multiprocess_mode='livesum',
+)
+QUEUE_DEPTH = Gauge(
+    'transcription_queue_depth',
+    'Jobs waiting to be picked up (queue: jobs, celery)',
+    ['queue'],
+    multiprocess_mode='livemostrecent',
+)
+
+
+def multiprocess_dir() -> Optional[str]:
+    """The multiprocess metrics directory, or None in single-process mode."""
+    return os.environ.get(MULTIPROC_DIR_ENV) or None
+
+
+def _registry():
+    """Registry aggregating all processes in multiprocess mode, else this process's."""
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> tuple:
+    """
+    Current metrics in the Prometheus text format.
+
+    Returns:
+        Tuple of (payload bytes, content type)
+    """
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> Tuple:
+    """
+    Serve the metrics over HTTP on a daemon thread (processes without the API).
+
+    In multiprocess mode the endpoint aggregates every process writing to
+    the directory, so one server per host or container is enough.
+
+    Args:
+        port: Port to listen on (0 picks a free one)
+
+    Returns:
+        Tuple of (server, thread)
+    """
+    return start_http_server(port, registry=_registry())
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop the live gauges of an exiting process (multiprocess mode only)."""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -3,10 +3,21 @@ Cloudflare R2 (S3-compatible) storage service.
 Supports local file storage as fallback for development.
 """
 
+import asyncio
+import functools
+import hashlib
+import heapq
+import hmac
 import logging
 import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import BinaryIO
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
 
 from src.config import settings
 
@@ -15,6 +26,28 @@ logger = logging.getLogger(__name__)
 # Local storage directory for development
 LOCAL_STORAGE_DIR = Path(__file__).parent.parent.parent / 'uploads'
 
+# Chunk files for resumable uploads into local storage
+LOCAL_CHUNKS_DIR = LOCAL_STORAGE_DIR / '.chunks'
+
+# Multipart part size for streaming uploads (S3 requires >= 5MB except the last part)
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+# Keys per DeleteObjects request (S3/R2 maximum)
+DELETE_OBJECTS_BATCH_SIZE = 1000
+
+# Parallel unlinks when deleting many local files
+LOCAL_DELETE_WORKERS = 8
+
+# Threads running blocking storage calls for async routes, kept apart from
+# the threadpool that runs sync routes
+STORAGE_IO_WORKERS = 8
+
+
+def _sign_local_upload(object_name: str, content_type: str, expires: int) -> str:
+    """HMAC signature for a local-storage upload URL."""
+    message = f'{object_name}:{content_type}:{expires}'.encode()
+    return hmac.new(settings.UPLOAD_SIGNING_SECRET.encode(), message, hashlib.sha256).hexdigest()
+
 
 def _is_r2_configured() -> bool:
     """Check if R2 credentials are properly configured."""
@@ -26,6 +59,92 @@ def _is_r2_configured() -> bool:
     )
 
 
+class LocalStreamingUpload:
+    """Chunked file write into local storage, renamed into place on completion."""
+
+    def __init__(self, file_path: Path):
+        """Open a temporary part file next to the final destination."""
+        self.file_path = file_path
+        self.temp_path = file_path.with_name(file_path.name + '.part')
+        self._file = open(self.temp_path, 'wb')
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk to the part file."""
+        self._file.write(chunk)
+
+    def complete(self) -> str:
+        """Close the part file and move it to its final name."""
+        self._file.close()
+        os.replace(self.temp_path, self.file_path)
+        return f'file://{self.file_path.absolute()}'
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        self._file.close()
+        if self.temp_path.exists():
+            self.temp_path.unlink()
+
+
+class R2MultipartUpload:
+    """S3 multipart upload that buffers at most one part in memory."""
+
+    def __init__(self, client, bucket_name: str, object_name: str, file_url: str):
+        """Start a multipart upload for the given object."""
+        self.client = client
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.file_url = file_url
+        self.parts = []
+        self._buffer = bytearray()
+        response = client.create_multipart_upload(Bucket=bucket_name, Key=object_name)
+        self.upload_id = response['UploadId']
+
+    def write(self, chunk: bytes) -> None:
+        """Buffer a chunk and flush full parts to R2."""
+        self._buffer.extend(chunk)
+        while len(self._buffer) >= MULTIPART_PART_SIZE:
+            part = bytes(self._buffer[:MULTIPART_PART_SIZE])
+            del self._buffer[:MULTIPART_PART_SIZE]
+            self._upload_part(part)
+
+    def _upload_part(self, body: bytes) -> None:
+        part_number = len(self.parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket_name,
+            Key=self.object_name,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        self.parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+
+    def complete(self) -> str:
+        """Flush the remaining buffer and complete the multipart upload."""
+        if self._buffer or not self.parts:
+            self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=self.object_name,
+            UploadId=self.upload_id,
+            MultipartUpload={'Parts': self.parts},
+        )
+        logger.info(f'File uploaded to R2: {self.object_name} ({len(self.parts)} parts)')
+        return self.file_url
+
+    def abort(self) -> None:
+        """Abort the multipart upload so R2 discards the uploaded parts."""
+        from botocore.exceptions import ClientError
+
+        self._buffer.clear()
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=self.object_name, UploadId=self.upload_id
+            )
+        except ClientError as e:
+            logger.error(f'Failed to abort multipart upload {self.object_name}: {e}')
+
+
 class LocalStorageService:
     """Local file storage service for development."""
 
@@ -44,6 +163,90 @@ class LocalStorageService:
         logger.info(f'File saved locally: {object_name}')
         return file_url
 
+    def start_streaming_upload(self, object_name: str) -> LocalStreamingUpload:
+        """Begin a chunked write of an object into local storage."""
+        file_path = self.storage_dir / object_name
+        file_path.parent.mkdir(parents=True, exist_ok=True)  # prefixed names (archive/...) are subdirectories
+        return LocalStreamingUpload(file_path)
+
+    def create_chunked_upload(self, object_name: str) -> str:
+        """Create a chunk directory for a resumable upload and return its id."""
+        upload_id = uuid.uuid4().hex
+        (LOCAL_CHUNKS_DIR / upload_id).mkdir(parents=True, exist_ok=True)
+        return upload_id
+
+    def upload_chunk(self, object_name: str, upload_id: str, part_number: int, body: bytes) -> None:
+        """Write one chunk file; re-uploading the same part replaces it."""
+        chunk_dir = LOCAL_CHUNKS_DIR / upload_id
+        if not chunk_dir.is_dir():
+            raise FileNotFoundError(f'Chunked upload not found: {upload_id}')
+        chunk_path = chunk_dir / f'{part_number:05d}'
+        temp_path = chunk_dir / f'{part_number:05d}.part'
+        with open(temp_path, 'wb') as f:
+            f.write(body)
+        os.replace(temp_path, chunk_path)
+
+    def list_uploaded_chunks(self, object_name: str, upload_id: str) -> Dict[int, int]:
+        """Return {part_number: size} for every chunk received so far."""
+        chunk_dir = LOCAL_CHUNKS_DIR / upload_id
+        if not chunk_dir.is_dir():
+            return {}
+        return {
+            int(path.name): path.stat().st_size
+            for path in chunk_dir.iterdir()
+            if path.name.isdigit()
+        }
+
+    def complete_chunked_upload(self, object_name: str, upload_id: str, part_numbers: List[int]) -> str:
+        """Concatenate the chunk files in order into the final object."""
+        chunk_dir = LOCAL_CHUNKS_DIR / upload_id
+        upload = self.start_streaming_upload(object_name)
+        try:
+            for part_number in sorted(part_numbers):
+                with open(chunk_dir / f'{part_number:05d}', 'rb') as chunk:
+                    for block in iter(lambda: chunk.read(1024 * 1024), b''):
+                        upload.write(block)
+            file_url = upload.complete()
+        except BaseException:
+            upload.abort()
+            raise
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+        logger.info(f'Assembled {len(part_numbers)} chunks into {object_name}')
+        return file_url
+
+    def abort_chunked_upload(self, object_name: str, upload_id: str) -> None:
+        """Remove all chunk files of a resumable upload."""
+        shutil.rmtree(LOCAL_CHUNKS_DIR / upload_id, ignore_errors=True)
+
+    def generate_presigned_upload_url(self, object_name: str, content_type: str, expires_in: int) -> str:
+        """
+        Build a signed PUT URL served by the API's local upload handler.
+
+        Stand-in for an R2 presigned URL during development.
+        """
+        expires = int(time.time()) + expires_in
+        query = urlencode({
+            'content_type': content_type,
+            'expires': expires,
+            'signature': _sign_local_upload(object_name, content_type, expires),
+        })
+        return f'{settings.BACKEND_URL}/api/uploads/local/{object_name}?{query}'
+
+    def verify_presigned_upload(self, object_name: str, content_type: str, expires: int, signature: str) -> bool:
+        """Check a local upload URL's signature and expiry."""
+        if expires < time.time():
+            return False
+        expected = _sign_local_upload(object_name, content_type, expires)
+        return hmac.compare_digest(expected, signature)
+
+    def head_file(self, object_name: str) -> Optional[dict]:
+        """Return size metadata of a stored file, or None if it does not exist."""
+        file_path = self.storage_dir / object_name
+        if not file_path.is_file():
+            return None
+        # Content type is enforced by the signed upload handler, not stored
+        return {'size': file_path.stat().st_size, 'content_type': None}
+
     def delete_file(self, object_name: str) -> None:
         """Delete file from local storage."""
         file_path = self.storage_dir / object_name
@@ -53,6 +256,68 @@ class LocalStorageService:
         else:
             logger.warning(f'File not found for deletion: {object_name}')
 
+    def delete_files(self, object_names: List[str]) -> Dict[str, str]:
+        """
+        Delete many files from local storage in parallel.
+
+        Files that do not exist count as deleted.
+
+        Returns:
+            Error message per object name that could not be deleted
+        """
+        def unlink(object_name: str) -> Optional[str]:
+            try:
+                (self.storage_dir / object_name).unlink(missing_ok=True)
+                return None
+            except OSError as e:
+                return str(e)
+
+        with ThreadPoolExecutor(max_workers=LOCAL_DELETE_WORKERS) as executor:
+            errors = list(executor.map(unlink, object_names))
+
+        failed = {name: error for name, error in zip(object_names, errors) if error}
+        logger.info(f'Deleted {len(object_names) - len(failed)} files locally, {len(failed)} failed')
+        return failed
+
+    def list_objects(
+        self, continuation_token: Optional[str] = None, max_keys: int = 1000
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        List one page of stored files in name order.
+
+        The token is the last name of the previous page. Each page rescans
+        the directory but keeps only `max_keys` names, so memory stays
+        bounded. In-progress uploads (.part files, chunk directory) are
+        not listed.
+
+        Returns:
+            Tuple of (objects with name, size and last_modified (naive UTC),
+            token of the next page or None after the last page)
+        """
+        def entries():
+            with os.scandir(self.storage_dir) as scan:
+                for entry in scan:
+                    if entry.name.startswith('.') or entry.name.endswith('.part'):
+                        continue
+                    if continuation_token is not None and entry.name <= continuation_token:
+                        continue
+                    if entry.is_file():
+                        yield entry.name
+
+        names = heapq.nsmallest(max_keys, entries())
+        objects = []
+        for name in names:
+            try:
+                stat = (self.storage_dir / name).stat()
+            except FileNotFoundError:
+                continue
+            objects.append({
+                'name': name,
+                'size': stat.st_size,
+                'last_modified': datetime.fromtimestamp(stat.st_mtime, timezone.utc).replace(tzinfo=None),
+            })
+        return objects, (names[-1] if len(names) == max_keys else None)
+
     def get_file_url(self, object_name: str) -> str:
         """Get local file path as URL."""
         file_path = self.storage_dir / object_name
@@ -64,6 +329,10 @@ class LocalStorageService:
         with open(file_path, 'rb') as f:
             return f.read()
 
+    def get_local_path(self, object_name: str) -> Path:
+        """Return the on-disk path of a stored file (no copy needed)."""
+        return self.storage_dir / object_name
+
 
 class R2Service:
     """Service for interacting with Cloudflare R2 storage."""
@@ -94,6 +363,77 @@ class R2Service:
             logger.error(f'Failed to upload file {object_name}: {e}')
             raise
 
+    def start_streaming_upload(self, object_name: str) -> R2MultipartUpload:
+        """Begin a multipart upload of an object into R2."""
+        return R2MultipartUpload(
+            self.client, self.bucket_name, object_name, self.get_file_url(object_name)
+        )
+
+    def create_chunked_upload(self, object_name: str) -> str:
+        """Create a multipart upload for a resumable upload and return its id."""
+        response = self.client.create_multipart_upload(Bucket=self.bucket_name, Key=object_name)
+        return response['UploadId']
+
+    def upload_chunk(self, object_name: str, upload_id: str, part_number: int, body: bytes) -> None:
+        """Upload one part; re-uploading the same part number replaces it."""
+        self.client.upload_part(
+            Bucket=self.bucket_name,
+            Key=object_name,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+
+    def _list_parts(self, object_name: str, upload_id: str) -> List[dict]:
+        paginator = self.client.get_paginator('list_parts')
+        parts = []
+        for page in paginator.paginate(Bucket=self.bucket_name, Key=object_name, UploadId=upload_id):
+            parts.extend(page.get('Parts', []))
+        return parts
+
+    def list_uploaded_chunks(self, object_name: str, upload_id: str) -> Dict[int, int]:
+        """Return {part_number: size} for every part R2 has received so far."""
+        return {part['PartNumber']: part['Size'] for part in self._list_parts(object_name, upload_id)}
+
+    def complete_chunked_upload(self, object_name: str, upload_id: str, part_numbers: List[int]) -> str:
+        """Complete the multipart upload using the ETags R2 reports for each part."""
+        etags = {part['PartNumber']: part['ETag'] for part in self._list_parts(object_name, upload_id)}
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=object_name,
+            UploadId=upload_id,
+            MultipartUpload={
+                'Parts': [{'ETag': etags[n], 'PartNumber': n} for n in sorted(part_numbers)]
+            },
+        )
+        logger.info(f'Completed multipart upload {object_name} ({len(part_numbers)} parts)')
+        return self.get_file_url(object_name)
+
+    def abort_chunked_upload(self, object_name: str, upload_id: str) -> None:
+        """Abort the multipart upload so R2 discards its parts."""
+        self.client.abort_multipart_upload(Bucket=self.bucket_name, Key=object_name, UploadId=upload_id)
+
+    def generate_presigned_upload_url(self, object_name: str, content_type: str, expires_in: int) -> str:
+        """Generate a presigned PUT URL so the client uploads straight to R2."""
+        return self.client.generate_presigned_url(
+            'put_object',
+            Params={'Bucket': self.bucket_name, 'Key': object_name, 'ContentType': content_type},
+            ExpiresIn=expires_in,
+        )
+
+    def head_file(self, object_name: str) -> Optional[dict]:
+        """Return size and content type of an object, or None if it does not exist."""
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.client.head_object(Bucket=self.bucket_name, Key=object_name)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            logger.error(f'Failed to head file {object_name}: {e}')
+            raise
+        return {'size': response['ContentLength'], 'content_type': response.get('ContentType')}
+
     def delete_file(self, object_name: str) -> None:
         """Delete a file from R2."""
         from botocore.exceptions import ClientError
@@ -105,11 +445,124 @@ class R2Service:
             logger.error(f'Failed to delete file {object_name}: {e}')
             raise
 
+    def delete_files(self, object_names: List[str]) -> Dict[str, str]:
+        """
+        Delete many files from R2 with DeleteObjects, up to 1000 keys per request.
+
+        Keys that do not exist count as deleted. A failed request marks all
+        of its keys as failed; the other batches still run.
+
+        Returns:
+            Error message per object name that could not be deleted
+        """
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        failed = {}
+        for start in range(0, len(object_names), DELETE_OBJECTS_BATCH_SIZE):
+            batch = object_names[start:start + DELETE_OBJECTS_BATCH_SIZE]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={'Objects': [{'Key': name} for name in batch], 'Quiet': True},
+                )
+            except (BotoCoreError, ClientError) as e:
+                logger.error(f'Failed to delete batch of {len(batch)} files from R2: {e}')
+                failed.update({name: str(e) for name in batch})
+                continue
+
+            for error in response.get('Errors', []):
+                if error.get('Code') != 'NoSuchKey':
+                    failed[error['Key']] = f'{error.get("Code")}: {error.get("Message")}'
+
+        logger.info(f'Deleted {len(object_names) - len(failed)} files from R2, {len(failed)} failed')
+        return failed
+
+    def list_objects(
+        self, continuation_token: Optional[str] = None, max_keys: int = 1000
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        List one page of objects in the bucket (ListObjectsV2, key order).
+
+        Returns:
+            Tuple of (objects with name, size and last_modified (naive UTC),
+            continuation token of the next page or None after the last page)
+        """
+        params = {'Bucket': self.bucket_name, 'MaxKeys': max_keys}
+        if continuation_token:
+            params['ContinuationToken'] = continuation_token
+        response = self.client.list_objects_v2(**params)
+
+        objects = [
+            {
+                'name': item['Key'],
+                'size': item['Size'],
+                'last_modified': item['LastModified'].astimezone(timezone.utc).replace(tzinfo=None),
+            }
+            for item in response.get('Contents', [])
+        ]
+        return objects, (response.get('NextContinuationToken') if response.get('IsTruncated') else None)
+
+    def download_to_path(self, object_name: str, dest_path: str) -> None:
+        """Stream an object from R2 to a local file (ranged multipart GETs, bounded memory)."""
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.download_file(self.bucket_name, object_name, dest_path)
+        except ClientError as e:
+            logger.error(f'Failed to download file {object_name}: {e}')
+            raise
+
     def get_file_url(self, object_name: str) -> str:
         """Get the public URL for a file in R2."""
         return f'https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com/{self.bucket_name}/{object_name}'
 
 
+class AsyncStreamingUpload:
+    """Streaming upload whose blocking calls run on the storage I/O threads."""
+
+    def __init__(self, storage: 'AsyncStorageClient', upload):
+        self._storage = storage
+        self._upload = upload
+
+    async def write(self, chunk: bytes) -> None:
+        """Write a chunk (R2 parts are uploaded when the buffer fills)."""
+        await self._storage.run(self._upload.write, chunk)
+
+    async def complete(self) -> str:
+        """Finish the upload and return the file URL."""
+        return await self._storage.run(self._upload.complete)
+
+    async def abort(self) -> None:
+        """Discard everything written so far."""
+        await self._storage.run(self._upload.abort)
+
+
+class AsyncStorageClient:
+    """
+    Async interface to the storage service for async routes.
+
+    boto3 and file I/O are blocking, so each call runs on a dedicated
+    bounded thread pool and the event loop only awaits the result.
+    """
+
+    def __init__(self, storage, max_workers: int = STORAGE_IO_WORKERS):
+        self.storage = storage
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='storage-io')
+
+    async def run(self, func, *args):
+        """Run a blocking storage call on the storage I/O threads."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def start_streaming_upload(self, object_name: str) -> AsyncStreamingUpload:
+        """Begin a streaming upload (creates the R2 multipart upload)."""
+        return AsyncStreamingUpload(self, await self.run(self.storage.start_streaming_upload, object_name))
+
+    async def delete_file(self, object_name: str) -> None:
+        """Delete a stored file."""
+        await self.run(self.storage.delete_file, object_name)
+
+
 # Global storage service instance - use local storage if R2 not configured
 if _is_r2_configured():
     logger.info('Using Cloudflare R2 storage')
@@ -117,3 +570,6 @@ if _is_r2_configured():
 else:
     logger.info('R2 not configured, using local file storage')
     r2_service = LocalStorageService()
+
+# Async interface to the same storage, for async routes
+async_storage = AsyncStorageClient(r2_service)
@@ -0,0 +1,91 @@
+"""
+Character n-grams for transcript search.
+
+Each completed job stores the distinct character unigrams, bigrams and
+trigrams of its lowercased transcript and filename as an integer array
+(search_grams), with a GIN index. A query matches the jobs whose array
+contains all of its longest grams (`search_grams @> query_grams`): its
+trigrams, or its bigram or unigram when it is shorter, so queries of one or
+two characters, the usual length of a Japanese word, are served by the index
+as well. Trigrams keep phrases of common words selective (each of their
+bigrams is in most transcripts). Grams do not record positions, so
+containment is only a prefilter: matches are confirmed against the text.
+
+A gram is encoded in 32 bits, stored as a signed int4: a unigram is its code
+point, a bigram is (first << 16) | second, and a trigram is the CRC-32 of
+its UTF-16 code units. Characters outside the Basic Multilingual Plane share
+the code point U+FFFF; that and CRC-32 collisions can only add candidates
+that the confirmation step then drops.
+"""
+
+import zlib
+from typing import Iterable, List, Optional, Set
+
+# Characters beyond the BMP are folded onto this code point
+MAX_CODE_POINT = 0xFFFF
+
+
+def _code_points(text: str) -> List[int]:
+    return [min(ord(char), MAX_CODE_POINT) for char in text.lower()]
+
+
+def _to_int4(value: int) -> int:
+    return value - (1 << 32) if value >= (1 << 31) else value
+
+
+def _bigrams(codes: List[int]) -> Set[int]:
+    return {_to_int4((first << 16) | second) for first, second in zip(codes, codes[1:])}
+
+
+def _trigrams(codes: List[int]) -> Set[int]:
+    units = ''.join(map(chr, codes)).encode('utf-16-le')
+    return {_to_int4(zlib.crc32(units[index:index + 6])) for index in range(0, len(units) - 4, 2)}
+
+
+def _grams(text: str) -> Set[int]:
+    codes = _code_points(text)
+    return set(codes) | _bigrams(codes) | _trigrams(codes)
+
+
+def build_search_grams(*texts: Optional[str]) -> List[int]:
+    """
+    Distinct unigrams, bigrams and trigrams of the given texts (transcript, filename).
+
+    Returns:
+        Sorted gram codes for the search_grams column
+    """
+    grams: Set[int] = set()
+    for text in texts:
+        if text:
+            grams.update(_grams(text))
+    return sorted(grams)
+
+
+def query_grams(query: str) -> List[int]:
+    """
+    Grams every match of `query` must contain: its trigrams, or its bigram
+    or unigram for two characters or one.
+    """
+    codes = _code_points(query)
+    if len(codes) == 1:
+        return codes
+    if len(codes) == 2:
+        return sorted(_bigrams(codes))
+    return sorted(_trigrams(codes))
+
+
+def is_caseless(query: str) -> bool:
+    """
+    Whether `query` has no cased characters (e.g. Japanese), so it matches
+    the same text with or without case folding and the text need not be
+    lowercased.
+    """
+    return query.lower() == query.upper()
+
+
+def contains_query(texts: Iterable[Optional[str]], query: str) -> bool:
+    """Whether any of the texts contains `query`, case-insensitively."""
+    if is_caseless(query):
+        return any(text and query in text for text in texts)
+    lowered = query.lower()
+    return any(text and lowered in text.lower() for text in texts)
@@ -0,0 +1,227 @@
+"""
+Storage reconciliation.
+
+Finds stored objects that no job or active upload session references
+(orphans, e.g. left by a failed delete or an upload whose job was never
+created) and deletes them in bulk, and flags jobs whose stored object is
+missing (file_missing_at).
+
+A run has two phases, each processed one page at a time with its progress
+committed after every page, so it handles millions of keys in bounded
+memory and resumes where it stopped:
+
+1. objects: page through the bucket (list_objects_v2 continuation tokens),
+   record each key in storage_inventory, look the page up against the jobs
+   in one set-based query and delete unreferenced keys older than the grace
+   period.
+2. rows: page through the jobs by id and flag those whose object name was
+   not seen in the inventory.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.database import engine
+from src.models import (
+    StorageInventoryEntry,
+    StorageReconcileRun,
+    TranscriptionJob,
+    UploadSession,
+    UploadSessionStatus
+)
+from src.services.job_deletion_service import job_deletion_service
+from src.services.job_partitions import ARCHIVE_PREFIX
+from src.services.r2_service import r2_service
+
+logger = logging.getLogger(__name__)
+
+# Keys listed, and jobs checked, per page
+RECONCILE_PAGE_SIZE = 1000
+
+# pg_advisory_lock key held while a sweep runs, so only one process sweeps
+RECONCILE_LOCK_KEY = 7305021
+
+# Run phases
+PHASE_OBJECTS = 'objects'
+PHASE_ROWS = 'rows'
+PHASE_COMPLETED = 'completed'
+
+# Object name of a job, as indexed by ix_transcription_jobs_object_name
+JOB_OBJECT_NAME = func.regexp_replace(TranscriptionJob.file_url, '^.*/', '')
+
+
+class StorageReconciler:
+    """Resumable sweep that reconciles stored objects with job rows."""
+
+    @staticmethod
+    def current_run(db: Session, dry_run: bool = False) -> StorageReconcileRun:
+        """Return the unfinished run with the same mode, or start a new one."""
+        run = db.query(StorageReconcileRun).filter(
+            StorageReconcileRun.phase != PHASE_COMPLETED,
+            StorageReconcileRun.dry_run == dry_run,
+        ).order_by(StorageReconcileRun.id.desc()).first()
+        if run:
+            logger.info(f'Resuming storage reconciliation run {run.id} (phase {run.phase})')
+            return run
+
+        run = StorageReconcileRun(
+            phase=PHASE_OBJECTS, dry_run=dry_run, objects_scanned=0, orphans_found=0,
+            orphans_deleted=0, rows_checked=0, missing_rows=0,
+        )
+        db.add(run)
+        db.commit()
+        logger.info(f'Started storage reconciliation run {run.id} (dry_run={dry_run})')
+        return run
+
+    @staticmethod
+    def _referenced_names(db: Session, names: list) -> set:
+        """Subset of object names referenced by a job or an active upload session."""
+        referenced = set(db.execute(
+            select(JOB_OBJECT_NAME).where(JOB_OBJECT_NAME.in_(names)).distinct()
+        ).scalars().all())
+        referenced.update(db.execute(
+            select(UploadSession.object_name).where(
+                UploadSession.object_name.in_(names),
+                UploadSession.status == UploadSessionStatus.ACTIVE,
+            )
+        ).scalars().all())
+        return referenced
+
+    @staticmethod
+    def _objects_step(db: Session, run: StorageReconcileRun) -> None:
+        """List one page of objects, record it and delete its orphans."""
+        objects, next_token = r2_service.list_objects(run.continuation_token, RECONCILE_PAGE_SIZE)
+        # Partition archives are not referenced by any job but must be kept
+        objects = [obj for obj in objects if not obj['name'].startswith(ARCHIVE_PREFIX)]
+        names = [obj['name'] for obj in objects]
+
+        if names:
+            db.execute(
+                insert(StorageInventoryEntry).values(
+                    [{'run_id': run.id, 'object_name': name} for name in names]
+                ).on_conflict_do_nothing()
+            )
+
+            # Objects this young may belong to an upload whose job is not committed yet
+            cutoff = datetime.utcnow() - timedelta(hours=settings.STORAGE_RECONCILE_GRACE_HOURS)
+            referenced = StorageReconciler._referenced_names(db, names)
+            orphans = [
+                obj['name'] for obj in objects if obj['name'] not in referenced and obj['last_modified'] < cutoff
+            ]
+
+            run.objects_scanned += len(names)
+            run.orphans_found += len(orphans)
+            if orphans and not run.dry_run:
+                failed = r2_service.delete_files(orphans)
+                job_deletion_service.queue_retries(db, failed)
+                run.orphans_deleted += len(orphans) - len(failed)
+            if orphans:
+                logger.info(f'Run {run.id}: {len(orphans)} orphaned objects in a page of {len(names)}')
+
+        run.continuation_token = next_token
+        if next_token is None:
+            run.phase = PHASE_ROWS
+        db.commit()
+
+    @staticmethod
+    def _rows_step(db: Session, run: StorageReconcileRun) -> None:
+        """Check one page of jobs against the inventory and flag missing objects."""
+        query = select(TranscriptionJob.id, JOB_OBJECT_NAME.label('object_name')).where(
+            TranscriptionJob.file_url != '',
+            # Jobs created after the listing started may point at objects it never saw
+            TranscriptionJob.created_at < run.started_at,
+        ).order_by(TranscriptionJob.id).limit(RECONCILE_PAGE_SIZE)
+        if run.row_cursor is not None:
+            query = query.where(TranscriptionJob.id > run.row_cursor)
+        jobs = db.execute(query).all()
+
+        if jobs:
+            present = set(db.execute(
+                select(StorageInventoryEntry.object_name).where(
+                    StorageInventoryEntry.run_id == run.id,
+                    StorageInventoryEntry.object_name.in_(list({job.object_name for job in jobs})),
+                )
+            ).scalars().all())
+            missing_ids = [job.id for job in jobs if job.object_name not in present]
+            present_ids = [job.id for job in jobs if job.object_name in present]
+
+            if missing_ids:
+                db.execute(
+                    update(TranscriptionJob).where(
+                        TranscriptionJob.id.in_(missing_ids), TranscriptionJob.file_missing_at.is_(None)
+                    ).values(file_missing_at=datetime.utcnow())
+                )
+                logger.warning(f'Run {run.id}: {len(missing_ids)} jobs reference missing objects')
+            db.execute(
+                update(TranscriptionJob).where(
+                    TranscriptionJob.id.in_(present_ids), TranscriptionJob.file_missing_at.isnot(None)
+                ).values(file_missing_at=None)
+            )
+            run.rows_checked += len(jobs)
+            run.missing_rows += len(missing_ids)
+            run.row_cursor = jobs[-1].id
+
+        if len(jobs) < RECONCILE_PAGE_SIZE:
+            db.execute(delete(StorageInventoryEntry).where(StorageInventoryEntry.run_id == run.id))
+            run.phase = PHASE_COMPLETED
+            run.finished_at = datetime.utcnow()
+        db.commit()
+
+    @staticmethod
+    def step(db: Session, run: StorageReconcileRun) -> bool:
+        """
+        Process one page of the run.
+
+        Returns:
+            True once the run has completed
+        """
+        if run.phase == PHASE_OBJECTS:
+            StorageReconciler._objects_step(db, run)
+        elif run.phase == PHASE_ROWS:
+            StorageReconciler._rows_step(db, run)
+        return run.phase == PHASE_COMPLETED
+
+    @staticmethod
+    def run(
+        db: Session, dry_run: bool = False, max_pages: Optional[int] = None
+    ) -> Optional[StorageReconcileRun]:
+        """
+        Run (or resume) a sweep until it completes or `max_pages` pages are done.
+
+        Completed non-dry runs also retry the storage deletion retry list.
+
+        Returns:
+            The run, or None if another process holds the sweep lock
+        """
+        with engine.connect() as lock_connection:
+            if not lock_connection.execute(select(func.pg_try_advisory_lock(RECONCILE_LOCK_KEY))).scalar():
+                logger.info('Storage reconciliation is already running elsewhere, skipping')
+                return None
+            try:
+                run = StorageReconciler.current_run(db, dry_run)
+                pages = 0
+                while not StorageReconciler.step(db, run):
+                    pages += 1
+                    if max_pages is not None and pages >= max_pages:
+                        logger.info(f'Run {run.id} paused after {pages} pages (phase {run.phase})')
+                        return run
+
+                logger.info(
+                    f'Run {run.id} completed: {run.objects_scanned} objects, {run.orphans_found} orphans '
+                    f'({run.orphans_deleted} deleted), {run.rows_checked} jobs, {run.missing_rows} missing objects'
+                )
+                if not dry_run:
+                    job_deletion_service.retry_failed_deletions(db)
+                return run
+            finally:
+                lock_connection.execute(select(func.pg_advisory_unlock(RECONCILE_LOCK_KEY)))
+
+
+# Global reconciler instance
+storage_reconciler = StorageReconciler()
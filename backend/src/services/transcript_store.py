@@ -0,0 +1,140 @@
+"""
+Transcript storage policy.
+
+Transcripts up to TRANSCRIPT_OFFLOAD_THRESHOLD bytes (UTF-8) are stored
+inline in transcription_jobs.transcription_text. Larger ones are
+zstd-compressed into transcription_blobs and the job keeps only a pointer
+(transcript_storage) and its preview, so status polls, history scans,
+vacuum and backups of the hot table never carry them. Offloaded text is
+decompressed only when the full transcript is requested (hydrate).
+
+Offloaded transcripts are stored once: search finds them through the job's
+search_grams and decompresses only the blobs of a result page.
+"""
+
+import logging
+from typing import Iterable, List, Optional
+
+import zstandard
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.config import settings
+from src.models import TranscriptionBlob, TranscriptionJob
+from src.services.search_grams import build_search_grams
+
+logger = logging.getLogger(__name__)
+
+# transcript_storage value for transcripts kept in transcription_blobs
+STORAGE_BLOB = 'blob'
+
+# Codec recorded on each blob
+CODEC_ZSTD = 'zstd'
+
+# Characters of the transcript stored as preview_text
+PREVIEW_LENGTH = 100
+
+
+def build_preview(text: Optional[str]) -> Optional[str]:
+    """Preview stored alongside a transcript (its first PREVIEW_LENGTH characters)."""
+    return text[:PREVIEW_LENGTH] if text else None
+
+
+def compress_transcript(text: str) -> bytes:
+    """Compress a transcript with zstd (the frame records the content size)."""
+    return zstandard.ZstdCompressor(level=settings.TRANSCRIPT_ZSTD_LEVEL).compress(text.encode('utf-8'))
+
+
+def decompress_transcript(data: bytes) -> str:
+    """Decompress a transcript produced by compress_transcript."""
+    return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+
+
+class TranscriptStore:
+    """Stores transcripts inline or compressed, and loads them back on demand."""
+
+    @staticmethod
+    def offload_size(text: Optional[str]) -> Optional[int]:
+        """UTF-8 size of a transcript that should be offloaded, or None to keep it inline."""
+        if not text or len(text) * 4 <= settings.TRANSCRIPT_OFFLOAD_THRESHOLD:
+            return None  # cannot exceed the threshold even at 4 bytes per character
+        size = len(text.encode('utf-8'))
+        return size if size > settings.TRANSCRIPT_OFFLOAD_THRESHOLD else None
+
+    @staticmethod
+    def assign(job: TranscriptionJob, text: Optional[str]) -> None:
+        """
+        Set a job's transcript, preview and search grams according to the
+        storage policy.
+
+        The blob (if any) is attached to the job, so it is written in the
+        same flush as the job and any previous blob is replaced.
+        """
+        job.preview_text = build_preview(text)
+        job.search_grams = build_search_grams(text, job.original_filename)
+        size = TranscriptStore.offload_size(text)
+        if size is None:
+            if job.transcript_storage == STORAGE_BLOB:
+                job.blob = None
+            job.transcription_text = text
+            job.transcript_storage = None
+            return
+
+        job.blob = TranscriptionBlob(
+            codec=CODEC_ZSTD,
+            data=compress_transcript(text),
+            original_size=size,
+        )
+        job.transcription_text = None
+        job.transcript_storage = STORAGE_BLOB
+        logger.info(f'Offloaded transcript of job {job.id} ({size} bytes) to transcription_blobs')
+
+    @staticmethod
+    def offload_row(row: dict) -> Optional[dict]:
+        """
+        Apply the storage policy to column values for a bulk insert.
+
+        Returns:
+            Values for the transcription_blobs row to insert with it, or None
+            when the transcript stays inline
+        """
+        text = row.get('transcription_text')
+        size = TranscriptStore.offload_size(text)
+        if size is None:
+            return None
+
+        row['transcription_text'] = None
+        row['transcript_storage'] = STORAGE_BLOB
+        return {
+            'job_id': row['id'],
+            'job_created_at': row['created_at'],
+            'codec': CODEC_ZSTD,
+            'data': compress_transcript(text),
+            'original_size': size,
+        }
+
+    @staticmethod
+    def hydrate(db: Session, jobs: Iterable[TranscriptionJob]) -> List[TranscriptionJob]:
+        """
+        Load offloaded transcripts into `transcription_text` of the given jobs.
+
+        The attribute is populated without marking the job dirty, so the
+        decompressed text is never written back inline. Jobs must have
+        transcript_storage loaded.
+
+        Returns:
+            The jobs, for chaining
+        """
+        jobs = list(jobs)
+        offloaded = {job.id: job for job in jobs if job.transcript_storage == STORAGE_BLOB}
+        if offloaded:
+            blobs = db.query(TranscriptionBlob.job_id, TranscriptionBlob.data).filter(
+                TranscriptionBlob.job_id.in_(list(offloaded))
+            ).all()
+            for job_id, data in blobs:
+                set_committed_value(offloaded[job_id], 'transcription_text', decompress_transcript(data))
+        return jobs
+
+
+# Global store instance
+transcript_store = TranscriptStore()
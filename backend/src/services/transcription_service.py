@@ -1,16 +1,27 @@
 """
 Transcription service for handling file upload and job creation.
+
+The upload path is fully async: the database is reached through the
+asyncpg session and storage through async_storage, so a slow commit or
+upload never stalls the event loop.
 """
 
+import hashlib
 import logging
 import uuid
-from io import BytesIO
-from typing import Tuple
+from datetime import datetime
+from typing import Optional, Tuple
 from fastapi import UploadFile, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from starlette.concurrency import run_in_threadpool
 
-from src.models import TranscriptionJob, TranscriptionStatus
-from src.services.r2_service import r2_service
+from src.models import TranscriptionJob, TranscriptionStatus, new_job_id
+from src.services.transcript_store import transcript_store
+from src.services.job_cache import job_cache
+from src.services.metrics import DB_COMMIT_SECONDS, STORAGE_UPLOAD_SECONDS
+from src.services.r2_service import async_storage
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +39,29 @@ ALLOWED_MIME_TYPES = {
 }
 MAX_FILE_SIZE = 2 * 1024 * 1024 * 1024  # 2GB in bytes
 
+# Bytes read from the incoming upload per iteration while streaming to storage
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def file_type_error(error_msg: str) -> HTTPException:
+    """Build the 400 error returned when a file's type is not supported."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={'error': error_msg, 'type': 'fileType', 'retryable': False}
+    )
+
+
+def file_too_large_error() -> HTTPException:
+    """Build the 400 error returned when an upload exceeds MAX_FILE_SIZE."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={
+            'error': f'File size exceeds maximum allowed size of {MAX_FILE_SIZE / (1024**3):.1f}GB',
+            'type': 'fileSize',
+            'retryable': False
+        }
+    )
+
 
 class TranscriptionService:
     """Service for handling transcription job operations."""
@@ -40,40 +74,156 @@ class TranscriptionService:
         Args:
             file: Uploaded file from FastAPI
 
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        return TranscriptionService.validate_file_metadata(file.filename, file.content_type)
+
+    @staticmethod
+    def validate_file_metadata(filename: Optional[str], content_type: Optional[str]) -> Tuple[bool, str]:
+        """
+        Validate a file's name and MIME type before any bytes are stored.
+
+        Args:
+            filename: Original file name
+            content_type: MIME type declared by the client
+
         Returns:
             Tuple of (is_valid, error_message)
         """
         # Check file extension
-        filename = file.filename or ''
+        filename = filename or ''
         file_ext = '.' + filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
 
         if file_ext not in ALLOWED_EXTENSIONS:
             return False, f'File type not supported. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'
 
         # Check MIME type
-        content_type = file.content_type or ''
+        content_type = content_type or ''
         if content_type not in ALLOWED_MIME_TYPES:
             return False, f'MIME type not supported. Allowed types: {", ".join(ALLOWED_MIME_TYPES)}'
 
         return True, ''
 
+    @staticmethod
+    async def stream_to_storage(file: UploadFile, object_name: str) -> Tuple[str, int, str]:
+        """
+        Stream an uploaded file into storage in bounded chunks.
+
+        The size limit is enforced as bytes arrive, so an oversized upload is
+        rejected without ever holding more than one chunk (plus one multipart
+        part for R2) in memory. The SHA-256 digest is computed on the way.
+
+        Args:
+            file: Uploaded file from FastAPI
+            object_name: Destination object name in storage
+
+        Returns:
+            Tuple of (file_url, file_size, content_hash)
+
+        Raises:
+            HTTPException: If the file exceeds MAX_FILE_SIZE
+        """
+        with STORAGE_UPLOAD_SECONDS.labels('stream').time():
+            upload = await async_storage.start_streaming_upload(object_name)
+            digest = hashlib.sha256()
+            file_size = 0
+            try:
+                while True:
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    file_size += len(chunk)
+                    if file_size > MAX_FILE_SIZE:
+                        logger.warning(f'File too large: more than {MAX_FILE_SIZE} bytes received')
+                        raise file_too_large_error()
+                    digest.update(chunk)
+                    await upload.write(chunk)
+                file_url = await upload.complete()
+            except BaseException:
+                await upload.abort()
+                raise
+
+        return file_url, file_size, digest.hexdigest()
+
+    @staticmethod
+    async def find_reusable_job(db: AsyncSession, content_hash: str, language: str) -> Optional[TranscriptionJob]:
+        """
+        Find a completed job for the same media and language.
+
+        Args:
+            db: Async database session
+            content_hash: SHA-256 hex digest of the media
+            language: Transcription language
+
+        Returns:
+            The oldest matching COMPLETED job, or None
+        """
+        result = await db.execute(
+            select(TranscriptionJob).where(
+                TranscriptionJob.content_hash == content_hash,
+                TranscriptionJob.language == language,
+                TranscriptionJob.status == TranscriptionStatus.COMPLETED,
+            ).order_by(
+                TranscriptionJob.created_at
+            ).limit(1)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    def get_deduplication_stats(db: Session) -> dict:
+        """
+        Compute deduplication hit rate and transcription time saved.
+
+        Time saved for each hit is the processing time (created_at to
+        completed_at) of the job whose result was reused.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Dict with total_uploads, deduplicated_uploads, hit_rate, time_saved_seconds
+        """
+        total_uploads = db.query(func.count(TranscriptionJob.id)).filter(
+            TranscriptionJob.content_hash.isnot(None)
+        ).scalar() or 0
+
+        source = aliased(TranscriptionJob)
+        deduplicated_uploads, time_saved = db.query(
+            func.count(TranscriptionJob.id),
+            func.sum(func.extract('epoch', source.completed_at - source.created_at)),
+        ).outerjoin(
+            source, source.id == TranscriptionJob.deduplicated_from
+        ).filter(
+            TranscriptionJob.deduplicated_from.isnot(None)
+        ).one()
+
+        return {
+            'total_uploads': total_uploads,
+            'deduplicated_uploads': deduplicated_uploads or 0,
+            'hit_rate': round((deduplicated_uploads or 0) / total_uploads, 4) if total_uploads else 0.0,
+            'time_saved_seconds': float(time_saved or 0),
+        }
+
     @staticmethod
     async def create_transcription_job(
         file: UploadFile,
-        db: Session
+        db: AsyncSession
     ) -> TranscriptionJob:
         """
         Create a new transcription job.
 
         Process flow:
         1. Validate file (type and size)
-        2. Upload file to R2
-        3. Create database record
-        4. Return job record (Celery task will be triggered from the router)
+        2. Stream file to R2 while enforcing the size limit and hashing it
+        3. If a completed job has the same hash and language, reuse its object
+           and transcript (the job is created COMPLETED)
+        4. Otherwise create a PROCESSING database record
+        5. Return job record (PROCESSING rows are picked up by the queue workers)
 
         Args:
             file: Uploaded file from FastAPI
-            db: Database session
+            db: Async database session
 
         Returns:
             Created TranscriptionJob instance
@@ -85,39 +235,29 @@ class TranscriptionService:
         is_valid, error_msg = TranscriptionService.validate_file(file)
         if not is_valid:
             logger.warning(f'File validation failed: {error_msg}')
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={'error': error_msg, 'type': 'fileType', 'retryable': False}
-            )
+            raise file_type_error(error_msg)
 
-        # Read file content and check size
         try:
-            file_content = await file.read()
-            file_size = len(file_content)
-
-            if file_size > MAX_FILE_SIZE:
-                logger.warning(f'File too large: {file_size} bytes (max: {MAX_FILE_SIZE})')
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={
-                        'error': f'File size exceeds maximum allowed size of {MAX_FILE_SIZE / (1024**3):.1f}GB',
-                        'type': 'fileSize',
-                        'retryable': False
-                    }
-                )
+            # Reject early when the client declared an oversized body
+            if file.size is not None and file.size > MAX_FILE_SIZE:
+                logger.warning(f'File too large: {file.size} bytes (max: {MAX_FILE_SIZE})')
+                raise file_too_large_error()
 
             # Generate unique object name
-            job_id = uuid.uuid4()
+            job_id = new_job_id()
             file_ext = '.' + (file.filename or '').rsplit('.', 1)[-1].lower()
             object_name = f'{job_id}{file_ext}'
 
-            # Upload to R2
-            logger.info(f'Uploading file to R2: {object_name} ({file_size} bytes)')
-            file_obj = BytesIO(file_content)
-            file_url = r2_service.upload_file(
-                file_obj=file_obj,
-                object_name=object_name
-            )
+            # Stream to R2
+            logger.info(f'Streaming file to R2: {object_name}')
+            file_url, file_size, content_hash = await TranscriptionService.stream_to_storage(file, object_name)
+            logger.info(f'Stored {object_name} ({file_size} bytes, sha256={content_hash})')
+
+            reusable = await TranscriptionService.find_reusable_job(db, content_hash, 'ja')
+            if reusable:
+                return await TranscriptionService._create_deduplicated_job(
+                    db, job_id, file.filename or 'unknown', file_size, content_hash, object_name, reusable
+                )
 
             # Create database record
             job = TranscriptionJob(
@@ -127,11 +267,14 @@ class TranscriptionService:
                 file_size=file_size,
                 status=TranscriptionStatus.PROCESSING,
                 language='ja',
+                content_hash=content_hash,
             )
 
             db.add(job)
-            db.commit()
-            db.refresh(job)
+            with DB_COMMIT_SECONDS.labels('create_job').time():
+                await db.commit()
+            await db.refresh(job)
+            await run_in_threadpool(job_cache.store_job, job)
 
             logger.info(f'Created transcription job: {job.id}')
             return job
@@ -141,12 +284,59 @@ class TranscriptionService:
             raise
         except Exception as e:
             logger.error(f'Failed to create transcription job: {e}')
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail={'error': 'Failed to process file upload', 'type': 'server', 'retryable': True}
             )
 
+    @staticmethod
+    async def _create_deduplicated_job(
+        db: AsyncSession,
+        job_id: uuid.UUID,
+        original_filename: str,
+        file_size: int,
+        content_hash: str,
+        object_name: str,
+        reusable: TranscriptionJob,
+    ) -> TranscriptionJob:
+        """Create a COMPLETED job that shares the stored object and transcript of `reusable`."""
+        now = datetime.utcnow()
+        job = TranscriptionJob(
+            id=job_id,
+            original_filename=original_filename,
+            file_url=reusable.file_url,
+            file_size=file_size,
+            duration=reusable.duration,
+            language=reusable.language,
+            status=TranscriptionStatus.COMPLETED,
+            content_hash=content_hash,
+            deduplicated_from=reusable.id,
+            completed_at=now,
+        )
+
+        await db.run_sync(lambda session: transcript_store.hydrate(session, [reusable]))
+        transcript_store.assign(job, reusable.transcription_text)
+
+        db.add(job)
+        with DB_COMMIT_SECONDS.labels('create_job').time():
+            await db.commit()
+        await db.refresh(job)
+        await run_in_threadpool(job_cache.store_job, job)
+
+        # The freshly uploaded copy is redundant once the job points at the existing object
+        try:
+            await async_storage.delete_file(object_name)
+        except Exception as e:
+            logger.warning(f'Failed to delete duplicate upload {object_name}: {e}')
+
+        saved = (reusable.completed_at - reusable.created_at).total_seconds() if reusable.completed_at else 0.0
+        logger.info(
+            f'Deduplicated upload {job.id} -> {reusable.id} '
+            f'(sha256={content_hash}, saved ~{saved:.1f}s of transcription)'
+        )
+        return job
+
 
 # Global service instance
 transcription_service = TranscriptionService()
@@ -0,0 +1,467 @@
+"""
+Upload session service.
+
+Chunked sessions: a session is created with the declared file metadata,
+chunks are PUT independently (in any order, retries allowed) and the session
+is committed into a TranscriptionJob once every chunk has arrived.
+
+Presigned sessions: the client PUTs the whole file straight to storage with
+a presigned URL and the session is finalized after a HEAD check, so media
+bytes never pass through the API process.
+"""
+
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import List, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from src.models import (
+    TranscriptionJob,
+    TranscriptionStatus,
+    UploadSession,
+    UploadSessionKind,
+    UploadSessionStatus,
+    new_job_id,
+)
+from src.schemas import PresignedUploadResponse, UploadSessionCreate, UploadSessionResponse
+from src.services.job_cache import job_cache
+from src.services.job_partitions import job_id_filter
+from src.services.metrics import DB_COMMIT_SECONDS, STORAGE_UPLOAD_SECONDS
+from src.services.r2_service import r2_service, MULTIPART_PART_SIZE
+from src.services.transcription_service import (
+    MAX_FILE_SIZE,
+    TranscriptionService,
+    file_too_large_error,
+    file_type_error,
+)
+
+logger = logging.getLogger(__name__)
+
+# Every chunk except the last must be exactly this size (R2 multipart minimum is 5MB)
+UPLOAD_SESSION_CHUNK_SIZE = MULTIPART_PART_SIZE
+
+# Lifetime of presigned upload URLs
+PRESIGNED_UPLOAD_EXPIRES = 60 * 60  # 1 hour in seconds
+
+
+class UploadSessionService:
+    """Service for resumable chunked uploads."""
+
+    @staticmethod
+    def expected_chunk_size(session: UploadSession, chunk_number: int) -> int:
+        """Return the exact byte size chunk_number must have."""
+        if chunk_number < session.total_chunks:
+            return session.chunk_size
+        return session.file_size - session.chunk_size * (session.total_chunks - 1)
+
+    @staticmethod
+    def _validate_declared_file(data: UploadSessionCreate) -> None:
+        """Reject unsupported types and oversized files before any bytes are sent."""
+        is_valid, error_msg = TranscriptionService.validate_file_metadata(data.filename, data.content_type)
+        if not is_valid:
+            logger.warning(f'Upload session validation failed: {error_msg}')
+            raise file_type_error(error_msg)
+
+        if data.file_size > MAX_FILE_SIZE:
+            logger.warning(f'Upload session too large: {data.file_size} bytes (max: {MAX_FILE_SIZE})')
+            raise file_too_large_error()
+
+    @staticmethod
+    def create_session(data: UploadSessionCreate, db: Session) -> UploadSession:
+        """
+        Validate the declared file and open a storage-level chunked upload.
+
+        Args:
+            data: Declared filename, content type and total size
+            db: Database session
+
+        Returns:
+            Created UploadSession instance
+
+        Raises:
+            HTTPException: 400 if validation fails, 500 if storage fails
+        """
+        UploadSessionService._validate_declared_file(data)
+
+        session_id = new_job_id()  # becomes the job ID
+        file_ext = '.' + data.filename.rsplit('.', 1)[-1].lower()
+        object_name = f'{session_id}{file_ext}'
+
+        try:
+            storage_upload_id = r2_service.create_chunked_upload(object_name)
+
+            session = UploadSession(
+                id=session_id,
+                original_filename=data.filename,
+                content_type=data.content_type,
+                file_size=data.file_size,
+                chunk_size=UPLOAD_SESSION_CHUNK_SIZE,
+                total_chunks=math.ceil(data.file_size / UPLOAD_SESSION_CHUNK_SIZE),
+                object_name=object_name,
+                storage_upload_id=storage_upload_id,
+                status=UploadSessionStatus.ACTIVE,
+            )
+            db.add(session)
+            db.commit()
+            db.refresh(session)
+        except Exception as e:
+            logger.error(f'Failed to create upload session: {e}')
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={'error': 'Failed to start upload', 'type': 'server', 'retryable': True}
+            )
+
+        logger.info(f'Created upload session {session.id} ({session.total_chunks} chunks)')
+        return session
+
+    @staticmethod
+    def get_session(upload_id: UUID, db: Session, for_update: bool = False) -> UploadSession:
+        """
+        Fetch an upload session.
+
+        Args:
+            upload_id: Session ID
+            db: Database session
+            for_update: Lock the row until the transaction ends, so concurrent
+                state changes (commit, finalize, abort) run one at a time
+
+        Raises:
+            HTTPException: 404 if the session does not exist
+        """
+        query = db.query(UploadSession).filter(UploadSession.id == upload_id)
+        if for_update:
+            query = query.with_for_update()
+        session = query.first()
+        if not session:
+            logger.warning(f'Upload session not found: {upload_id}')
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='Upload session not found'
+            )
+        return session
+
+    @staticmethod
+    def get_active_session(
+        upload_id: UUID,
+        db: Session,
+        kind: UploadSessionKind = UploadSessionKind.CHUNKED,
+    ) -> UploadSession:
+        """
+        Fetch an upload session of the given kind that is still open.
+
+        Raises:
+            HTTPException: 404 if not found, 409 if already committed or aborted
+        """
+        session = UploadSessionService.get_session(upload_id, db)
+        if session.kind != kind:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f'Upload session is not a {kind.value} upload'
+            )
+        if session.status != UploadSessionStatus.ACTIVE:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f'Upload session is {session.status.value}'
+            )
+        return session
+
+    @staticmethod
+    def received_chunks(session: UploadSession) -> List[int]:
+        """Return the chunk numbers stored with the expected size."""
+        if session.status != UploadSessionStatus.ACTIVE or session.kind != UploadSessionKind.CHUNKED:
+            return []
+        uploaded = r2_service.list_uploaded_chunks(session.object_name, session.storage_upload_id)
+        return sorted(
+            number for number, size in uploaded.items()
+            if 1 <= number <= session.total_chunks
+            and size == UploadSessionService.expected_chunk_size(session, number)
+        )
+
+    @staticmethod
+    def to_response(session: UploadSession) -> UploadSessionResponse:
+        """Build the session response including the chunks received so far."""
+        return UploadSessionResponse(
+            id=session.id,
+            original_filename=session.original_filename,
+            file_size=session.file_size,
+            chunk_size=session.chunk_size,
+            total_chunks=session.total_chunks,
+            received_chunks=UploadSessionService.received_chunks(session),
+            status=session.status.value,
+            created_at=session.created_at,
+        )
+
+    @staticmethod
+    def upload_chunk(upload_id: UUID, chunk_number: int, body: bytes, db: Session) -> None:
+        """
+        Store one chunk. Uploading the same chunk again replaces it.
+
+        Raises:
+            HTTPException: 400 if the chunk number or size is wrong
+        """
+        session = UploadSessionService.get_active_session(upload_id, db)
+
+        if not 1 <= chunk_number <= session.total_chunks:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f'Chunk number must be between 1 and {session.total_chunks}'
+            )
+
+        expected_size = UploadSessionService.expected_chunk_size(session, chunk_number)
+        if len(body) != expected_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f'Chunk {chunk_number} must be {expected_size} bytes, got {len(body)}'
+            )
+
+        try:
+            with STORAGE_UPLOAD_SECONDS.labels('chunk').time():
+                r2_service.upload_chunk(session.object_name, session.storage_upload_id, chunk_number, body)
+        except Exception as e:
+            logger.error(f'Failed to store chunk {chunk_number} of upload {upload_id}: {e}')
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={'error': 'Failed to store chunk', 'type': 'server', 'retryable': True}
+            )
+
+    @staticmethod
+    def commit_session(upload_id: UUID, db: Session) -> Tuple[TranscriptionJob, bool]:
+        """
+        Assemble the uploaded chunks and create the transcription job.
+
+        Committing an already committed session returns the existing job, so
+        clients can safely retry a commit whose response was lost. The
+        session row is locked first, so a concurrent commit waits and then
+        returns the job created by the first one.
+
+        Chunks are stored without passing through a single hash, so the job
+        has no content_hash and is not deduplicated.
+
+        Returns:
+            Tuple of (job, created) where created is False on a repeated commit
+
+        Raises:
+            HTTPException: 409 if chunks are missing or the session was aborted
+        """
+        session = UploadSessionService.get_session(upload_id, db, for_update=True)
+        job = UploadSessionService._existing_job(session, db)
+        if job:
+            return job, False
+
+        session = UploadSessionService.get_active_session(upload_id, db)
+
+        received = UploadSessionService.received_chunks(session)
+        missing = sorted(set(range(1, session.total_chunks + 1)) - set(received))
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    'error': f'{len(missing)} chunks have not been uploaded',
+                    'type': 'incomplete',
+                    'retryable': True,
+                    'missing_chunks': missing,
+                }
+            )
+
+        try:
+            with STORAGE_UPLOAD_SECONDS.labels('complete').time():
+                file_url = r2_service.complete_chunked_upload(
+                    session.object_name, session.storage_upload_id, received
+                )
+            job = UploadSessionService._create_job(session, file_url, db)
+        except Exception as e:
+            logger.error(f'Failed to commit upload session {upload_id}: {e}')
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={'error': 'Failed to process file upload', 'type': 'server', 'retryable': True}
+            )
+
+        logger.info(f'Committed upload session {upload_id} as transcription job')
+        return job, True
+
+    @staticmethod
+    def _existing_job(session: UploadSession, db: Session):
+        """Return the job of an already committed session, if any."""
+        if session.status != UploadSessionStatus.COMMITTED:
+            return None
+        return db.query(TranscriptionJob).filter(job_id_filter(session.id)).first()
+
+    @staticmethod
+    def _create_job(session: UploadSession, file_url: str, db: Session) -> TranscriptionJob:
+        """Create the PROCESSING job for a completed upload and close the session."""
+        job = TranscriptionJob(
+            id=session.id,
+            original_filename=session.original_filename,
+            file_url=file_url,
+            file_size=session.file_size,
+            status=TranscriptionStatus.PROCESSING,
+            language='ja',
+        )
+        session.status = UploadSessionStatus.COMMITTED
+
+        db.add(job)
+        with DB_COMMIT_SECONDS.labels('create_job').time():
+            db.commit()
+        db.refresh(job)
+        job_cache.store_job(job)
+        return job
+
+    @staticmethod
+    def create_presigned_upload(data: UploadSessionCreate, db: Session) -> PresignedUploadResponse:
+        """
+        Create a presigned session and the URL the client PUTs the file to.
+
+        Args:
+            data: Declared filename, content type and total size
+            db: Database session
+
+        Returns:
+            PresignedUploadResponse with the upload URL and required headers
+
+        Raises:
+            HTTPException: 400 if validation fails, 500 if storage fails
+        """
+        UploadSessionService._validate_declared_file(data)
+
+        session_id = new_job_id()  # becomes the job ID
+        file_ext = '.' + data.filename.rsplit('.', 1)[-1].lower()
+        object_name = f'{session_id}{file_ext}'
+
+        try:
+            upload_url = r2_service.generate_presigned_upload_url(
+                object_name, data.content_type, PRESIGNED_UPLOAD_EXPIRES
+            )
+
+            session = UploadSession(
+                id=session_id,
+                original_filename=data.filename,
+                content_type=data.content_type,
+                file_size=data.file_size,
+                chunk_size=data.file_size,
+                total_chunks=1,
+                kind=UploadSessionKind.PRESIGNED,
+                object_name=object_name,
+                status=UploadSessionStatus.ACTIVE,
+            )
+            db.add(session)
+            db.commit()
+            db.refresh(session)
+        except Exception as e:
+            logger.error(f'Failed to create presigned upload: {e}')
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={'error': 'Failed to start upload', 'type': 'server', 'retryable': True}
+            )
+
+        logger.info(f'Created presigned upload session {session.id}')
+        return PresignedUploadResponse(
+            id=session.id,
+            upload_url=upload_url,
+            method='PUT',
+            headers={'Content-Type': data.content_type},
+            expires_at=datetime.utcnow() + timedelta(seconds=PRESIGNED_UPLOAD_EXPIRES),
+        )
+
+    @staticmethod
+    def finalize_presigned_upload(upload_id: UUID, db: Session) -> Tuple[TranscriptionJob, bool]:
+        """
+        Verify the directly uploaded object with a HEAD request and create the job.
+
+        The session row is locked first, so concurrent finalize calls create
+        one job. The object never passes through the API, so the job has no
+        content_hash and is not deduplicated.
+
+        Returns:
+            Tuple of (job, created) where created is False on a repeated finalize
+
+        Raises:
+            HTTPException: 409 if the object has not been uploaded yet
+            HTTPException: 400 if its size or type does not match the declaration
+        """
+        session = UploadSessionService.get_session(upload_id, db, for_update=True)
+        job = UploadSessionService._existing_job(session, db)
+        if job:
+            return job, False
+
+        session = UploadSessionService.get_active_session(upload_id, db, UploadSessionKind.PRESIGNED)
+
+        metadata = r2_service.head_file(session.object_name)
+        if metadata is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={'error': 'File has not been uploaded', 'type': 'incomplete', 'retryable': True}
+            )
+
+        if metadata['size'] > MAX_FILE_SIZE:
+            UploadSessionService._reject_presigned_object(session, db)
+            raise file_too_large_error()
+
+        if metadata['size'] != session.file_size:
+            UploadSessionService._reject_presigned_object(session, db)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    'error': f'Uploaded size {metadata["size"]} does not match declared size {session.file_size}',
+                    'type': 'fileSize',
+                    'retryable': False,
+                }
+            )
+
+        content_type = metadata['content_type']
+        if content_type is not None and content_type != session.content_type:
+            UploadSessionService._reject_presigned_object(session, db)
+            raise file_type_error(f'Uploaded content type {content_type} does not match {session.content_type}')
+
+        try:
+            job = UploadSessionService._create_job(
+                session, r2_service.get_file_url(session.object_name), db
+            )
+        except Exception as e:
+            logger.error(f'Failed to finalize presigned upload {upload_id}: {e}')
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={'error': 'Failed to process file upload', 'type': 'server', 'retryable': True}
+            )
+
+        logger.info(f'Finalized presigned upload {upload_id} as transcription job')
+        return job, True
+
+    @staticmethod
+    def _reject_presigned_object(session: UploadSession, db: Session) -> None:
+        """Delete an object that failed verification and abort its session."""
+        logger.warning(f'Rejecting presigned upload {session.id} ({session.object_name})')
+        try:
+            r2_service.delete_file(session.object_name)
+        except Exception as e:
+            logger.error(f'Failed to delete rejected upload {session.object_name}: {e}')
+        session.status = UploadSessionStatus.ABORTED
+        db.commit()
+
+    @staticmethod
+    def abort_session(upload_id: UUID, db: Session) -> None:
+        """Discard all uploaded data and mark the session aborted."""
+        session = UploadSessionService.get_session(upload_id, db, for_update=True)
+        session = UploadSessionService.get_active_session(upload_id, db, session.kind)
+
+        try:
+            if session.kind == UploadSessionKind.CHUNKED:
+                r2_service.abort_chunked_upload(session.object_name, session.storage_upload_id)
+            elif r2_service.head_file(session.object_name) is not None:
+                r2_service.delete_file(session.object_name)
+        except Exception as e:
+            logger.error(f'Failed to abort storage upload for session {upload_id}: {e}')
+
+        session.status = UploadSessionStatus.ABORTED
+        db.commit()
+        logger.info(f'Aborted upload session {upload_id}')
+
+
+# Global service instance
+upload_session_service = UploadSessionService()
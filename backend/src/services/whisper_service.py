@@ -0,0 +1,287 @@
+"""
+OpenAI Whisper API client.
+
+One client per process owns a keep-alive connection pool, caps concurrent
+requests and paces them with token buckets sized to the org's requests-per-
+minute and audio-minutes quotas. 429 responses are retried after the
+server's Retry-After instead of failing the job.
+
+The multipart request body is streamed from the audio file on disk, so a
+request never holds the audio in memory.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import settings
+from src.services.metrics import JOB_RETRIES_TOTAL, WHISPER_REQUEST_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# OpenAI Whisper API file size limit (25MB)
+WHISPER_MAX_FILE_SIZE = 25 * 1024 * 1024
+
+# OpenAI API settings
+OPENAI_API_URL = 'https://api.openai.com/v1/audio/transcriptions'
+
+# Block size used when streaming the request body
+REQUEST_BODY_BLOCK_SIZE = 64 * 1024
+
+
+class StreamingMultipartBody:
+    """
+    multipart/form-data body whose file part is read from disk on demand.
+
+    Exposes `read()` and `__len__` so requests sends it with a
+    Content-Length header while http.client pulls it in small blocks.
+    """
+
+    def __init__(self, fields: Dict[str, str], file_field: str, file_path: str, file_content_type: str):
+        """Prepare the form fields and the file part header and trailer."""
+        self.boundary = uuid.uuid4().hex
+        head = b''.join(
+            (
+                f'--{self.boundary}\r\n'
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                f'{value}\r\n'
+            ).encode()
+            for name, value in fields.items()
+        )
+        head += (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="{file_field}"; '
+            f'filename="{os.path.basename(file_path)}"\r\n'
+            f'Content-Type: {file_content_type}\r\n\r\n'
+        ).encode()
+        tail = f'\r\n--{self.boundary}--\r\n'.encode()
+
+        self._head = head
+        self._tail = tail
+        self._file_path = file_path
+        self._length = len(head) + os.path.getsize(file_path) + len(tail)
+        self._blocks = self._iter_blocks()
+        self._pending = b''
+
+    @property
+    def content_type(self) -> str:
+        """Content-Type header value including the boundary."""
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._blocks
+
+    def _iter_blocks(self) -> Iterator[bytes]:
+        yield self._head
+        with open(self._file_path, 'rb') as f:
+            for block in iter(lambda: f.read(REQUEST_BODY_BLOCK_SIZE), b''):
+                yield block
+        yield self._tail
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to `size` bytes of the body (all remaining if size < 0)."""
+        if size is None or size < 0:
+            data = self._pending + b''.join(self._blocks)
+            self._pending = b''
+            return data
+
+        while len(self._pending) < size:
+            block = next(self._blocks, None)
+            if block is None:
+                break
+            self._pending += block
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+class WhisperRateLimitError(Exception):
+    """Raised when 429 responses persist beyond WHISPER_RATE_LIMIT_MAX_WAIT."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f'Whisper API rate limit exceeded, retry after {retry_after:.0f}s')
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket; `acquire` blocks until enough tokens are available."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """Start full with `capacity` tokens."""
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take `tokens` (clamped to capacity), sleeping until they are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.refill_per_second
+            time.sleep(delay)
+            waited += delay
+
+
+def parse_retry_after(headers, default: float) -> float:
+    """Read Retry-After (seconds or HTTP date) or retry-after-ms from response headers."""
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return max(float(retry_after_ms) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get('Retry-After')
+    if not retry_after:
+        return default
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+class WhisperClient:
+    """Pooled, rate-limit-aware Whisper API client shared by all jobs in a process."""
+
+    def __init__(self):
+        """Create the connection pool, concurrency cap and token buckets from settings."""
+        concurrency = settings.WHISPER_MAX_CONCURRENCY
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._slots = threading.BoundedSemaphore(concurrency)
+        rpm = settings.WHISPER_REQUESTS_PER_MINUTE
+        self._request_bucket = TokenBucket(rpm, rpm / 60) if rpm > 0 else None
+        audio_minutes = settings.WHISPER_AUDIO_MINUTES_PER_MINUTE
+        self._audio_bucket = TokenBucket(audio_minutes, audio_minutes / 60) if audio_minutes > 0 else None
+
+    def _headers(self, body: StreamingMultipartBody) -> Dict[str, str]:
+        # Strip any whitespace/newlines from API key
+        api_key = settings.OPENAI_API_KEY.strip().replace('\n', '').replace('\r', '')
+        return {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': body.content_type,
+        }
+
+    def _post(self, audio_path: str, language: str) -> requests.Response:
+        body = StreamingMultipartBody(
+            fields={
+                'model': 'whisper-1',
+                'language': language,
+                'response_format': 'text',
+            },
+            file_field='file',
+            file_path=audio_path,
+            file_content_type='audio/mpeg',
+        )
+        with self._slots:
+            started = time.perf_counter()
+            status = 'error'
+            try:
+                response = self.session.post(
+                    OPENAI_API_URL,
+                    headers=self._headers(body),
+                    data=body,
+                    timeout=300,  # 5 minutes timeout
+                )
+                status = str(response.status_code)
+                return response
+            finally:
+                WHISPER_REQUEST_SECONDS.labels(status).observe(time.perf_counter() - started)
+
+    def transcribe(
+        self,
+        audio_path: str,
+        job_label: str,
+        audio_seconds: Optional[float] = None,
+        language: str = 'ja',
+    ) -> str:
+        """
+        Send one audio file to the Whisper API and return the transcript text.
+
+        Waits for rate-limit tokens before each attempt and sleeps for
+        Retry-After on 429 responses, for up to WHISPER_RATE_LIMIT_MAX_WAIT
+        seconds in total.
+
+        Args:
+            audio_path: Audio file to transcribe (must be <= WHISPER_MAX_FILE_SIZE)
+            job_label: Job (or job segment) identifier for logging
+            audio_seconds: Audio duration, charged against the audio-minutes quota
+            language: Transcription language
+
+        Raises:
+            WhisperRateLimitError: If still rate limited after the maximum wait
+            requests.exceptions.RequestException: If the API call fails otherwise
+        """
+        logger.info(
+            f'Calling Whisper API for job {job_label}, file: {audio_path}, '
+            f'size: {os.path.getsize(audio_path)} bytes'
+        )
+
+        rate_limited_for = 0.0
+        attempt = 0
+        while True:
+            throttled = 0.0
+            if self._request_bucket is not None:
+                throttled += self._request_bucket.acquire()
+            if self._audio_bucket is not None and audio_seconds:
+                throttled += self._audio_bucket.acquire(audio_seconds / 60)
+            if throttled:
+                logger.info(f'Throttled Whisper request for job {job_label} by {throttled:.1f}s')
+
+            try:
+                response = self._post(audio_path, language)
+                if response.status_code == 429:
+                    retry_after = parse_retry_after(response.headers, default=float(2 ** attempt))
+                    # Return the connection to the pool instead of holding it through the back-off
+                    response.close()
+                    if rate_limited_for + retry_after > settings.WHISPER_RATE_LIMIT_MAX_WAIT:
+                        raise WhisperRateLimitError(retry_after)
+                    logger.warning(f'Whisper API rate limited job {job_label}, retrying in {retry_after:.1f}s')
+                    JOB_RETRIES_TOTAL.labels('whisper_429').inc()
+                    time.sleep(retry_after)
+                    rate_limited_for += retry_after
+                    attempt += 1
+                    continue
+                response.raise_for_status()
+                return response.text
+            except requests.exceptions.RequestException as api_error:
+                logger.error(f'Whisper API error for job {job_label}: {type(api_error).__name__}: {api_error}')
+                raise
+
+
+# Global client instance (one connection pool and rate limiter per process)
+whisper_client = WhisperClient()
@@ -0,0 +1,75 @@
+"""
+Liveness heartbeats of job queue workers.
+
+Every worker process (python -m src.worker) records a heartbeat in a Redis
+sorted set every WORKER_HEARTBEAT_INTERVAL seconds, scored by time. A worker
+counts as alive while its last heartbeat is younger than WORKER_HEARTBEAT_TTL,
+so a crashed worker drops out on its own. Times come from the Redis server
+clock, so hosts with skewed clocks agree. Reading the live workers is a
+range query on the sorted set, never a scan of the keyspace.
+"""
+
+import threading
+from typing import List, Optional
+
+import redis
+
+from src.config import settings
+
+# Sorted set of worker IDs scored by the time of their last heartbeat
+HEARTBEATS_KEY = 'worker-heartbeats'
+
+
+def server_time(client: redis.Redis) -> float:
+    """Current time of the Redis server, in seconds since the epoch."""
+    seconds, microseconds = client.time()
+    return seconds + microseconds / 1_000_000
+
+
+class WorkerHeartbeats:
+    """Writes and reads worker heartbeats on Redis."""
+
+    def __init__(self):
+        """Create the Redis client lazily so importing this module never connects."""
+        self._client: Optional[redis.Redis] = None
+        self._lock = threading.Lock()
+
+    def _redis(self) -> redis.Redis:
+        with self._lock:
+            if self._client is None:
+                self._client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_connect_timeout=settings.HEALTH_CHECK_TIMEOUT,
+                    socket_timeout=settings.HEALTH_CHECK_TIMEOUT,
+                )
+            return self._client
+
+    def beat(self, worker_id: str) -> None:
+        """Record that a worker is alive."""
+        client = self._redis()
+        client.zadd(HEARTBEATS_KEY, {worker_id: server_time(client)})
+
+    def remove(self, worker_id: str) -> None:
+        """Forget a worker that is shutting down."""
+        self._redis().zrem(HEARTBEATS_KEY, worker_id)
+
+    def live_workers(self, client: Optional[redis.Redis] = None) -> List[str]:
+        """
+        IDs of the workers whose last heartbeat is younger than WORKER_HEARTBEAT_TTL.
+
+        Expired workers are pruned from the set as a side effect.
+
+        Args:
+            client: Redis client to use (defaults to this instance's client)
+        """
+        client = client or self._redis()
+        cutoff = server_time(client) - settings.WORKER_HEARTBEAT_TTL
+        pipeline = client.pipeline(transaction=False)
+        pipeline.zremrangebyscore(HEARTBEATS_KEY, '-inf', f'({cutoff}')
+        pipeline.zrangebyscore(HEARTBEATS_KEY, cutoff, '+inf')
+        live = pipeline.execute()[-1]
+        return [worker_id.decode() for worker_id in live]
+
+
+# Global instance
+worker_heartbeats = WorkerHeartbeats()
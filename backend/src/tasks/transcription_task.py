@@ -5,30 +5,94 @@ Celery task for processing transcription with OpenAI Whisper API.
 import logging
 import os
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
 from uuid import UUID
-from io import BytesIO
+
 import requests
-from pydub import AudioSegment
+from sqlalchemy.exc import OperationalError
 
 from src.celery_app import celery_app
 from src.config import settings
-from src.database import SessionLocal
+from src.database import SessionLocal, db_utc_now
 from src.models import TranscriptionJob, TranscriptionStatus
+from src.services.audio_service import (
+    SEGMENT_TARGET_SECONDS,
+    WHISPER_SUPPORTED_EXTENSIONS,
+    detect_silences,
+    extract_segment,
+    plan_segments,
+    probe_duration,
+    stitch_transcripts,
+    transcode_audio,
+)
+from src.services.transcript_store import transcript_store
+from src.services.job_cache import job_cache
+from src.services.job_events import publish_job_event
+from src.services.metrics import (
+    DB_COMMIT_SECONDS,
+    DOWNLOAD_SECONDS,
+    JOB_ERRORS_TOTAL,
+    JOB_PROCESSING_SECONDS,
+    JOB_RETRIES_TOTAL,
+    JOBS_IN_FLIGHT,
+    JOBS_TOTAL,
+    TRANSCODE_SECONDS,
+)
+from src.services.whisper_service import WHISPER_MAX_FILE_SIZE, WhisperRateLimitError, whisper_client
 
 logger = logging.getLogger(__name__)
 
-# OpenAI Whisper API file size limit (25MB)
-WHISPER_MAX_FILE_SIZE = 25 * 1024 * 1024
+# First retry delay after a transient error (doubles with every attempt)
+RETRY_BASE_DELAY = 60
+
+
+class RetryableJobError(Exception):
+    """
+    Raised to the queue worker when a job failed transiently and has attempts left.
+
+    The job stays PROCESSING; the worker releases it to be claimed again
+    after `retry_after` seconds.
+    """
+
+    def __init__(self, error: Exception, retry_after: float):
+        super().__init__(f'{type(error).__name__}: {error}')
+        self.error = error
+        self.retry_after = retry_after
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Whether an error is transient (network, 5xx, database connection) and
+    the job may succeed on another attempt. Bad media (ffmpeg failures),
+    missing files and 4xx API responses are permanent.
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is None or response.status_code >= 500 or response.status_code == 408
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, (ConnectionError, TimeoutError, OperationalError)):
+        return True
+    # Storage (boto3) errors: connection-level failures and throttling/5xx responses
+    if type(error).__module__.startswith('botocore'):
+        status = getattr(error, 'response', {}).get('ResponseMetadata', {}).get('HTTPStatusCode')
+        return status is None or status >= 500 or status == 429
+    return False
+
 
-# OpenAI API settings
-OPENAI_API_URL = 'https://api.openai.com/v1/audio/transcriptions'
+def retry_delay(attempt: int) -> float:
+    """Back-off before the retry following the given (1-based) attempt."""
+    return RETRY_BASE_DELAY * (2 ** max(attempt - 1, 0))
 
 
 def process_transcription_sync(job_id: str) -> None:
     """
     Process transcription synchronously (without Celery).
-    Used when Celery worker is not available.
+    Used by the job queue worker (src.worker).
     """
     _process_transcription_internal(job_id)
 
@@ -38,20 +102,28 @@ def _process_transcription_internal(job_id: str, celery_task=None) -> None:
     Internal function to process transcription using OpenAI Whisper API.
 
     Process flow:
-    1. Download file from R2
-    2. Check file size and compress if needed (>25MB)
-    3. Call Whisper API
+    1. Stream file from R2 to disk
+    2. Split long recordings at silences, or transcode short ones if needed (>25MB)
+    3. Call Whisper API (segments in parallel)
     4. Update database with result or error
 
     Args:
         job_id: UUID of the transcription job (as string)
         celery_task: Optional Celery task instance for retry support
 
+    Transient errors (see is_retryable_error) leave the job PROCESSING
+    while attempts remain: Celery retries the task, and the queue worker
+    gets a RetryableJobError and releases the job. Other errors, and the
+    last attempt, mark the job FAILED.
+
     Raises:
+        RetryableJobError: If the job should be retried by the queue worker
         Exception: If processing fails
     """
     job_uuid = UUID(job_id)
     db = SessionLocal()
+    claims = 1
+    started = None
 
     try:
         # Fetch job from database
@@ -60,114 +132,235 @@ def _process_transcription_internal(job_id: str, celery_task=None) -> None:
             logger.error(f'Job not found: {job_id}')
             return
 
+        # Delivery is at-least-once; a re-delivered job may already be finished
+        if job.status != TranscriptionStatus.PROCESSING:
+            logger.info(f'Skipping job {job_id} with status {job.status.value}')
+            return
+
+        claims = job.attempts or 1
         logger.info(f'Processing transcription job: {job_id}')
+        publish_job_event(job_id, job.status, stage='transcribing')
+        started = time.perf_counter()
+        JOBS_IN_FLIGHT.inc()
 
-        # Download file from R2
-        file_content = _download_file_from_r2(job.file_url)
-        file_size = len(file_content)
+        # Stream file from R2 to disk (local storage is read in place)
         file_ext = os.path.splitext(job.original_filename)[1].lower()
+        with _media_file(job.file_url, file_ext) as media_path:
+            transcript, duration = _transcribe_media(job_id, media_path, file_ext)
+
+        # Update job with result
+        transcript_store.assign(job, transcript)
+        job.duration = duration
+        job.status = TranscriptionStatus.COMPLETED
+        job.completed_at = datetime.utcnow()
+        job.updated_at = db_utc_now()
+        with DB_COMMIT_SECONDS.labels('complete_job').time():
+            db.commit()
+        job_cache.store_job(job)
+        publish_job_event(job_id, job.status, completed_at=job.completed_at)
+        JOBS_TOTAL.labels('completed').inc()
+        JOB_PROCESSING_SECONDS.labels('completed').observe(time.perf_counter() - started)
+
+        logger.info(f'Transcription completed for job {job_id}')
+
+    except WhisperRateLimitError as e:
+        # Still rate limited after waiting: reschedule instead of failing the job
+        # (the job stays PROCESSING; the queue worker releases it with a delay).
+        # Like queue releases, these retries do not use up the task's attempts.
+        JOB_RETRIES_TOTAL.labels('rate_limited').inc()
+        if celery_task:
+            rate_limited = _rate_limited_retries(celery_task) + 1
+            logger.warning(f'Rate limited job {job_id}, rescheduling in {e.retry_after:.0f}s')
+            raise celery_task.retry(
+                exc=e,
+                countdown=e.retry_after,
+                args=[job_id],
+                kwargs={'rate_limited': rate_limited},
+                max_retries=celery_task.max_retries + rate_limited,
+            )
+        raise
 
-        # Check if compression is needed
-        if file_size > WHISPER_MAX_FILE_SIZE:
-            logger.info(f'File size {file_size} bytes exceeds limit. Compressing...')
-            file_content = _compress_audio(file_content, file_ext)
-            logger.info(f'Compressed file size: {len(file_content)} bytes')
+    except Exception as e:
+        JOB_ERRORS_TOTAL.labels(type(e).__name__).inc()
+        db.rollback()
+        _retry_or_fail(db, job_uuid, e, claims, celery_task)
+        if started is not None:
+            JOB_PROCESSING_SECONDS.labels('failed').observe(time.perf_counter() - started)
+        raise
 
-        # Create temporary file for Whisper API
-        with tempfile.NamedTemporaryFile(suffix=file_ext, delete=False) as temp_file:
-            temp_file.write(file_content)
-            temp_file_path = temp_file.name
+    finally:
+        if started is not None:
+            JOBS_IN_FLIGHT.dec()
+        db.close()
 
-        try:
-            # Call Whisper API using requests (more compatible with Render)
-            logger.info(f'Calling Whisper API for job {job_id}, file: {temp_file_path}, size: {os.path.getsize(temp_file_path)} bytes')
-            with open(temp_file_path, 'rb') as audio_file:
-                try:
-                    # Strip any whitespace/newlines from API key
-                    api_key = settings.OPENAI_API_KEY.strip().replace('\n', '').replace('\r', '')
-                    headers = {
-                        'Authorization': f'Bearer {api_key}',
-                    }
-                    files = {
-                        'file': (os.path.basename(temp_file_path), audio_file, 'audio/mpeg'),
-                    }
-                    data = {
-                        'model': 'whisper-1',
-                        'language': 'ja',
-                        'response_format': 'text',
-                    }
-                    response = requests.post(
-                        OPENAI_API_URL,
-                        headers=headers,
-                        files=files,
-                        data=data,
-                        timeout=300,  # 5 minutes timeout
-                    )
-                    response.raise_for_status()
-                    transcript = response.text
-                except requests.exceptions.RequestException as api_error:
-                    logger.error(f'Whisper API error for job {job_id}: {type(api_error).__name__}: {api_error}')
-                    raise
-
-            # Update job with result
-            job.transcription_text = transcript
-            job.status = TranscriptionStatus.COMPLETED
-            job.completed_at = datetime.utcnow()
-            job.updated_at = datetime.utcnow()
-            db.commit()
 
-            logger.info(f'Transcription completed for job {job_id}')
+def _rate_limited_retries(celery_task) -> int:
+    """Celery retries of this task caused by rate limiting (carried in its kwargs)."""
+    return (celery_task.request.kwargs or {}).get('rate_limited', 0)
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
 
-    except Exception as e:
-        logger.error(f'Transcription failed for job {job_id}: {e}')
+def _retry_or_fail(db, job_uuid: UUID, error: Exception, claims: int, celery_task=None) -> None:
+    """
+    Retry a job after a transient error while attempts remain, otherwise mark it FAILED.
 
-        # Update job with error
-        try:
-            job = db.query(TranscriptionJob).filter(TranscriptionJob.id == job_uuid).first()
-            if job:
-                job.status = TranscriptionStatus.FAILED
-                job.error_message = str(e)
-                job.updated_at = datetime.utcnow()
-                db.commit()
-        except Exception as db_error:
-            logger.error(f'Failed to update job error status: {db_error}')
-            db.rollback()
+    Args:
+        db: Database session
+        job_uuid: ID of the job
+        error: The processing error
+        claims: Times the queue has claimed the job (its current attempt)
+        celery_task: Celery task instance, which counts attempts itself
 
-        # Retry with Celery if available
+    Raises:
+        RetryableJobError: If the queue worker should release the job
+        celery.exceptions.Retry: If the Celery task was rescheduled
+    """
+    # Attempt number (1-based): Celery counts its retries (less those caused by
+    # rate limiting), the queue counts claims
+    rate_limited = 0
+    if celery_task:
+        rate_limited = _rate_limited_retries(celery_task)
+        attempt = celery_task.request.retries - rate_limited + 1
+        max_attempts = celery_task.max_retries + 1
+    else:
+        attempt, max_attempts = claims, settings.JOB_MAX_ATTEMPTS
+
+    if is_retryable_error(error) and attempt < max_attempts:
+        delay = retry_delay(attempt)
+        logger.warning(
+            f'Transient error on job {job_uuid} (attempt {attempt}/{max_attempts}), '
+            f'retrying in {delay:.0f}s: {type(error).__name__}: {error}'
+        )
+        JOB_RETRIES_TOTAL.labels('error').inc()
         if celery_task:
-            raise celery_task.retry(exc=e, countdown=60 * (2 ** celery_task.request.retries))
-        else:
-            raise
+            raise celery_task.retry(exc=error, countdown=delay, max_retries=celery_task.max_retries + rate_limited)
+        raise RetryableJobError(error, delay) from error
+
+    logger.error(f'Transcription failed for job {job_uuid}: {error}')
+    _mark_job_failed(db, job_uuid, error)
+
+
+def _mark_job_failed(db, job_uuid: UUID, error: Exception) -> None:
+    """Record a processing error on the job."""
+    # Update job with error
+    try:
+        job = db.query(TranscriptionJob).filter(TranscriptionJob.id == job_uuid).first()
+        if job:
+            job.status = TranscriptionStatus.FAILED
+            job.error_message = str(error)
+            job.updated_at = db_utc_now()
+            with DB_COMMIT_SECONDS.labels('fail_job').time():
+                db.commit()
+            job_cache.store_job(job)
+            publish_job_event(job.id, job.status, error_message=job.error_message)
+            JOBS_TOTAL.labels('failed').inc()
+    except Exception as db_error:
+        logger.error(f'Failed to update job error status: {db_error}')
+        db.rollback()
+
+
+def _transcribe_media(job_id: str, media_path: str, file_ext: str) -> Tuple[str, Optional[float]]:
+    """
+    Transcribe a local media file, splitting long recordings into segments.
+
+    Recordings longer than SEGMENT_TARGET_SECONDS are cut at silences into
+    64kbps mono segments (each well under the Whisper limit) that are
+    transcribed concurrently and stitched back together in order. Shorter
+    recordings go to Whisper in one request, transcoded first with ffmpeg
+    if they are >25MB or not in a format Whisper accepts.
+
+    Args:
+        job_id: UUID of the transcription job (for logging)
+        media_path: Path of the downloaded media file
+        file_ext: File extension (e.g., '.mp3', '.wav')
 
+    Returns:
+        Tuple of (transcript, duration in seconds or None if unknown)
+    """
+    try:
+        duration = probe_duration(media_path)
+    except Exception as e:
+        logger.warning(f'Could not probe duration for job {job_id}: {e}')
+        duration = None
+
+    if duration is not None and duration > SEGMENT_TARGET_SECONDS:
+        with TRANSCODE_SECONDS.labels('silence_detection').time():
+            silences = detect_silences(media_path)
+        segments = plan_segments(duration, silences)
+        logger.info(f'Split job {job_id} ({duration:.0f}s) into {len(segments)} segments')
+        return _transcribe_segments(job_id, media_path, segments), duration
+
+    file_size = os.path.getsize(media_path)
+    if file_size <= WHISPER_MAX_FILE_SIZE and file_ext in WHISPER_SUPPORTED_EXTENSIONS:
+        return whisper_client.transcribe(media_path, job_id, audio_seconds=duration), duration
+
+    # Too large or not a Whisper format (e.g. .mov): transcode to compact MP3
+    fd, compressed_path = tempfile.mkstemp(suffix='.mp3')
+    os.close(fd)
+    try:
+        elapsed = transcode_audio(media_path, compressed_path)
+        TRANSCODE_SECONDS.labels('transcode').observe(elapsed)
+        logger.info(
+            f'Transcoded job {job_id} in {elapsed:.2f}s: '
+            f'{file_size} -> {os.path.getsize(compressed_path)} bytes'
+        )
+        return whisper_client.transcribe(compressed_path, job_id, audio_seconds=duration), duration
     finally:
-        db.close()
+        if os.path.exists(compressed_path):
+            os.unlink(compressed_path)
+
+
+def _transcribe_segments(job_id: str, media_path: str, segments: List[Tuple[float, float]]) -> str:
+    """
+    Extract and transcribe segments with a bounded thread pool.
+
+    Returns:
+        Stitched transcript, in segment order
+    """
+    with tempfile.TemporaryDirectory() as segment_dir:
+        def transcribe_segment(index: int) -> str:
+            start, end = segments[index]
+            segment_path = os.path.join(segment_dir, f'segment_{index:04d}.mp3')
+            elapsed = extract_segment(media_path, start, end, segment_path)
+            TRANSCODE_SECONDS.labels('segment').observe(elapsed)
+            logger.info(f'Transcoded segment {index} of job {job_id} in {elapsed:.2f}s')
+            try:
+                return whisper_client.transcribe(segment_path, f'{job_id}#{index}', audio_seconds=end - start)
+            finally:
+                os.unlink(segment_path)
+
+        with ThreadPoolExecutor(max_workers=settings.WHISPER_MAX_CONCURRENCY) as pool:
+            texts = list(pool.map(transcribe_segment, range(len(segments))))
+
+    return stitch_transcripts(texts)
 
 
 @celery_app.task(bind=True, max_retries=3)
-def process_transcription(self, job_id: str) -> None:
+def process_transcription(self, job_id: str, rate_limited: int = 0) -> None:
     """
     Process transcription using OpenAI Whisper API (Celery task).
 
     Args:
         job_id: UUID of the transcription job (as string)
+        rate_limited: Retries so far caused by rate limiting, which do not
+            count toward max_retries (set by the task itself)
     """
     _process_transcription_internal(job_id, celery_task=self)
 
 
-def _download_file_from_r2(file_url: str) -> bytes:
+@contextmanager
+def _media_file(file_url: str, file_ext: str) -> Iterator[str]:
     """
-    Download file from R2 storage or local storage.
+    Provide the job's media as a local file path without loading it into memory.
+
+    Local storage files are used in place; R2 objects are streamed to a
+    temporary file that is removed afterwards.
 
     Args:
         file_url: Full URL of the file (R2 URL or file:// URL)
+        file_ext: File extension for the temporary file
 
-    Returns:
-        File content as bytes
+    Yields:
+        Path of a readable local file
 
     Raises:
         Exception: If download fails
@@ -176,13 +369,8 @@ def _download_file_from_r2(file_url: str) -> bytes:
 
     # Check if using local storage (file:// URL)
     if file_url.startswith('file://'):
-        file_path = file_url.replace('file://', '')
-        try:
-            with open(file_path, 'rb') as f:
-                return f.read()
-        except Exception as e:
-            logger.error(f'Failed to read local file: {e}')
-            raise
+        yield file_url.replace('file://', '')
+        return
 
     # Extract object name from R2 URL
     # Format: https://{account_id}.r2.cloudflarestorage.com/{bucket_name}/{object_name}
@@ -190,62 +378,20 @@ def _download_file_from_r2(file_url: str) -> bytes:
 
     # Check if using LocalStorageService
     if isinstance(r2_service, LocalStorageService):
+        yield str(r2_service.get_local_path(object_name))
+        return
+
+    fd, temp_file_path = tempfile.mkstemp(suffix=file_ext)
+    os.close(fd)
+    try:
         try:
-            return r2_service.get_file_content(object_name)
+            with DOWNLOAD_SECONDS.time():
+                r2_service.download_to_path(object_name, temp_file_path)
         except Exception as e:
-            logger.error(f'Failed to read file from local storage: {e}')
+            logger.error(f'Failed to download file from R2: {e}')
             raise
-
-    # Use R2 client
-    try:
-        response = r2_service.client.get_object(
-            Bucket=r2_service.bucket_name,
-            Key=object_name
-        )
-        return response['Body'].read()
-    except Exception as e:
-        logger.error(f'Failed to download file from R2: {e}')
-        raise
-
-
-def _compress_audio(file_content: bytes, file_ext: str) -> bytes:
-    """
-    Compress audio file to reduce size below Whisper API limit.
-
-    Strategy:
-    1. Convert to MP3 format
-    2. Reduce bitrate to 64kbps (voice-optimized)
-    3. Convert to mono if stereo
-
-    Args:
-        file_content: Original file content
-        file_ext: File extension (e.g., '.mp3', '.wav')
-
-    Returns:
-        Compressed file content as bytes
-
-    Raises:
-        Exception: If compression fails
-    """
-    try:
-        # Load audio file
-        audio = AudioSegment.from_file(BytesIO(file_content), format=file_ext[1:])
-
-        # Convert to mono
-        if audio.channels > 1:
-            audio = audio.set_channels(1)
-
-        # Export as MP3 with reduced bitrate
-        output = BytesIO()
-        audio.export(
-            output,
-            format='mp3',
-            bitrate='64k',
-            parameters=['-ac', '1']  # Force mono
-        )
-
-        return output.getvalue()
-
-    except Exception as e:
-        logger.error(f'Failed to compress audio: {e}')
-        raise
+        yield temp_file_path
+    finally:
+        # Clean up temporary file
+        if os.path.exists(temp_file_path):
+            os.unlink(temp_file_path)
@@ -0,0 +1,170 @@
+"""
+Standalone transcription worker.
+
+Claims jobs from the Postgres job queue in batches, processes them on a
+thread pool and heartbeats their leases. Its own liveness is recorded in
+Redis for /api/health (see services/worker_heartbeats.py). Run as many
+worker processes as needed, independently of the API:
+
+    python -m src.worker
+"""
+
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set
+from uuid import UUID
+
+from src.config import settings
+from src.database import SessionLocal
+from src.services.job_queue import job_queue
+from src.services.metrics import mark_process_dead, start_metrics_server
+from src.services.whisper_service import WhisperRateLimitError
+from src.services.worker_heartbeats import worker_heartbeats
+from src.tasks.transcription_task import RetryableJobError, process_transcription_sync
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout),
+    ],
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionWorker:
+    """Queue consumer with a fixed number of processing slots."""
+
+    def __init__(self, concurrency: int = settings.WORKER_CONCURRENCY):
+        """Set up the worker identity, slots and stop flag."""
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.concurrency = concurrency
+        self.in_flight: Set[UUID] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stopped = threading.Event()
+
+    def stop(self, *args) -> None:
+        """Stop claiming new jobs; in-flight jobs are finished."""
+        logger.info(f'Worker {self.worker_id} stopping...')
+        self._stop.set()
+
+    def run(self) -> None:
+        """Claim and process jobs until stopped."""
+        logger.info(f'Worker {self.worker_id} started (concurrency={self.concurrency})')
+        heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat.start()
+        liveness = threading.Thread(target=self._liveness_loop, daemon=True)
+        liveness.start()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while not self._stop.is_set():
+                with self._lock:
+                    free_slots = self.concurrency - len(self.in_flight)
+
+                job_ids = self._claim(free_slots)
+                for job_id in job_ids:
+                    with self._lock:
+                        self.in_flight.add(job_id)
+                    pool.submit(self._process, job_id)
+
+                if not job_ids:
+                    self._stop.wait(settings.WORKER_POLL_INTERVAL)
+
+        # In-flight jobs have finished; stop reporting liveness
+        self._stopped.set()
+        liveness.join()
+        try:
+            worker_heartbeats.remove(self.worker_id)
+        except Exception as e:
+            logger.warning(f'Failed to remove liveness heartbeat: {e}')
+        logger.info(f'Worker {self.worker_id} stopped')
+
+    def _claim(self, limit: int):
+        db = SessionLocal()
+        try:
+            job_ids = job_queue.claim(db, self.worker_id, limit)
+            if job_ids:
+                logger.info(f'Claimed {len(job_ids)} jobs')
+            return job_ids
+        except Exception as e:
+            logger.error(f'Failed to claim jobs: {e}')
+            db.rollback()
+            return []
+        finally:
+            db.close()
+
+    def _process(self, job_id: UUID) -> None:
+        try:
+            process_transcription_sync(str(job_id))
+        except WhisperRateLimitError as e:
+            logger.warning(f'Rate limited job {job_id}, releasing for {e.retry_after:.0f}s')
+            self._release(job_id, e.retry_after)
+        except RetryableJobError as e:
+            # The attempt counts; the job is failed once JOB_MAX_ATTEMPTS are used up
+            logger.warning(f'Job {job_id} failed transiently, releasing for {e.retry_after:.0f}s: {e}')
+            self._release(job_id, e.retry_after, count_attempt=True)
+        except Exception as e:
+            # The job has already been marked FAILED
+            logger.error(f'Job {job_id} failed: {e}')
+        finally:
+            with self._lock:
+                self.in_flight.discard(job_id)
+
+    def _release(self, job_id: UUID, delay_seconds: float, count_attempt: bool = False) -> None:
+        db = SessionLocal()
+        try:
+            job_queue.release(db, job_id, self.worker_id, delay_seconds, count_attempt)
+        except Exception as e:
+            logger.error(f'Failed to release job {job_id}: {e}')
+            db.rollback()
+        finally:
+            db.close()
+
+    def _heartbeat_loop(self) -> None:
+        interval = settings.JOB_LEASE_SECONDS / 3
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                job_ids = list(self.in_flight)
+            if not job_ids:
+                continue
+            db = SessionLocal()
+            try:
+                job_queue.heartbeat(db, self.worker_id, job_ids)
+            except Exception as e:
+                logger.error(f'Heartbeat failed: {e}')
+                db.rollback()
+            finally:
+                db.close()
+
+    def _liveness_loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                worker_heartbeats.beat(self.worker_id)
+            except Exception as e:
+                logger.warning(f'Liveness heartbeat failed: {e}')
+            self._stopped.wait(settings.WORKER_HEARTBEAT_INTERVAL)
+
+
+def main() -> None:
+    """Run a worker until SIGTERM/SIGINT."""
+    worker = TranscriptionWorker()
+    if settings.METRICS_PORT:
+        start_metrics_server(settings.METRICS_PORT)
+        logger.info(f'Serving metrics on port {settings.METRICS_PORT}')
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+    mark_process_dead()
+
+
+if __name__ == '__main__':
+    main()
@@ -16,9 +16,11 @@ def test_health_check():
     assert response.status_code == 200
 
     data = response.json()
-    assert data['status'] == 'healthy'
+    # 'degraded' when no job queue worker is running
+    assert data['status'] in ('healthy', 'degraded')
     assert data['database'] == 'connected'
     assert 'timestamp' in data
+    assert data['services']['database']['age_seconds'] is not None
 
 
 def test_root_endpoint():
@@ -0,0 +1,45 @@
+"""
+Unit tests for long-audio segmentation and transcript stitching.
+"""
+
+from src.services.audio_service import plan_segments, stitch_transcripts
+
+
+def test_short_recording_is_single_segment():
+    """Test recordings under the target length are not split."""
+    assert plan_segments(300.0, [], target_seconds=600) == [(0.0, 300.0)]
+
+
+def test_segments_cut_at_latest_silence_in_window():
+    """Test cuts land in the middle of the latest silence before the target."""
+    silences = [(100.0, 101.0), (570.0, 572.0), (590.0, 592.0), (1150.0, 1152.0)]
+    segments = plan_segments(1500.0, silences, target_seconds=600, search_window=60, overlap=2)
+
+    assert segments == [(0.0, 591.0), (589.0, 1151.0), (1149.0, 1500.0)]
+
+
+def test_segments_hard_cut_without_silence():
+    """Test a recording without silences is cut at the target length."""
+    segments = plan_segments(1300.0, [], target_seconds=600, search_window=60, overlap=2)
+
+    assert segments == [(0.0, 600.0), (598.0, 1200.0), (1198.0, 1300.0)]
+    assert max(end - start for start, end in segments) <= 602
+
+
+def test_stitch_removes_text_repeated_across_overlap():
+    """Test words transcribed twice at a boundary appear once."""
+    texts = ['今日は会議を始めます。よろしく', 'よろしくお願いします。議題は三つです。\n']
+
+    assert stitch_transcripts(texts) == '今日は会議を始めます。よろしくお願いします。議題は三つです。'
+
+
+def test_stitch_removes_similar_text_across_overlap():
+    """Test a repeat transcribed differently (kana for kanji, a word cut at the edge) appears once."""
+    texts = ['今日は会議を始めます。よろしくおねがい', 'よろしくお願いします。議題は三つです。']
+
+    assert stitch_transcripts(texts) == '今日は会議を始めます。よろしくおねがいします。議題は三つです。'
+
+
+def test_stitch_keeps_text_without_overlap():
+    """Test segments without shared text are joined unchanged."""
+    assert stitch_transcripts(['first part', '', 'second part'], separator=' ') == 'first part second part'
@@ -0,0 +1,73 @@
+"""
+Unit tests for the cached background health checks.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from src.config import settings
+from src.schemas import ServiceStatus
+from src.services.health_monitor import STALE_AFTER_INTERVALS, HealthMonitor
+
+
+def fake_monitor(monkeypatch, calls):
+    """Monitor whose probes count their calls instead of touching services."""
+    monitor = HealthMonitor()
+
+    def check(name, status='connected'):
+        def run():
+            calls.append(name)
+            if status is None:
+                raise ConnectionError(f'{name} unreachable')
+            return ServiceStatus(status=status, latency_ms=1.0)
+        return run
+
+    monkeypatch.setattr(monitor, 'check_database', check('database'))
+    monkeypatch.setattr(monitor, 'check_redis', check('redis', status=None))
+    monkeypatch.setattr(monitor, 'check_workers', check('workers', status='disconnected'))
+    monkeypatch.setattr(monitor, 'check_celery', check('celery'))
+    return monitor
+
+
+def test_results_are_cached_for_one_interval(monkeypatch):
+    """Test repeated reads within an interval do not probe again."""
+    monkeypatch.setattr(settings, 'HEALTH_CHECK_INTERVAL', 60)
+    calls = []
+    monitor = fake_monitor(monkeypatch, calls)
+
+    first = monitor.results()
+    second = monitor.results()
+
+    assert calls == ['database', 'redis', 'workers', 'celery']
+    assert first['database'].status == 'connected'
+    assert second['database'].checked_at == first['database'].checked_at
+    assert second['database'].age_seconds >= 0
+
+
+def test_failed_probe_reports_disconnected_with_error(monkeypatch):
+    """Test an exception in a probe is reported rather than raised."""
+    monitor = fake_monitor(monkeypatch, [])
+
+    results = monitor.results()
+
+    assert results['redis'].status == 'disconnected'
+    assert results['redis'].error == 'redis unreachable'
+    assert results['workers'].status == 'disconnected'
+
+
+def test_stale_results_are_reported_unknown(monkeypatch):
+    """Test results the background thread failed to refresh are not served as current."""
+    monkeypatch.setattr(settings, 'HEALTH_CHECK_INTERVAL', 10)
+    calls = []
+    monitor = fake_monitor(monkeypatch, calls)
+    monitor.probe()
+    for status in monitor._results.values():
+        status.checked_at = datetime.utcnow() - timedelta(seconds=10 * STALE_AFTER_INTERVALS + 5)
+    # Pretend the background thread is alive but stuck
+    monitor._thread = SimpleNamespace(is_alive=lambda: True)
+
+    results = monitor.results()
+
+    assert len(calls) == 4
+    assert results['database'].status == 'unknown'
+    assert results['database'].age_seconds >= 10 * STALE_AFTER_INTERVALS
@@ -0,0 +1,59 @@
+"""
+Unit tests for the streaming history export encoders.
+"""
+
+import io
+import json
+import uuid
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+from src.services.history_export import history_export_service, to_utc_naive, zip_entry_name
+
+
+def make_record(filename: str, text):
+    """Build an export record as produced by export_record."""
+    return {
+        'id': str(uuid.uuid4()),
+        'originalFilename': filename,
+        'status': 'completed',
+        'language': 'ja',
+        'fileSize': 10,
+        'duration': 1.5,
+        'createdAt': '2026-10-01T09:30:00',
+        'completedAt': '2026-10-01T09:31:00',
+        'transcriptionText': text,
+    }
+
+
+def test_ndjson_chunks_one_line_per_record():
+    """Test each record is one UTF-8 JSON line."""
+    records = [make_record('a.mp3', '会議の記録'), make_record('b.mp3', None)]
+
+    lines = b''.join(history_export_service.ndjson_chunks(records)).decode('utf-8').splitlines()
+
+    assert [json.loads(line) for line in lines] == records
+    assert '会議の記録' in lines[0]
+
+
+def test_zip_chunks_stream_a_valid_archive():
+    """Test the streamed chunks form a zip with one .txt per transcript."""
+    records = [make_record('会議/録音.m4a', '本日の会議'), make_record('empty.mp3', None)]
+
+    chunks = list(history_export_service.zip_chunks(iter(records)))
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+    name = zip_entry_name(records[0])
+    assert name == f'2026-10-01/会議_録音_{records[0]["id"]}.txt'
+    assert archive.namelist() == [name]
+    assert archive.read(name).decode('utf-8') == '本日の会議'
+    assert len(chunks) == 2  # the entry, then the central directory
+
+
+def test_to_utc_naive():
+    """Test aware datetimes are converted to naive UTC and naive ones are kept."""
+    aware = datetime(2026, 10, 1, 9, 0, tzinfo=timezone(timedelta(hours=9)))
+
+    assert to_utc_naive(aware) == datetime(2026, 10, 1, 0, 0)
+    assert to_utc_naive(datetime(2026, 10, 1)) == datetime(2026, 10, 1)
+    assert to_utc_naive(None) is None
@@ -0,0 +1,73 @@
+"""
+Unit tests for history cursor pagination helpers.
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from src.services.history_service import HistoryService, build_snippet, escape_like, search_score
+from src.services.search_grams import build_search_grams, query_grams
+
+
+def test_cursor_round_trip():
+    """Test a cursor decodes to the position it was built from."""
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 678901)
+    job_id = uuid.uuid4()
+
+    cursor = HistoryService.encode_cursor(created_at, job_id)
+
+    assert '=' not in cursor
+    assert HistoryService.decode_cursor(cursor) == (created_at, job_id)
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', 'WyJ4Il0', ''])
+def test_invalid_cursor_is_rejected(cursor):
+    """Test malformed cursors raise 400 instead of a server error."""
+    with pytest.raises(HTTPException) as exc_info:
+        HistoryService.decode_cursor(cursor)
+
+    assert exc_info.value.status_code == 400
+
+
+def test_build_snippet_highlights_hits_and_escapes_html():
+    """Test hits are wrapped in <mark> and the surrounding text is escaped."""
+    text = '<b>' + 'あ' * 100 + '本日の定例会議では会議室の予約について' + 'い' * 100
+
+    snippet = build_snippet(text, '会議', radius=5)
+
+    assert snippet == '…本日の定例<mark>会議</mark>では<mark>会議</mark>室…'
+    assert '<b>' not in build_snippet(text, '存在しない', radius=5)
+
+
+def test_search_grams_contain_short_and_long_queries():
+    """Test a document's grams contain those of every substring, including one character."""
+    grams = set(build_search_grams('本日の定例会議では𠮷野家の件', 'Meeting.mp3'))
+
+    for query in ['会', '会議', '定例会議', '𠮷野', 'meeting', 'MEET']:
+        assert set(query_grams(query)) <= grams
+    assert not set(query_grams('議会')) <= grams
+    assert all(-2 ** 31 <= gram < 2 ** 31 for gram in grams)
+
+
+def test_search_score_counts_hits_case_insensitively():
+    """Test the score adds a filename hit to transcript occurrences, with and without cased characters."""
+    assert search_score('Meeting.mp3', 'meeting notes, MEETING', 'meeting') == 5 + 2
+    assert search_score('会議.mp3', '会議の議事録、次回の会議', '会議') == 5 + 2
+    assert search_score(None, None, '会議') == 0
+
+
+def test_escape_like_matches_wildcards_literally():
+    """Test LIKE wildcards in queries are escaped."""
+    assert escape_like('100%_\\') == '100\\%\\_\\\\'
+
+
+def test_sync_cursor_round_trip():
+    """Test both stream positions survive encoding, including an empty stream."""
+    job_position = (datetime(2026, 1, 2, 3, 4, 5), uuid.uuid4())
+
+    cursor = HistoryService.encode_sync_cursor(job_position, None)
+
+    assert HistoryService.decode_sync_cursor(cursor) == (job_position, None)
@@ -0,0 +1,98 @@
+"""
+Unit tests for the job status/result cache.
+"""
+
+import time
+import uuid
+from datetime import datetime
+
+from src.config import settings
+from src.schemas import TranscriptionJobResponse, TranscriptionStatusResponse
+from src.services.job_cache import JobCache, LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used_within_budget():
+    """Test the byte budget evicts the oldest unused entry first."""
+    cache = LRUCache(max_bytes=10)
+    cache.set('a', b'aaaa', ttl=60)
+    cache.set('b', b'bbbb', ttl=60)
+    assert cache.get('a') == b'aaaa'
+
+    cache.set('c', b'cccc', ttl=60)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == b'aaaa'
+    assert cache.get('c') == b'cccc'
+    assert cache.bytes == 8
+
+
+def test_lru_cache_expires_entries():
+    """Test entries are not returned after their TTL."""
+    cache = LRUCache(max_bytes=100)
+    cache.set('a', b'value', ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get('a') is None
+    assert cache.bytes == 0
+
+
+def test_job_cache_round_trip_and_counters(monkeypatch):
+    """Test write-through, invalidation and hit/miss counting on the memory backend."""
+    monkeypatch.setattr(settings, 'JOB_CACHE_BACKEND', 'memory')
+    cache = JobCache()
+    job_id = uuid.uuid4()
+    now = datetime.utcnow()
+
+    assert cache.get_result(job_id) is None
+
+    cache.store_result(TranscriptionJobResponse(
+        id=job_id, original_filename='a.mp3', file_size=10, file_url='u',
+        transcription_text='こんにちは', status='completed', created_at=now, updated_at=now,
+    ))
+    cache.store_status(TranscriptionStatusResponse(
+        id=job_id, status='completed', created_at=now, updated_at=now,
+    ))
+
+    assert cache.get_result(job_id).transcription_text == 'こんにちは'
+    assert cache.get_status(job_id).status == 'completed'
+
+    cache.invalidate([job_id])
+    assert cache.get_status(job_id) is None
+
+    stats = cache.get_stats()
+    assert stats['backend'] == 'memory'
+    assert stats['hits'] == {'status': 1, 'result': 1}
+    assert stats['misses'] == {'status': 1, 'result': 1}
+    assert stats['hit_rate'] == 0.5
+
+
+def test_job_cache_does_not_cache_unfinished_results(monkeypatch):
+    """Test results of jobs still processing are never cached."""
+    monkeypatch.setattr(settings, 'JOB_CACHE_BACKEND', 'memory')
+    cache = JobCache()
+    job_id = uuid.uuid4()
+    now = datetime.utcnow()
+
+    cache.store_result(TranscriptionJobResponse(
+        id=job_id, original_filename='a.mp3', file_size=10, file_url='u',
+        status='processing', created_at=now, updated_at=now,
+    ))
+
+    assert cache.get_result(job_id) is None
+
+
+def test_local_fallback_caches_finished_jobs_only_briefly(monkeypatch):
+    """Test the in-process LRU skips processing statuses and keeps finished ones for JOB_CACHE_LOCAL_TTL."""
+    monkeypatch.setattr(settings, 'JOB_CACHE_BACKEND', 'memory')
+    monkeypatch.setattr(settings, 'JOB_CACHE_LOCAL_TTL', 0.01)
+    cache = JobCache()
+    job_id = uuid.uuid4()
+    now = datetime.utcnow()
+
+    cache.store_status(TranscriptionStatusResponse(id=job_id, status='processing', created_at=now, updated_at=now))
+    assert cache.get_status(job_id) is None
+
+    cache.store_status(TranscriptionStatusResponse(id=job_id, status='completed', created_at=now, updated_at=now))
+    assert cache.get_status(job_id).status == 'completed'
+    time.sleep(0.02)
+    assert cache.get_status(job_id) is None
@@ -0,0 +1,65 @@
+"""
+Unit tests for the job status event streams.
+"""
+
+import asyncio
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import settings
+from src.routers import events
+from src.services import job_events
+from src.services.job_events import JobEventHub, build_job_event, job_event_hub
+
+
+def test_memory_broker_polls_all_subscribed_jobs_at_once(monkeypatch):
+    """Test memory mode reads every subscribed job in one query and dispatches changes and deletions."""
+    monkeypatch.setattr(settings, 'EVENT_BROKER', 'memory')
+    monkeypatch.setattr(settings, 'EVENT_POLL_INTERVAL', 0.01)
+    first, second = str(uuid.uuid4()), str(uuid.uuid4())
+    processing = {job_id: build_job_event(job_id, 'processing') for job_id in (first, second)}
+    states = [processing, {**processing, first: build_job_event(first, 'completed')}, {second: processing[second]}]
+    polls = []
+
+    def load_job_events(job_ids):
+        polls.append(sorted(job_ids))
+        return states.pop(0) if states else {second: processing[second]}
+
+    monkeypatch.setattr(job_events, 'load_job_events', load_job_events)
+    hub = JobEventHub()
+
+    async def next_events():
+        queue = hub.subscribe(first)
+        others = [hub.subscribe(second), hub.subscribe(second)]
+        hub.observe(first, 'processing')
+        hub.observe(second, 'processing')
+        changed = await asyncio.wait_for(queue.get(), timeout=1)
+        deleted = await asyncio.wait_for(queue.get(), timeout=1)
+        hub._listener.cancel()
+        return changed, deleted, others
+
+    changed, deleted, others = asyncio.run(next_events())
+
+    assert changed['status'] == 'completed'
+    assert deleted == build_job_event(first, 'deleted')
+    assert all(queue.empty() for queue in others)
+    assert polls[:3] == [sorted([first, second])] * 3
+
+
+def test_websocket_unsubscribes_on_client_disconnect(monkeypatch):
+    """Test a client closing the socket ends the handler while no event arrives."""
+    monkeypatch.setattr(settings, 'EVENT_BROKER', 'memory')
+    monkeypatch.setattr(settings, 'EVENT_POLL_INTERVAL', 60)
+    job_id = uuid.uuid4()
+    monkeypatch.setattr(events, '_load_job_event', lambda _: build_job_event(str(job_id), 'processing'))
+    app = FastAPI()
+    app.include_router(events.router)
+
+    with TestClient(app) as client:
+        with client.websocket_connect(f'/transcriptions/{job_id}/ws') as websocket:
+            assert websocket.receive_json()['status'] == 'processing'
+            assert job_event_hub.subscriber_count == 1
+
+    assert job_event_hub.subscriber_count == 0
@@ -0,0 +1,75 @@
+"""
+Unit tests for transcription_jobs partition helpers.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from src.models import TranscriptionJob, TranscriptionStatus, new_job_id
+from src.services.job_partitions import (
+    ID_CLOCK_SLACK,
+    add_months,
+    archive_record,
+    id_created_after,
+    job_id_filter,
+    month_start,
+    partition_name,
+)
+from src.services.transcript_store import compress_transcript
+
+
+def test_month_arithmetic_crosses_year_boundaries():
+    """Test month starts and offsets around December/January."""
+    assert month_start(datetime(2026, 12, 31, 23, 59)) == datetime(2026, 12, 1)
+    assert add_months(datetime(2026, 12, 1), 1) == datetime(2027, 1, 1)
+    assert add_months(datetime(2026, 1, 1), -13) == datetime(2024, 12, 1)
+    assert partition_name(datetime(2027, 1, 1)) == 'transcription_jobs_p202701'
+
+
+def test_new_job_id_is_time_ordered_v7():
+    """Test job IDs carry their creation time and sort by it."""
+    before = datetime.utcnow()
+    first = new_job_id()
+    second = new_job_id()
+
+    assert first.version == 7
+    assert first.variant == uuid.RFC_4122
+    assert first.int >> 80 <= second.int >> 80
+    created_after = id_created_after(first)
+    assert before - ID_CLOCK_SLACK - timedelta(milliseconds=1) <= created_after <= datetime.utcnow() - ID_CLOCK_SLACK
+
+
+def test_job_id_filter_bounds_created_at_only_for_v7_ids():
+    """Test lookups by a v7 ID get a created_at bound and random IDs do not."""
+    def compiled(job_id):
+        return str(job_id_filter(job_id).compile(dialect=postgresql.dialect()))
+
+    assert 'created_at' in compiled(new_job_id())
+    assert 'created_at' not in compiled(uuid.uuid4())
+
+
+def test_archive_record_inlines_offloaded_transcript():
+    """Test archived rows keep every column and carry the full transcript."""
+    job_id = new_job_id()
+    created_at = datetime(2025, 1, 20, 9, 0)
+    values = {column: None for column in TranscriptionJob.__table__.columns}
+    values.update({
+        TranscriptionJob.__table__.c.id: job_id,
+        TranscriptionJob.__table__.c.original_filename: '会議.mp3',
+        TranscriptionJob.__table__.c.status: TranscriptionStatus.COMPLETED,
+        TranscriptionJob.__table__.c.transcript_storage: 'blob',
+        TranscriptionJob.__table__.c.created_at: created_at,
+    })
+    row = SimpleNamespace(_mapping=values, blob_data=compress_transcript('長い文字起こし'))
+
+    record = archive_record(row)
+
+    assert set(record) == {column.name for column in TranscriptionJob.__table__.columns}
+    assert record['id'] == str(job_id)
+    assert record['status'] == 'completed'
+    assert record['created_at'] == '2025-01-20T09:00:00'
+    assert record['transcription_text'] == '長い文字起こし'
+    assert record['transcript_storage'] is None
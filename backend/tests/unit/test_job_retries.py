@@ -0,0 +1,90 @@
+"""
+Unit tests for retrying transcription jobs after transient errors.
+"""
+
+import subprocess
+import uuid
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from src.config import settings
+from src.tasks import transcription_task
+from src.tasks.transcription_task import RetryableJobError, _retry_or_fail, is_retryable_error
+
+
+def http_error(status_code: int) -> requests.exceptions.HTTPError:
+    """HTTPError carrying a response with the given status."""
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(response=response)
+
+
+def test_transient_errors_are_retryable():
+    """Test network errors and 5xx are retried, bad media and 4xx are not."""
+    assert is_retryable_error(requests.exceptions.ConnectionError())
+    assert is_retryable_error(requests.exceptions.ReadTimeout())
+    assert is_retryable_error(http_error(503))
+    assert not is_retryable_error(http_error(400))
+    assert not is_retryable_error(subprocess.CalledProcessError(1, ['ffmpeg']))
+    assert not is_retryable_error(FileNotFoundError('missing.mp3'))
+
+
+def test_queue_job_is_released_until_attempts_run_out(monkeypatch):
+    """Test the queue worker gets RetryableJobError, and the last attempt marks FAILED."""
+    monkeypatch.setattr(settings, 'JOB_MAX_ATTEMPTS', 3)
+    failed = []
+    monkeypatch.setattr(transcription_task, '_mark_job_failed', lambda db, job_id, error: failed.append(job_id))
+    job_id = uuid.uuid4()
+
+    with pytest.raises(RetryableJobError) as retry:
+        _retry_or_fail(None, job_id, requests.exceptions.ConnectionError(), claims=2)
+    assert retry.value.retry_after == 2 * transcription_task.RETRY_BASE_DELAY
+    assert failed == []
+
+    _retry_or_fail(None, job_id, requests.exceptions.ConnectionError(), claims=3)
+    _retry_or_fail(None, job_id, http_error(400), claims=1)
+    assert failed == [job_id, job_id]
+
+
+def test_celery_retry_leaves_job_processing(monkeypatch):
+    """Test a Celery retry is scheduled without marking the job FAILED first."""
+    failed = []
+    monkeypatch.setattr(transcription_task, '_mark_job_failed', lambda db, job_id, error: failed.append(job_id))
+
+    class Retry(Exception):
+        pass
+
+    def retry(exc, countdown, max_retries):
+        return Retry(countdown)
+
+    task = SimpleNamespace(request=SimpleNamespace(retries=0, kwargs={}), max_retries=3, retry=retry)
+
+    with pytest.raises(Retry):
+        _retry_or_fail(None, uuid.uuid4(), http_error(502), claims=1, celery_task=task)
+    assert failed == []
+
+
+def test_celery_rate_limit_retries_do_not_use_up_attempts(monkeypatch):
+    """Test retries caused by rate limiting are excluded from the attempt count, and the last attempt fails."""
+    failed = []
+    monkeypatch.setattr(transcription_task, '_mark_job_failed', lambda db, job_id, error: failed.append(job_id))
+    scheduled = []
+
+    class Retry(Exception):
+        pass
+
+    def retry(exc, countdown, max_retries):
+        scheduled.append(max_retries)
+        return Retry(countdown)
+
+    # Seven retries so far, five of them rate limited: this is the third attempt of four
+    task = SimpleNamespace(request=SimpleNamespace(retries=7, kwargs={'rate_limited': 5}), max_retries=3, retry=retry)
+    with pytest.raises(Retry):
+        _retry_or_fail(None, uuid.uuid4(), http_error(502), claims=1, celery_task=task)
+    assert scheduled == [8]
+
+    task.request.retries = 8
+    _retry_or_fail(None, uuid.uuid4(), http_error(502), claims=1, celery_task=task)
+    assert len(failed) == 1
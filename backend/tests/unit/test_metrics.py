@@ -0,0 +1,70 @@
+"""
+Unit tests for the Prometheus pipeline metrics.
+"""
+
+import os
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+
+from src.services.metrics import render_metrics, start_metrics_server
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+RECORD_JOB = '''
+from src.services.metrics import JOBS_IN_FLIGHT, JOBS_TOTAL, WHISPER_REQUEST_SECONDS
+JOBS_TOTAL.labels('completed').inc()
+JOBS_IN_FLIGHT.inc()
+WHISPER_REQUEST_SECONDS.labels('200').observe(1.5)
+'''
+
+RENDER = '''
+from src.services.metrics import render_metrics
+print(render_metrics()[0].decode())
+'''
+
+
+def run_python(code: str, multiproc_dir: Path) -> str:
+    """Run code in a fresh interpreter sharing the metrics directory."""
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(multiproc_dir))
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def test_render_metrics_exposes_pipeline_metrics():
+    """Test the single-process exposition lists the pipeline metrics."""
+    payload, content_type = render_metrics()
+    text = payload.decode()
+
+    assert content_type.startswith('text/plain')
+    assert 'transcription_whisper_request_seconds' in text
+    assert 'transcription_jobs_in_flight' in text
+
+
+def test_worker_metrics_server_serves_pipeline_metrics():
+    """Test the endpoint started by worker processes serves the same metrics."""
+    server, thread = start_metrics_server(0)
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.server_port}/metrics') as response:
+            text = response.read().decode()
+    finally:
+        server.shutdown()
+        thread.join()
+
+    assert 'transcription_whisper_request_seconds' in text
+
+
+def test_metrics_aggregate_across_processes(tmp_path):
+    """Test values recorded by separate processes are aggregated in multiprocess mode."""
+    run_python(RECORD_JOB, tmp_path)
+    run_python(RECORD_JOB + 'from src.services.metrics import mark_process_dead\nmark_process_dead()\n', tmp_path)
+
+    text = run_python(RENDER, tmp_path)
+
+    assert 'transcription_jobs_total{status="completed"} 2.0' in text
+    assert 'transcription_whisper_request_seconds_count{status="200"} 2.0' in text
+    # The in-flight gauge drops processes marked dead on exit
+    assert 'transcription_jobs_in_flight 1.0' in text
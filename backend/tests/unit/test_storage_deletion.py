@@ -0,0 +1,54 @@
+"""
+Unit tests for bulk deletion from storage.
+"""
+
+from src.services.job_deletion_service import object_name_from_url
+from src.services.r2_service import DELETE_OBJECTS_BATCH_SIZE, LocalStorageService, R2Service
+
+
+class FakeDeleteClient:
+    """Minimal stand-in for the boto3 DeleteObjects API."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        self.batches = []
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [item['Key'] for item in Delete['Objects']]
+        self.batches.append(keys)
+        return {'Errors': [error for error in self.errors if error['Key'] in keys]}
+
+
+def test_r2_delete_files_batches_and_collects_failures():
+    """Test keys are sent 1000 per request and only real errors are reported."""
+    service = R2Service.__new__(R2Service)
+    service.bucket_name = 'bucket'
+    service.client = FakeDeleteClient([
+        {'Key': 'k0005', 'Code': 'AccessDenied', 'Message': 'denied'},
+        {'Key': 'k1500', 'Code': 'NoSuchKey', 'Message': 'missing'},
+    ])
+    names = [f'k{i:04d}' for i in range(DELETE_OBJECTS_BATCH_SIZE + 600)]
+
+    failed = service.delete_files(names)
+
+    assert [len(batch) for batch in service.client.batches] == [DELETE_OBJECTS_BATCH_SIZE, 600]
+    assert failed == {'k0005': 'AccessDenied: denied'}
+
+
+def test_local_delete_files_ignores_missing_files(tmp_path):
+    """Test local files are unlinked and missing ones count as deleted."""
+    service = LocalStorageService.__new__(LocalStorageService)
+    service.storage_dir = tmp_path
+    (tmp_path / 'a.mp3').write_bytes(b'a')
+    (tmp_path / 'b.mp3').write_bytes(b'b')
+
+    failed = service.delete_files(['a.mp3', 'b.mp3', 'missing.mp3'])
+
+    assert failed == {}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_object_name_from_url():
+    """Test the object name is the last path segment of R2 and local URLs."""
+    assert object_name_from_url('https://acct.r2.cloudflarestorage.com/bucket/job.mp3') == 'job.mp3'
+    assert object_name_from_url('file:///srv/uploads/job.mp3') == 'job.mp3'
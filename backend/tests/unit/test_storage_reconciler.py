@@ -0,0 +1,58 @@
+"""
+Unit tests for the storage listings used by reconciliation.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from src.services.r2_service import LocalStorageService, R2Service
+
+
+class FakeListClient:
+    """Minimal stand-in for the boto3 ListObjectsV2 API (two pages)."""
+
+    def __init__(self):
+        self.calls = []
+
+    def list_objects_v2(self, **params):
+        self.calls.append(params)
+        modified = datetime(2026, 10, 1, 18, 0, tzinfo=timezone(timedelta(hours=9)))
+        if 'ContinuationToken' not in params:
+            return {
+                'Contents': [{'Key': 'a.mp3', 'Size': 1, 'LastModified': modified}],
+                'IsTruncated': True,
+                'NextContinuationToken': 'token-2',
+            }
+        return {'Contents': [{'Key': 'b.mp3', 'Size': 2, 'LastModified': modified}], 'IsTruncated': False}
+
+
+def test_local_list_objects_pages_in_name_order(tmp_path):
+    """Test local listing pages by name and skips in-progress uploads."""
+    service = LocalStorageService.__new__(LocalStorageService)
+    service.storage_dir = tmp_path
+    for name in ['c.mp3', 'a.mp3', 'b.mp3', 'd.mp3.part']:
+        (tmp_path / name).write_bytes(b'x')
+    (tmp_path / '.chunks').mkdir()
+
+    first, token = service.list_objects(max_keys=2)
+    second, last_token = service.list_objects(token, max_keys=2)
+
+    assert [obj['name'] for obj in first] == ['a.mp3', 'b.mp3']
+    assert token == 'b.mp3'
+    assert [obj['name'] for obj in second] == ['c.mp3']
+    assert last_token is None
+    assert first[0]['size'] == 1 and first[0]['last_modified'].tzinfo is None
+
+
+def test_r2_list_objects_follows_continuation_tokens():
+    """Test R2 listing passes the token back and normalises timestamps to naive UTC."""
+    service = R2Service.__new__(R2Service)
+    service.bucket_name = 'bucket'
+    service.client = FakeListClient()
+
+    first, token = service.list_objects(max_keys=1)
+    second, last_token = service.list_objects(token, max_keys=1)
+
+    assert token == 'token-2' and last_token is None
+    assert service.client.calls[1]['ContinuationToken'] == 'token-2'
+    assert [obj['name'] for obj in first + second] == ['a.mp3', 'b.mp3']
+    assert first[0]['last_modified'] == datetime(2026, 10, 1, 9, 0)
@@ -0,0 +1,64 @@
+"""
+Unit tests for the transcript storage policy.
+"""
+
+import uuid
+from datetime import datetime
+
+from src.config import settings
+from src.services.transcript_store import (
+    CODEC_ZSTD,
+    STORAGE_BLOB,
+    build_preview,
+    compress_transcript,
+    decompress_transcript,
+    transcript_store
+)
+
+
+def test_compress_round_trip_shrinks_japanese_text():
+    """Test compressed transcripts decompress to the original text."""
+    transcript = '本日の定例会議では来期の予算について議論しました。' * 2000
+
+    data = compress_transcript(transcript)
+
+    assert decompress_transcript(data) == transcript
+    assert len(data) < len(transcript.encode('utf-8')) / 10
+
+
+def test_offload_size_uses_utf8_bytes(monkeypatch):
+    """Test the threshold is compared against the UTF-8 size, not the character count."""
+    monkeypatch.setattr(settings, 'TRANSCRIPT_OFFLOAD_THRESHOLD', 30)
+
+    assert transcript_store.offload_size(None) is None
+    assert transcript_store.offload_size('a' * 30) is None
+    assert transcript_store.offload_size('会' * 10) is None
+    assert transcript_store.offload_size('会' * 11) == 33
+
+
+def test_offload_row_moves_large_text_to_blob(monkeypatch):
+    """Test bulk rows above the threshold are cleared and paired with a blob row."""
+    monkeypatch.setattr(settings, 'TRANSCRIPT_OFFLOAD_THRESHOLD', 30)
+    transcript = '会議' * 100
+    row = {
+        'id': uuid.uuid4(),
+        'transcription_text': transcript,
+        'preview_text': build_preview(transcript),
+        'transcript_storage': None,
+        'created_at': datetime(2026, 1, 15, 9, 30),
+    }
+
+    blob = transcript_store.offload_row(row)
+
+    assert row['transcription_text'] is None
+    assert row['transcript_storage'] == STORAGE_BLOB
+    assert row['preview_text'] == transcript[:100]
+    assert blob['job_id'] == row['id']
+    assert blob['job_created_at'] == row['created_at']
+    assert blob['codec'] == CODEC_ZSTD
+    assert blob['original_size'] == len(transcript.encode('utf-8'))
+    assert decompress_transcript(blob['data']) == transcript
+
+    small = {'id': uuid.uuid4(), 'transcription_text': '短い', 'transcript_storage': None}
+    assert transcript_store.offload_row(small) is None
+    assert small['transcription_text'] == '短い'
@@ -0,0 +1,105 @@
+"""
+Unit tests for the Whisper API client.
+"""
+
+import pytest
+
+from src.config import settings
+from src.services import whisper_service
+from src.services.whisper_service import (
+    StreamingMultipartBody,
+    TokenBucket,
+    WhisperClient,
+    WhisperRateLimitError,
+    parse_retry_after,
+)
+
+
+def test_streaming_multipart_body_length_matches_content(tmp_path):
+    """Test the declared length equals the bytes produced by small reads."""
+    audio_path = tmp_path / 'segment.mp3'
+    audio_path.write_bytes(b'\x00\x01' * 50000)
+
+    body = StreamingMultipartBody({'model': 'whisper-1'}, 'file', str(audio_path), 'audio/mpeg')
+
+    data = b''
+    while True:
+        block = body.read(8192)
+        if not block:
+            break
+        assert len(block) <= 8192
+        data += block
+
+    assert len(data) == len(body)
+    assert data.startswith(f'--{body.boundary}\r\n'.encode())
+    assert data.endswith(f'\r\n--{body.boundary}--\r\n'.encode())
+    assert b'\x00\x01' * 50000 in data
+    assert 'boundary=' + body.boundary in body.content_type
+
+
+def test_parse_retry_after_formats():
+    """Test Retry-After seconds, retry-after-ms and missing headers."""
+    assert parse_retry_after({'Retry-After': '7'}, default=1.0) == 7.0
+    assert parse_retry_after({'retry-after-ms': '1500', 'Retry-After': '2'}, default=1.0) == 1.5
+    assert parse_retry_after({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}, default=1.0) == 0.0
+    assert parse_retry_after({}, default=4.0) == 4.0
+
+
+def test_token_bucket_waits_when_empty():
+    """Test acquiring beyond capacity waits for the refill."""
+    bucket = TokenBucket(capacity=2, refill_per_second=100)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() > 0.0
+
+
+def test_rate_limited_response_is_closed_before_backoff(tmp_path, monkeypatch):
+    """Test a 429 releases its pooled connection before sleeping, with no request quota configured."""
+    monkeypatch.setattr(settings, 'WHISPER_REQUESTS_PER_MINUTE', 0)
+    audio_path = tmp_path / 'segment.mp3'
+    audio_path.write_bytes(b'\x00' * 100)
+    events = []
+
+    class FakeResponse:
+        def __init__(self, status_code):
+            self.status_code = status_code
+            self.headers = {'Retry-After': '3'}
+            self.text = 'こんにちは'
+
+        def close(self):
+            events.append('close')
+
+        def raise_for_status(self):
+            pass
+
+    responses = [FakeResponse(429), FakeResponse(200)]
+    client = WhisperClient()
+    monkeypatch.setattr(client, '_post', lambda path, language: responses.pop(0))
+    monkeypatch.setattr(whisper_service.time, 'sleep', lambda seconds: events.append(f'sleep {seconds}'))
+
+    assert client.transcribe(str(audio_path), 'job') == 'こんにちは'
+    assert client._request_bucket is None
+    assert events == ['close', 'sleep 3.0']
+
+
+def test_rate_limited_response_is_closed_when_wait_is_exceeded(tmp_path, monkeypatch):
+    """Test a 429 whose Retry-After exceeds the maximum wait is closed before raising."""
+    monkeypatch.setattr(settings, 'WHISPER_RATE_LIMIT_MAX_WAIT', 10)
+    audio_path = tmp_path / 'segment.mp3'
+    audio_path.write_bytes(b'\x00' * 100)
+    closed = []
+
+    class FakeResponse:
+        status_code = 429
+        headers = {'Retry-After': '60'}
+
+        def close(self):
+            closed.append(True)
+
+    client = WhisperClient()
+    monkeypatch.setattr(client, '_post', lambda path, language: FakeResponse())
+
+    with pytest.raises(WhisperRateLimitError):
+        client.transcribe(str(audio_path), 'job')
+    assert closed == [True]
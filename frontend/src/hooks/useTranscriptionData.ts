@@ -84,9 +84,9 @@ export const useTranscriptionData = () => {
         const MAX_POLLING_TIME = 600000; // 最大10分
         const startTime = Date.now();
 
-        let completedJob = await service.getStatus(jobId);
+        let jobStatus = await service.getStatus(jobId);
 
-        while (completedJob.status === 'processing') {
+        while (jobStatus.status === 'processing') {
           // タイムアウトチェック
           if (Date.now() - startTime > MAX_POLLING_TIME) {
             throw new Error('処理がタイムアウトしました。');
@@ -106,14 +106,17 @@ export const useTranscriptionData = () => {
           await new Promise((resolve) => setTimeout(resolve, POLLING_INTERVAL));
 
           // 再度ステータス確認
-          completedJob = await service.getStatus(jobId);
+          jobStatus = await service.getStatus(jobId);
         }
 
         // 処理完了または失敗
-        if (completedJob.status === 'failed') {
-          throw new Error(completedJob.errorMessage || '文字起こし処理に失敗しました。');
+        if (jobStatus.status === 'failed') {
+          throw new Error(jobStatus.errorMessage || '文字起こし処理に失敗しました。');
         }
 
+        // 完了時のみ本文を含む結果を取得
+        const completedJob = await service.getResult(jobId);
+
         setCurrentJob(completedJob);
         setIsProcessing(false);
         setProgressInfo(null);
@@ -2,6 +2,7 @@
 
 import type {
   TranscriptionJob,
+  TranscriptionJobStatus,
   OutputFormat,
   UploadProgress,
   ErrorInfo,
@@ -107,10 +108,10 @@ export class TranscriptionService {
   }
 
   // 文字起こし状況取得（ポーリング用）
-  async getStatus(jobId: string): Promise<TranscriptionJob> {
+  async getStatus(jobId: string): Promise<TranscriptionJobStatus> {
     logger.debug('Fetching transcription status', { jobId });
 
-    const job = await apiClient.get<TranscriptionJob>(
+    const job = await apiClient.get<TranscriptionJobStatus>(
       `/transcriptions/${jobId}/status`
     );
 
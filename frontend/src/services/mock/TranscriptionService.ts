@@ -2,6 +2,7 @@
 
 import type {
   TranscriptionJob,
+  TranscriptionJobStatus,
   OutputFormat,
   UploadProgress,
   ErrorInfo,
@@ -156,9 +157,9 @@ export class TranscriptionService {
   }
 
   // 文字起こし状況取得（ポーリング用）
-  async getStatus(jobId: string): Promise<TranscriptionJob> {
+  async getStatus(jobId: string): Promise<TranscriptionJobStatus> {
     // @MOCK_TO_API: GET /api/transcriptions/{job_id}/status
-    // Response: TranscriptionJob
+    // Response: TranscriptionJobStatus
 
     logger.debug('Fetching transcription status', { jobId });
 
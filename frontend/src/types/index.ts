@@ -49,6 +49,17 @@ export interface TranscriptionJob {
   completedAt?: string; // ISO 8601形式
 }
 
+// 文字起こしジョブ状況（ポーリング用、本文を含まない）
+export interface TranscriptionJobStatus {
+  id: string; // UUID
+  status: TranscriptionStatus;
+  errorMessage?: string;
+  attempts?: number;
+  createdAt: string; // ISO 8601形式
+  updatedAt: string; // ISO 8601形式
+  completedAt?: string; // ISO 8601形式
+}
+
 // 文字起こし履歴（フロントエンド用）
 export interface TranscriptionHistory {
   id: string; // UUID